@@ -0,0 +1,89 @@
+"""
+Benchmark the column-wise add_borrow_duration_and_alert against the original
+row-wise DataFrame.apply version and check that both give identical output.
+
+Run from the python_app folder:
+    python -m benchmarks.bench_borrowDuration --sizes 10000 1000000 10000000
+"""
+import argparse
+import io
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.syntheticData import make_loan_dates
+from utils.projectFunctions import add_borrow_duration_and_alert
+
+
+def legacy_add_borrow_duration_and_alert(
+    df: pd.DataFrame,
+    checkout_col: str = 'Book checkout',
+    returned_col: str = 'Book Returned',
+    max_allowed_days: int = 14
+) -> pd.DataFrame:
+    # Row-wise reference implementation, kept here for comparison only
+    today = pd.to_datetime(datetime.now().date())
+
+    df[checkout_col] = pd.to_datetime(df[checkout_col], errors='coerce')
+    df[returned_col] = pd.to_datetime(df[returned_col], errors='coerce')
+
+    def calculate_duration(row):
+        if pd.notna(row[returned_col]) and pd.notna(row[checkout_col]):
+            return (row[returned_col] - row[checkout_col]).days
+        elif pd.isna(row[returned_col]) and pd.notna(row[checkout_col]):
+            return (today - row[checkout_col]).days
+        else:
+            return None
+
+    def alert_status(row):
+        duration = row['BorrowDuration']
+        returned = row[returned_col]
+
+        if pd.isna(returned):
+            if duration is not None and duration > max_allowed_days:
+                return 'OVERDUE'
+            else:
+                return 'SCHEDULED'
+        else:
+            return 'OVERDUE' if duration > max_allowed_days else 'ON TIME'
+
+    df['BorrowDuration'] = df.apply(calculate_duration, axis=1)
+    df['OverdueAlert'] = df.apply(alert_status, axis=1)
+
+    return df
+
+
+def time_call(func, df: pd.DataFrame) -> tuple:
+    start = time.perf_counter()
+    result = func(df.copy())
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark add_borrow_duration_and_alert.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--legacy-max", type=int, default=1_000_000,
+                        help="Largest size to also run the row-wise version on (it is very slow).")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'row-wise (s)':>14} {'column-wise (s)':>16} {'speedup':>9}  identical")
+    for n_rows in args.sizes:
+        # Loans over the last few years with ~10% still open and ~1% missing checkouts
+        df = make_loan_dates(n_rows, start='2022-01-01', days=1200, max_duration=40, missing_checkout=0.01)
+        new_time, new_result = time_call(add_borrow_duration_and_alert, df)
+
+        if n_rows <= args.legacy_max:
+            old_time, old_result = time_call(legacy_add_borrow_duration_and_alert, df)
+            pd.testing.assert_frame_equal(new_result, old_result)
+            old_csv, new_csv = io.StringIO(), io.StringIO()
+            old_result.to_csv(old_csv, index=False)
+            new_result.to_csv(new_csv, index=False)
+            identical = old_csv.getvalue() == new_csv.getvalue()
+            print(f"{n_rows:>12,} {old_time:>14.3f} {new_time:>16.3f} {old_time / new_time:>8.0f}x  {identical}")
+        else:
+            print(f"{n_rows:>12,} {'skipped':>14} {new_time:>16.3f} {'-':>9}  -")
+
+
+if __name__ == "__main__":
+    main()
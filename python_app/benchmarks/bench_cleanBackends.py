@@ -0,0 +1,62 @@
+"""
+clean_data on the pandas, polars and DuckDB backends over the same synthetic
+loan file, with each result checked against the pandas one.
+
+polars and DuckDB use every core they can see, so the speedup depends on the
+machine; the core count is printed with the timings. Backends that aren't
+installed are skipped.
+Run from the python_app folder:
+    python -m benchmarks.bench_cleanBackends --rows 2000000
+"""
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from utils.projectFunctions import clean_data
+from benchmarks.syntheticData import make_raw_books
+
+DATE_COLUMNS = ['Book checkout', 'Book Returned']
+
+
+def best_time(raw_file: str, backend: str, repeats: int) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = clean_data(raw_file, date_columns=DATE_COLUMNS, backend=backend)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark clean_data backends.")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_file = os.path.join(tmp_dir, 'raw.csv')
+        make_raw_books(args.rows).to_csv(raw_file, index=False)
+
+        print(f"rows={args.rows:,} cores={os.cpu_count()}")
+        print(f"{'backend':<8} {'wall (s)':>9} {'speedup':>8} {'matches pandas':>15}")
+        baseline, expected = best_time(raw_file, 'pandas', args.repeats)
+        print(f"{'pandas':<8} {baseline:>9.2f} {1:>8.2f} {'-':>15}")
+        for backend in ('polars', 'duckdb'):
+            if importlib.util.find_spec(backend) is None:
+                print(f"{backend:<8} {'not installed':>9}")
+                continue
+            wall, result = best_time(raw_file, backend, args.repeats)
+            try:
+                pd.testing.assert_frame_equal(result, expected)
+                matches = "yes"
+            except AssertionError:
+                matches = "NO"
+            print(f"{backend:<8} {wall:>9.2f} {baseline / wall:>8.2f} {matches:>15}")
+
+
+if __name__ == "__main__":
+    main()
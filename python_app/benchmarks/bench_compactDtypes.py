@@ -0,0 +1,46 @@
+"""
+In-memory size, peak RSS and wall time of the cleaned book table with the
+default dtypes and with clean_data(compact_dtypes=True).
+
+Each flow runs in its own process so peak RSS isn't shared between them.
+Run from the python_app folder (peak RSS needs the resource module, i.e. not Windows):
+    python -m benchmarks.bench_compactDtypes --rows 2000000
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.syntheticData import make_raw_books
+from utils.projectFunctions import clean_data, memory_usage_mb
+
+
+def run(raw_file: str, compact_dtypes: bool) -> tuple:
+    start = time.perf_counter()
+    books = clean_data(raw_file, date_columns=['Book checkout', 'Book Returned'], compact_dtypes=compact_dtypes)
+    wall = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return memory_usage_mb(books), peak_rss, wall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark compact dtypes for the book table.")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_file = os.path.join(tmp_dir, 'raw.csv')
+        make_raw_books(args.rows).to_csv(raw_file, index=False)
+
+        print(f"rows={args.rows:,}")
+        print(f"{'dtypes':<10} {'frame (MB)':>11} {'peak RSS (MB)':>14} {'wall (s)':>9}")
+        for label, compact_dtypes in [("default", False), ("compact", True)]:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                frame, peak_rss, wall = executor.submit(run, raw_file, compact_dtypes).result()
+            print(f"{label:<10} {frame:>11.1f} {peak_rss:>14.0f} {wall:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
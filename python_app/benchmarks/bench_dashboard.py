@@ -0,0 +1,89 @@
+"""
+Measure the data cost of one Streamlit dashboard rerun.
+
+  csv          what every rerun used to do: parse the three cleaned CSVs and aggregate
+  precomputed  load_aggregates with a fresh dashboardAggregates.json (stat + small JSON)
+  cached       a warm st.cache_data hit: stat the files for the cache key, return the dict
+
+Target: a rerun's data layer stays under 50 ms with the precomputed file at 1M loans,
+and under 1 ms once cached.
+
+Run from the python_app folder:
+    python -m benchmarks.bench_dashboard --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from functools import lru_cache
+
+import pandas as pd
+
+from benchmarks.syntheticData import make_clean_books, make_customers, make_enriched_books
+from utils.dashboardMetrics import (
+    load_aggregates, write_aggregates, compute_aggregates, AGGREGATES_FILE,
+    CUSTOMERS_OUTPUT, BOOKS_OUTPUT, API_BOOKS_OUTPUT
+)
+
+CUSTOMERS_CSV = CUSTOMERS_OUTPUT + ".csv"
+BOOKS_CSV = BOOKS_OUTPUT + ".csv"
+API_BOOKS_CSV = API_BOOKS_OUTPUT + ".csv"
+
+TARGET_MS = 50
+
+
+def csv_rerun(output_dir: str) -> dict:
+    return compute_aggregates(
+        pd.read_csv(os.path.join(output_dir, CUSTOMERS_CSV)),
+        pd.read_csv(os.path.join(output_dir, BOOKS_CSV)),
+        pd.read_csv(os.path.join(output_dir, API_BOOKS_CSV)),
+    )
+
+
+def signature(output_dir: str) -> tuple:
+    return tuple(os.stat(os.path.join(output_dir, name)).st_mtime_ns
+                 for name in (CUSTOMERS_CSV, BOOKS_CSV, API_BOOKS_CSV, AGGREGATES_FILE))
+
+
+@lru_cache(maxsize=None)
+def cached_rerun(output_dir: str, files: tuple) -> dict:
+    # Stand-in for the dashboard's st.cache_data function
+    return load_aggregates(output_dir)
+
+
+def best_of(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dashboard rerun latency.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        make_clean_books(args.rows).to_csv(os.path.join(output_dir, BOOKS_CSV), index=False)
+        make_customers(50_000).to_csv(os.path.join(output_dir, CUSTOMERS_CSV), index=False)
+        make_enriched_books(5_000).to_csv(os.path.join(output_dir, API_BOOKS_CSV), index=False)
+        write_aggregates(output_dir, *[pd.read_csv(os.path.join(output_dir, name))
+                                       for name in (CUSTOMERS_CSV, BOOKS_CSV, API_BOOKS_CSV)])
+
+        results = {
+            "csv": best_of(lambda: csv_rerun(output_dir), args.repeat),
+            "precomputed": best_of(lambda: load_aggregates(output_dir), args.repeat),
+            "cached": best_of(lambda: cached_rerun(output_dir, signature(output_dir)), args.repeat),
+        }
+
+    print(f"rows={args.rows:,}  target <{TARGET_MS} ms per rerun")
+    for name, ms in results.items():
+        print(f"  {name:<12} {ms:>10.2f} ms")
+    print("target met" if results["precomputed"] < TARGET_MS else "target MISSED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Measure write_df_to_sql throughput (rows/sec) against a local SQLite database:
+the previous path (new engine per call, one default to_sql) versus the cached
+engine with batched inserts, plus the staging-table upsert mode.
+
+SQL Server additionally gets pyodbc fast_executemany, which SQLite has no
+equivalent for, so expect a larger gap there.
+
+Run from the python_app folder:
+    python -m benchmarks.bench_loadToServer --rows 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from benchmarks.syntheticData import make_clean_books
+from utils.loadToServer import write_df_to_sql, get_engine
+
+
+def legacy_write(df: pd.DataFrame, table_name: str, conn_str: str) -> None:
+    # What write_df_to_sql used to do: a fresh engine and a default to_sql on every call
+    engine = create_engine(conn_str)
+    df.to_sql(table_name, con=engine, if_exists='replace', index=False)
+    engine.dispose()
+
+
+def timed(label: str, rows: int, func) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:>8.2f}s {rows / elapsed:>12,.0f} rows/sec")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark write_df_to_sql against SQLite.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--calls", type=int, default=4, help="Tables written per run, like myPythonApp.py")
+    args = parser.parse_args()
+
+    df = make_clean_books(args.rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn_str = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        total = args.rows * args.calls
+
+        timed("old: engine per call, default to_sql", total,
+              lambda: [legacy_write(df, f"Books{i}", conn_str) for i in range(args.calls)])
+        timed("new: cached engine, chunksize=10,000", total,
+              lambda: [write_df_to_sql(df, f"Books{i}", database='', connection_string=conn_str) for i in range(args.calls)])
+        timed("new: upsert into empty table", args.rows,
+              lambda: write_df_to_sql(df, "BooksUpsert", database='', connection_string=conn_str, upsert=True, key_columns=['Id']))
+        timed("new: upsert over existing rows", args.rows,
+              lambda: write_df_to_sql(df, "BooksUpsert", database='', connection_string=conn_str, upsert=True, key_columns=['Id']))
+        get_engine(conn_str).dispose()
+
+
+if __name__ == "__main__":
+    main()
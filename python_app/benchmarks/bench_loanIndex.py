@@ -0,0 +1,55 @@
+"""
+Per-query time of LoanIndex lookups against rescanning the cleaned book table
+with pandas, plus the one-off cost of building the index.
+
+Run from the python_app folder:
+    python -m benchmarks.bench_loanIndex --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.syntheticData import make_clean_books
+from utils.loanIndex import LoanIndex
+
+
+def per_query(func, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark loan lookups.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    books = make_clean_books(args.rows)
+    start = time.perf_counter()
+    index = LoanIndex(books)
+    print(f"rows={args.rows:,} index build {time.perf_counter() - start:.2f} s")
+
+    rng = np.random.default_rng(0)
+    customers = rng.integers(1, 50_000, args.queries).astype(float)
+    normalized = books['Books'].str.split().str.join(' ').str.casefold()
+    titles = rng.choice(normalized.unique(), args.queries)
+    days = pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 365, args.queries), unit='D')
+
+    cases = [
+        ("customer loans", lambda c: books[books['Customer ID'] == c], index.loans_for_customer, customers),
+        ("title loans", lambda t: books[normalized == t], index.loans_for_title, titles),
+        ("checkout week", lambda d: books[books['Book checkout'].between(d, d + pd.Timedelta(days=6))],
+         lambda d: index.checked_out_between(d, d + pd.Timedelta(days=6)), days),
+    ]
+
+    print(f"{'query':<16} {'scan (us)':>11} {'index (us)':>11}")
+    for label, scan, lookup, queries in cases:
+        print(f"{label:<16} {per_query(scan, queries[:20]):>11,.0f} {per_query(lookup, queries):>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
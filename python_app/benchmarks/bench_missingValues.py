@@ -0,0 +1,84 @@
+"""
+Step 1.1 of clean_data (blank and "NaN" cells to NaN) on a wide file: the
+two full-frame replace passes it used to run against read_csv's MISSING_VALUES
+plus drop_missing_rows' check of the text columns.
+
+Each flow runs in its own process so peak RSS isn't shared between them.
+Run from the python_app folder (peak RSS needs the resource module, i.e. not Windows):
+    python -m benchmarks.bench_missingValues --rows 200000 --columns 40
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.projectFunctions import drop_missing_rows, read_csv
+
+TEXT_VALUES = np.array(["Dune", "Catcher in the Rye ", "2 weeks", "NaN", "", "  ", "10/04/2023"], dtype=object)
+
+
+def make_wide_file(file_path: str, n_rows: int, n_columns: int, seed: int = 42) -> None:
+    # Half text columns (with blanks, "NaN" and whitespace-only cells), half numbers
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for i in range(n_columns):
+        if i % 2:
+            columns[f"number_{i}"] = rng.random(n_rows)
+        else:
+            columns[f"text_{i}"] = TEXT_VALUES[rng.integers(0, len(TEXT_VALUES), n_rows)]
+    pd.DataFrame(columns).to_csv(file_path, index=False)
+
+
+def replace_passes(raw: pd.DataFrame) -> pd.DataFrame:
+    # Step 1.1 before: regex over every cell of every column, then a second pass for "NaN"
+    return raw.replace(r'^\s*$', pd.NA, regex=True).replace("NaN", pd.NA)
+
+
+FLOWS = {
+    "replace passes (before)": (pd.read_csv, replace_passes),
+    "reader + text check": (read_csv, drop_missing_rows),
+}
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(label: str, file_path: str) -> tuple:
+    reader, step = FLOWS[label]
+    start = time.perf_counter()
+    raw = reader(file_path)
+    read_wall, rss_after_read = time.perf_counter() - start, peak_rss_mb()
+
+    start = time.perf_counter()
+    missing = step(raw).isna().sum().sum()
+    step_wall = time.perf_counter() - start
+    # How far the step pushed peak memory past the frame it was given
+    return int(missing), read_wall, step_wall, peak_rss_mb() - rss_after_read
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark blank/NaN normalization on a wide file.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'wide.csv')
+        make_wide_file(file_path, args.rows, args.columns)
+
+        print(f"rows={args.rows:,} columns={args.columns}")
+        print(f"{'flow':<24} {'missing cells':>14} {'read (s)':>9} {'step 1.1 (s)':>13} {'step peak +MB':>14}")
+        for label in FLOWS:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                missing, read_wall, step_wall, step_rss = executor.submit(run, label, file_path).result()
+            print(f"{label:<24} {missing:>14,} {read_wall:>9.2f} {step_wall:>13.2f} {step_rss:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+End-to-end wall time and bytes on disk for each cleaned-output format.
+
+For every format: clean a raw loan file with clean_data, then do what the
+pipeline and dashboard do next. The old CSV flow read the output straight back
+for metrics and the dashboard parsed it again; now metrics use the in-memory
+frame and only the dashboard loads the file.
+
+Run from the python_app folder:
+    python -m benchmarks.bench_outputFormats --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.syntheticData import make_raw_books
+from utils.DE_metrics import compute_all_metrics
+from utils.projectFunctions import clean_data, load_output
+
+EMPTY = pd.DataFrame()
+
+
+def run(raw_file: str, output_file: str, reload_for_metrics: bool) -> float:
+    start = time.perf_counter()
+    books = clean_data(raw_file, date_columns=['Book checkout', 'Book Returned'], output_file=output_file)
+    if reload_for_metrics:
+        books = load_output(output_file)
+    compute_all_metrics(books, EMPTY, EMPTY)
+    load_output(output_file)  # the dashboard's load
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cleaned-output formats.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_file = os.path.join(tmp_dir, 'raw.csv')
+        make_raw_books(args.rows).to_csv(raw_file, index=False)
+
+        print(f"rows={args.rows:,}")
+        print(f"{'flow':<32} {'wall (s)':>9} {'load (s)':>9} {'MB on disk':>11}")
+        for label, extension, reload_for_metrics in [
+            ("csv, reloaded (old flow)", ".csv", True),
+            ("csv, in memory", ".csv", False),
+            ("parquet, in memory", ".parquet", False),
+            ("arrow ipc, in memory", ".arrow", False),
+        ]:
+            output_file = os.path.join(tmp_dir, 'books' + extension)
+            wall = run(raw_file, output_file, reload_for_metrics)
+            start = time.perf_counter()
+            load_output(output_file)
+            load = time.perf_counter() - start
+            size = os.path.getsize(output_file) / 1e6
+            print(f"{label:<32} {wall:>9.2f} {load:>9.2f} {size:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
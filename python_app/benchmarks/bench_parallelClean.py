@@ -0,0 +1,73 @@
+"""
+Wall time of the serial clean against its process-pool versions, each checked to
+write exactly the same bytes: one large file with clean_data against
+clean_data_parallel's row partitions, and several branch files one after another
+against clean_files_parallel. The pool only pays off with more than one core.
+
+Run from the python_app folder:
+    python -m benchmarks.bench_parallelClean --rows 2000000 --workers 4
+"""
+import argparse
+import filecmp
+import os
+import tempfile
+import time
+
+from benchmarks.syntheticData import make_raw_books
+from utils.projectFunctions import clean_data
+from utils.parallelClean import clean_data_parallel, clean_files_parallel
+
+DATE_COLUMNS = ['Book checkout', 'Book Returned']
+
+
+def timed(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parallel cleaning.")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--branches", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        def path(name):
+            return os.path.join(tmp_dir, name)
+
+        # One large file, cleaned whole and in row partitions
+        make_raw_books(args.rows).to_csv(path('books.csv'), index=False)
+        single = timed(clean_data, path('books.csv'), DATE_COLUMNS, output_file=path('books_serial.csv'))
+        partitioned = timed(clean_data_parallel, path('books.csv'), DATE_COLUMNS, output_file=path('books_pool.csv'),
+                            max_workers=args.workers)
+        single_same = filecmp.cmp(path('books_serial.csv'), path('books_pool.csv'), shallow=False)
+
+        # One file per branch, each a share of the rows
+        jobs = []
+        for branch in range(args.branches):
+            make_raw_books(args.rows // args.branches, seed=branch).to_csv(path(f'branch{branch}.csv'), index=False)
+            jobs.append({"file_path": path(f'branch{branch}.csv'), "date_columns": DATE_COLUMNS,
+                         "output_file": path(f'branch{branch}_serial.csv')})
+
+        start = time.perf_counter()
+        for job in jobs:
+            clean_data(**job)
+        serial = time.perf_counter() - start
+
+        pool_jobs = [{**job, "output_file": path(f'branch{branch}_pool.csv')} for branch, job in enumerate(jobs)]
+        parallel = timed(clean_files_parallel, pool_jobs, max_workers=args.workers)
+        same = all(filecmp.cmp(job["output_file"], pool_job["output_file"], shallow=False)
+                   for job, pool_job in zip(jobs, pool_jobs))
+
+        print(f"rows={args.rows:,} workers={args.workers} cpus={os.cpu_count()}")
+        print(f"{'flow':<28} {'wall (s)':>9} {'identical':>10}")
+        print(f"{'one file, clean_data':<28} {single:>9.2f} {'':>10}")
+        print(f"{'one file, partitioned':<28} {partitioned:>9.2f} {str(single_same):>10}")
+        print(f"{f'{args.branches} branch files, serial':<28} {serial:>9.2f} {'':>10}")
+        print(f"{f'{args.branches} branch files, pool':<28} {parallel:>9.2f} {str(same):>10}")
+
+
+if __name__ == "__main__":
+    main()
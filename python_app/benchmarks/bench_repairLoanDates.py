@@ -0,0 +1,66 @@
+"""
+Benchmark the fused repair_loan_dates against the old steps 5 and 6 of clean_data
+(fix_swapped_dates followed by the row-wise fix_swapped_and_future_dates) and check
+that both give identical output.
+
+Run from the python_app folder:
+    python -m benchmarks.bench_repairLoanDates --rows 10000 100000 1000000
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.syntheticData import make_loan_dates
+from utils.projectFunctions import repair_loan_dates
+
+
+def legacy_fix_swapped_dates(df, checkout_col='Book checkout', returned_col='Book Returned'):
+    df[checkout_col] = pd.to_datetime(df[checkout_col], errors='coerce')
+    df[returned_col] = pd.to_datetime(df[returned_col], errors='coerce')
+    mask = df[checkout_col] > df[returned_col]
+    df.loc[mask, [checkout_col, returned_col]] = df.loc[mask, [returned_col, checkout_col]].values
+    return df
+
+
+def legacy_fix_swapped_and_future_dates(df, checkout_col='Book checkout', returned_col='Book Returned', max_year_diff=5):
+    df = legacy_fix_swapped_dates(df, checkout_col, returned_col)
+    mask_future = (df[returned_col].dt.year - df[checkout_col].dt.year) > max_year_diff
+
+    def correct_year(row):
+        if pd.notna(row[returned_col]) and pd.notna(row[checkout_col]):
+            return row[returned_col].replace(year=row[checkout_col].year)
+        return pd.NaT
+
+    corrected = pd.to_datetime(df.loc[mask_future].apply(correct_year, axis=1))
+    df.loc[mask_future, returned_col] = corrected
+    return df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark repair_loan_dates.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'old steps 5+6 (s)':>18} {'fused (s)':>10} {'speedup':>8}")
+    for n_rows in args.rows:
+        # ~30% swapped, ~5% with a far-future return year, ~2% missing; no 29 February
+        # returns, which the old version can't move into a non-leap year
+        df = make_loan_dates(n_rows, days=1400, open_loan=0.02, swapped=0.3, future_year=0.05)
+        is_leap_day = (df['Book Returned'].dt.month == 2) & (df['Book Returned'].dt.day == 29)
+        df.loc[is_leap_day, 'Book Returned'] += pd.Timedelta(days=1)
+
+        start = time.perf_counter()
+        old = legacy_fix_swapped_and_future_dates(legacy_fix_swapped_dates(df.copy()))
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = repair_loan_dates(df.copy())
+        new_time = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(new, old)
+        print(f"{n_rows:>12,} {old_time:>18.3f} {new_time:>10.3f} {old_time / new_time:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Reading the raw book file with inferred types (read_csv) versus the declared
+schema of its table (read_csv_with_schema: usecols, explicit dtypes, pyarrow
+engine, vectorized checks), on its own and as step 1 of clean_data.
+
+Each flow runs in its own process so peak RSS isn't shared between them.
+Run from the python_app folder (peak RSS needs the resource module, i.e. not Windows):
+    python -m benchmarks.bench_schemaIngest --rows 1000000
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.csvSchemas import read_csv_with_schema
+from utils.pipelineProfiler import peak_rss_mb
+from utils.projectFunctions import clean_data, read_csv
+from benchmarks.syntheticData import make_raw_books
+
+DATE_COLUMNS = ['Book checkout', 'Book Returned']
+
+FLOWS = {
+    "read_csv (inferred)": lambda raw_file: read_csv(raw_file),
+    "read_csv_with_schema": lambda raw_file: read_csv_with_schema(raw_file, 'Books', on_violation='warn'),
+    "clean_data": lambda raw_file: clean_data(raw_file, DATE_COLUMNS),
+    "clean_data(schema=)": lambda raw_file: clean_data(raw_file, DATE_COLUMNS, schema='Books'),
+}
+
+
+def run(label: str, raw_file: str) -> tuple:
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    # The synthetic file has invalid dates, which the schema reads report
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = len(FLOWS[label](raw_file))
+    return rows, time.perf_counter() - start, peak_rss_mb() - rss_before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark schema-driven CSV ingest against type inference.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_file = os.path.join(tmp_dir, 'raw.csv')
+        make_raw_books(args.rows).to_csv(raw_file, index=False)
+
+        print(f"rows={args.rows:,} cores={os.cpu_count()}")
+        print(f"{'flow':<22} {'rows out':>10} {'wall (s)':>9} {'peak +MB':>9}")
+        for label in FLOWS:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                rows, wall, rss = executor.submit(run, label, raw_file).result()
+            print(f"{label:<22} {rows:>10,} {wall:>9.2f} {rss:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+The whole book pipeline run stage after stage (clean_data, enrich_books on every
+title, write and re-clean the enriched file, rollups, SQL load) versus
+stream_pipeline, where cleaning, enrichment, enriched cleaning and the SQL load
+work on different chunks at the same time.
+
+Enrichment goes to the local Open Library stub with --latency seconds per request
+and the SQL load to a SQLite file, so the run is offline. Each flow runs in its
+own process so peak RSS isn't shared between them.
+Run from the python_app folder (peak RSS needs the resource module, i.e. not Windows):
+    python -m benchmarks.bench_streaming --rows 200000 --titles 2000 --latency 0.02
+"""
+import argparse
+import contextlib
+import functools
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from benchmarks.stubOpenLibrary import StubOpenLibrary
+from utils.booksAPIFetch import enrich_books
+from utils.loadToServer import write_df_to_sql
+from utils.loanRollups import LoanRollup
+from utils.pipelineProfiler import peak_rss_mb
+from utils.projectFunctions import clean_data
+from utils.streamingPipeline import stream_pipeline
+from benchmarks.syntheticData import make_raw_books
+
+DATE_COLUMNS = ['Book checkout', 'Book Returned']
+
+
+def sequential(paths: dict, enrich, conn_str: str) -> int:
+    # What `myPythonApp.py all --write-to-sql` does: each stage over the whole table
+    books = clean_data(paths["raw"], DATE_COLUMNS, output_file=paths["books"])
+    enrich(books).to_csv(paths["api_raw"], index=False)
+    api_books = clean_data(paths["api_raw"], output_file=paths["api"])
+    for key_col in ("Customer ID", "Books"):
+        LoanRollup.from_loans(books, key_col)
+    write_df_to_sql(books, 'Books', database='', connection_string=conn_str)
+    write_df_to_sql(api_books, 'BooksEnriched', database='', connection_string=conn_str)
+    return len(books)
+
+
+def streaming(paths: dict, enrich, conn_str: str, chunksize: int) -> int:
+    def writer(table_name):
+        written = [0]
+
+        def write(chunk):
+            write_df_to_sql(chunk, table_name, database='', connection_string=conn_str,
+                            if_exists='replace' if not written[0] else 'append')
+            written[0] += 1
+        return write
+
+    result = stream_pipeline(paths["raw"], paths["books"], paths["api_raw"], paths["api"], chunksize=chunksize,
+                             enrich=enrich, on_books=writer('Books'), on_books_api=writer('BooksEnriched'))
+    return result["books_rows"]
+
+
+def run(label: str, tmp_dir: str, base_url: str, chunksize: int) -> tuple:
+    paths = {name: os.path.join(tmp_dir, f"{label}_{name}.csv") for name in ("books", "api_raw", "api")}
+    paths["raw"] = os.path.join(tmp_dir, "raw.csv")
+    conn_str = f"sqlite:///{os.path.join(tmp_dir, label + '.db')}"
+    enrich = functools.partial(enrich_books, requests_per_second=1e9, base_url=base_url)
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    # write_df_to_sql prints a line per write
+    with contextlib.redirect_stdout(io.StringIO()):
+        if label == "sequential":
+            rows = sequential(paths, enrich, conn_str)
+        else:
+            rows = streaming(paths, enrich, conn_str, chunksize)
+    return rows, time.perf_counter() - start, peak_rss_mb() - rss_before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the stage-by-stage pipeline against stream_pipeline.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--titles", type=int, default=2_000, help="Distinct titles (one API request each)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the stub takes per request")
+    parser.add_argument("--chunksize", type=int, default=20_000, help="Loans per streamed chunk")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir, StubOpenLibrary(latency=args.latency) as stub:
+        make_raw_books(args.rows, n_titles=args.titles).to_csv(os.path.join(tmp_dir, "raw.csv"), index=False)
+
+        print(f"rows={args.rows:,} titles={args.titles:,} latency={args.latency}s chunksize={args.chunksize:,} cores={os.cpu_count()}")
+        print(f"{'flow':<12} {'loans':>10} {'wall (s)':>9} {'peak +MB':>9}")
+        for label in ("sequential", "streaming"):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                rows, wall, rss = executor.submit(run, label, tmp_dir, stub.base_url, args.chunksize).result()
+            print(f"{label:<12} {rows:>10,} {wall:>9.2f} {rss:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Local stand-in for the Open Library search endpoint, for benchmarking enrich_books offline."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubOpenLibraryHandler(BaseHTTPRequestHandler):
+    # Every title is found; `latency` seconds stands in for the network round trip
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        title = parse_qs(urlsplit(self.path).query).get("title", [""])[0]
+        body = {"numFound": 1, "docs": [{
+            "title": title, "author_name": ["Stub Author"], "first_publish_year": 1950,
+            "isbn": ["0000000000"], "key": f"/works/{abs(hash(title))}W",
+        }]}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOpenLibrary:
+    """Context manager running the stub on a free local port; `base_url` goes to enrich_books."""
+
+    def __init__(self, latency: float = 0.0):
+        handler = type("Handler", (StubOpenLibraryHandler,), {"latency": latency})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "StubOpenLibrary":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,196 @@
+"""
+Benchmark suite over synthetic library data (benchmarks/syntheticData.py), asv style:
+each benchmark prepares its input for a size outside the timer, then the call
+itself is timed. The best of several repeats is kept.
+
+Covers clean_data, every date-fix step, a day's OverdueAlertEngine refresh,
+enrich_books against a local stub server, and the DE_metrics functions.
+
+Run from the python_app folder:
+    python -m benchmarks.suite --sizes 1e3 1e4 1e5              # print timings
+    python -m benchmarks.suite --sizes 1e3 1e4 1e5 --save main   # store benchmarks/baselines/main.json
+    python -m benchmarks.suite --sizes 1e3 1e4 1e5 --compare main
+--compare exits with status 1 when a benchmark is more than --tolerance slower
+than the stored baseline. Baselines only mean something on the machine that
+wrote them, so the machine details are saved along with the timings.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.stubOpenLibrary import StubOpenLibrary
+from utils import DE_metrics
+from utils.booksAPIFetch import enrich_books
+from utils.overdueAlerts import OverdueAlertEngine
+from utils.projectFunctions import (
+    clean_data, correct_dates, drop_missing_rows, drop_duplicates, fix_swapped_dates,
+    fix_swapped_and_future_dates, repair_loan_dates, add_borrow_duration_and_alert
+)
+from benchmarks.syntheticData import make_raw_books
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+DATE_COLUMNS = ['Book checkout', 'Book Returned']
+# Network-bound (even against the stub), so timed once per size
+SINGLE_RUN = {"enrich_books"}
+
+
+class Inputs:
+    """Inputs for one size, each built once and shared by the benchmarks that need it."""
+
+    def __init__(self, n_rows: int, tmp_dir: str):
+        self.raw_file = os.path.join(tmp_dir, f"books_{n_rows}.csv")
+        make_raw_books(n_rows).to_csv(self.raw_file, index=False)
+
+        # Every stage's input, as clean_data hands it over
+        self.deduplicated = drop_duplicates(drop_missing_rows(pd.read_csv(self.raw_file)))
+        self.dated = self.deduplicated.copy()
+        for column in DATE_COLUMNS:
+            correct_dates(self.dated, column)
+        self.cleaned = clean_data(self.raw_file, DATE_COLUMNS)
+        self.customers = pd.DataFrame({"Customer ID": self.cleaned["Customer ID"].dropna().unique()})
+        self.api = pd.DataFrame({"Title": self.cleaned["Books"].dropna().unique(), "Author": "Stub Author"})
+
+
+def benchmarks(stub_url: str) -> dict:
+    """name -> (setup(inputs) -> args, function). setup runs before every repeat, untimed."""
+    def all_getters(books, customers, api):
+        for getter in (DE_metrics.get_num_customers,):
+            getter(customers)
+        for getter in (DE_metrics.get_num_books, DE_metrics.get_most_borrowed_book, DE_metrics.get_most_active_customer,
+                       DE_metrics.get_average_borrow_duration, DE_metrics.get_num_overdue,
+                       DE_metrics.get_num_currently_borrowed):
+            getter(books)
+        for getter in (DE_metrics.get_num_api_requests, DE_metrics.get_num_unique_authors):
+            getter(api)
+
+    return {
+        "clean_data": (lambda i: (i.raw_file, DATE_COLUMNS), clean_data),
+        "correct_dates": (lambda i: (i.deduplicated.copy(), 'Book checkout'), correct_dates),
+        "fix_swapped_dates": (lambda i: (i.dated.copy(),), fix_swapped_dates),
+        "fix_swapped_and_future_dates": (lambda i: (i.dated.copy(),), fix_swapped_and_future_dates),
+        "repair_loan_dates": (lambda i: (i.dated.copy(),), repair_loan_dates),
+        "add_borrow_duration_and_alert": (lambda i: (repair_loan_dates(i.dated.copy()),), add_borrow_duration_and_alert),
+        # The same alerts kept current one day at a time
+        "OverdueAlertEngine.refresh": (
+            lambda i: (OverdueAlertEngine(i.cleaned, as_of='2023-12-31'), '2024-01-01'),
+            lambda engine, as_of: engine.refresh(as_of),
+        ),
+        "enrich_books": (
+            lambda i: (i.cleaned,),
+            lambda books: enrich_books(books, requests_per_second=1e9, base_url=stub_url),
+        ),
+        "compute_all_metrics": (lambda i: (i.cleaned, i.customers, i.api), DE_metrics.compute_all_metrics),
+        "DE_metrics getters": (lambda i: (i.cleaned, i.customers, i.api), all_getters),
+    }
+
+
+def time_best(setup, func, inputs, repeats: int = None) -> float:
+    """Best time of `repeats` runs; by default at least 3 runs and until 0.5 s has been measured (at most 25)."""
+    best, spent, runs = float("inf"), 0.0, 0
+    while (runs < repeats) if repeats else (runs < 3 or (spent < 0.5 and runs < 25)):
+        args = setup(inputs)
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best, spent, runs = min(best, elapsed), spent + elapsed, runs + 1
+    return best
+
+
+def run_suite(sizes: list, repeats: int = None, only: list = None) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir, StubOpenLibrary() as stub:
+        suite = benchmarks(stub.base_url)
+        for n_rows in sizes:
+            start = time.perf_counter()
+            inputs = Inputs(n_rows, tmp_dir)
+            print(f"# {n_rows:,} rows (inputs built in {time.perf_counter() - start:.1f} s)", file=sys.stderr)
+
+            for name, (setup, func) in suite.items():
+                if only and name not in only:
+                    continue
+                best = time_best(setup, func, inputs, repeats or (1 if name in SINGLE_RUN or n_rows > 100_000 else None))
+                results[f"{name}[{n_rows}]"] = best
+                print(f"{name + f'[{n_rows:,}]':<44} {best * 1e3:>12,.2f} ms", file=sys.stderr)
+    return results
+
+
+def machine_info() -> dict:
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+    }
+
+
+def save_baseline(name: str, results: dict) -> str:
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path = os.path.join(BASELINE_DIR, f"{name}.json")
+    with open(path, "w") as f:
+        json.dump({"machine": machine_info(), "results": results}, f, indent=2)
+    return path
+
+
+def compare_to_baseline(name: str, results: dict, tolerance: float, quiet: bool = False) -> list:
+    """Print current vs baseline timings; return the benchmarks slower than the tolerance allows."""
+    with open(os.path.join(BASELINE_DIR, f"{name}.json")) as f:
+        baseline = json.load(f)
+    if quiet:
+        return [key for key, seconds in results.items()
+                if key in baseline["results"] and seconds / baseline["results"][key] > 1 + tolerance]
+    if baseline["machine"] != machine_info():
+        print(f"⚠️ Baseline '{name}' was recorded on a different setup: {baseline['machine']}")
+
+    regressions = []
+    print(f"{'benchmark':<44} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for key, seconds in results.items():
+        if key not in baseline["results"]:
+            continue
+        ratio = seconds / baseline["results"][key]
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(key)
+            flag = "  ❌ slower"
+        print(f"{key:<44} {baseline['results'][key] * 1e3:>12,.2f} {seconds * 1e3:>12,.2f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the library pipeline on synthetic data.")
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e3, 1e4, 1e5],
+                        help="Loan rows per run, e.g. 1e3 1e5 1e7")
+    parser.add_argument("--repeats", type=int, help="Runs per benchmark (default: 3 to 25, as many as fit in 0.5 s; 1 above 100,000 rows)")
+    parser.add_argument("--only", nargs="+", help="Only run these benchmarks")
+    parser.add_argument("--save", metavar="NAME", help="Store the timings as baseline NAME")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against baseline NAME")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed slowdown before --compare fails (0.3 = 30%%)")
+    args = parser.parse_args()
+
+    results = run_suite([int(size) for size in args.sizes], args.repeats, args.only)
+
+    if args.save:
+        print(f"✅ Baseline written to {save_baseline(args.save, results)}")
+    if args.compare:
+        regressions = compare_to_baseline(args.compare, results, args.tolerance, quiet=True)
+        if regressions:
+            # Time the slow ones again and keep the better run, so one noisy run doesn't fail the check
+            names = sorted({key.split("[")[0] for key in regressions})
+            sizes = sorted({int(key.split("[")[1].rstrip("]")) for key in regressions})
+            for key, seconds in run_suite(sizes, args.repeats, names).items():
+                results[key] = min(results.get(key, seconds), seconds)
+        regressions = compare_to_baseline(args.compare, results, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} benchmark(s) slower than baseline '{args.compare}'.")
+            sys.exit(1)
+        print(f"✅ No regressions against baseline '{args.compare}'.")
+
+
+if __name__ == "__main__":
+    main()
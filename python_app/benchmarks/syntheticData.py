@@ -0,0 +1,220 @@
+"""
+Synthetic library data for the benchmarks and tests, shaped like the real files:
+raw loan and customer files with their quirks (make_raw_books, make_raw_customers,
+write_raw_library) and tables as the pipeline hands them on after cleaning
+(make_loan_dates, make_clean_books, make_customers, make_enriched_books).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+BOOK_COLUMNS = ['Id', 'Books', 'Book checkout', 'Book Returned', 'Days allowed to borrow', 'Customer ID']
+
+# Share of rows with each quirk of the real loan file (raw_data/03_Library Systembook.csv)
+QUIRK_RATES = {
+    "swapped": 0.2,        # checkout later than the return date
+    "future_year": 0.01,   # checkout year typed decades ahead (10/04/2063)
+    "invalid_day": 0.01,   # day that doesn't exist (32/05/2023)
+    "nan_row": 0.01,       # "NaN" typed for both title and customer
+    "blank_row": 0.05,     # ",,,,," lines
+    "duplicate": 0.03,     # exact copy of an earlier row
+}
+
+BASE_TITLES = [
+    "Catcher in the Rye", "Lord of the rings the two towers", "The hobbit", "Dune", "Little Women",
+    "IT", "Misery", "Catch 22", "Animal Farm", "1984", "East of Eden", "Wuthering Heights",
+    "Dark Tales", "The Bloody Chamber", "Les Miserables", "Dracula", "Frankenstein",
+]
+
+
+def make_titles(n_titles: int, rng: np.random.Generator) -> np.ndarray:
+    """Title pool; some titles also appear with a trailing space or in lower case, like the raw file."""
+    titles = np.array([BASE_TITLES[i % len(BASE_TITLES)] + (f" {i // len(BASE_TITLES)}" if i >= len(BASE_TITLES) else "")
+                       for i in range(n_titles)], dtype=object)
+    variant = rng.random(n_titles)
+    titles = np.where(variant < 0.1, titles + " ", titles)
+    return np.where((variant >= 0.1) & (variant < 0.15), np.char.lower(titles.astype(str)).astype(object), titles)
+
+
+def _format_dates(days: np.ndarray) -> np.ndarray:
+    # Format each distinct day once
+    uniques, codes = np.unique(days, return_inverse=True)
+    text = (pd.Timestamp('1970-01-01') + pd.to_timedelta(uniques, unit='D')).strftime('%d/%m/%Y')
+    return text.to_numpy(dtype=object)[codes]
+
+
+def make_raw_books(
+    n_rows: int,
+    seed: int = 42,
+    n_titles: int = 5_000,
+    n_customers: int = 50_000,
+    start: str = '2020-01-01',
+    end: str = '2023-12-31',
+    **rates
+) -> pd.DataFrame:
+    """
+    Raw loan rows as strings, ready for to_csv, with the quirks of the real file
+    at the rates in QUIRK_RATES (override any of them by keyword).
+    The checkout column keeps its literal quotes, so the CSV holds \"\"\"dd/mm/yyyy\"\"\".
+    """
+    rates = {**QUIRK_RATES, **rates}
+    rng = np.random.default_rng(seed)
+
+    n_blank = int(n_rows * rates["blank_row"])
+    n_duplicate = int(n_rows * rates["duplicate"])
+    n_base = max(n_rows - n_blank - n_duplicate, 1)
+
+    first_day = pd.Timestamp(start).value // 86_400_000_000_000
+    last_day = pd.Timestamp(end).value // 86_400_000_000_000
+    checkout = rng.integers(first_day, last_day + 1, n_base)
+    returned = checkout + rng.integers(1, 30, n_base)
+
+    swapped = rng.random(n_base) < rates["swapped"]
+    checkout, returned = np.where(swapped, returned, checkout), np.where(swapped, checkout, returned)
+    checkout_text = _format_dates(checkout)
+    returned_text = _format_dates(returned)
+
+    # Decades-ahead checkout years and days past the end of the month
+    future = rng.random(n_base) < rates["future_year"]
+    checkout_text[future] = [text[:6] + str(int(text[6:]) + 40) for text in checkout_text[future]]
+    invalid = rng.random(n_base) < rates["invalid_day"]
+    checkout_text[invalid] = ["32" + text[2:] for text in checkout_text[invalid]]
+
+    titles = make_titles(n_titles, rng)
+    books = pd.DataFrame({
+        'Id': np.arange(1, n_base + 1).astype(str).astype(object),
+        'Books': titles[rng.integers(0, n_titles, n_base)],
+        'Book checkout': '"' + checkout_text + '"',
+        'Book Returned': returned_text,
+        'Days allowed to borrow': '2 weeks',
+        'Customer ID': rng.integers(1, n_customers + 1, n_base).astype(str).astype(object),
+    })
+    nan_rows = rng.random(n_base) < rates["nan_row"]
+    books.loc[nan_rows, ['Books', 'Customer ID']] = 'NaN'
+
+    # Duplicates sit somewhere after their original; blank lines anywhere
+    duplicate_of = rng.integers(0, n_base, n_duplicate)
+    position = np.concatenate([
+        np.arange(n_base, dtype=float),
+        duplicate_of + rng.random(n_duplicate) * (n_base - duplicate_of),
+        rng.random(n_blank) * n_base,
+    ])
+    rows = np.concatenate([np.arange(n_base), duplicate_of, np.full(n_blank, -1)])[np.argsort(position, kind='stable')]
+
+    books = books.reindex(rows).reset_index(drop=True)
+    return books[BOOK_COLUMNS]
+
+
+FIRST_NAMES = np.array(["Jane", "John", "Dan", "William", "Jaztyn", "Jackie", "Matthew", "Emory"], dtype=object)
+LAST_NAMES = np.array(["Doe", "Smith", "Reeves", "Holden", "Forest", "Irving", "Stirling", "Ted"], dtype=object)
+
+
+def _customer_names(n_customers: int, rng: np.random.Generator) -> np.ndarray:
+    first = FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), n_customers)]
+    return first + " " + LAST_NAMES[rng.integers(0, len(LAST_NAMES), n_customers)]
+
+
+def make_raw_customers(n_customers: int, seed: int = 42, blank_row: float = 0.05) -> pd.DataFrame:
+    """Raw customer rows: IDs 1..n with names, plus "NaN" rows like the real file."""
+    rng = np.random.default_rng(seed)
+    customers = pd.DataFrame({
+        'Customer ID': np.arange(1, n_customers + 1).astype(str).astype(object),
+        'Customer Name': _customer_names(n_customers, rng),
+    })
+    customers.loc[rng.random(n_customers) < blank_row] = 'NaN'
+    return customers
+
+
+def write_raw_library(output_dir: str, n_rows: int, seed: int = 42, **book_options) -> dict:
+    """Write a raw book and customer file the size of a library with `n_rows` loans; returns their paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    n_customers = book_options.setdefault('n_customers', max(n_rows // 20, 10))
+    paths = {
+        "books": os.path.join(output_dir, "03_Library Systembook.csv"),
+        "customers": os.path.join(output_dir, "03_Library SystemCustomers.csv"),
+    }
+    make_raw_books(n_rows, seed=seed, **book_options).to_csv(paths["books"], index=False)
+    make_raw_customers(n_customers, seed=seed).to_csv(paths["customers"], index=False)
+    return paths
+
+
+def make_loan_dates(
+    n_rows: int,
+    seed: int = 42,
+    start: str = '2020-01-01',
+    days: int = 1460,
+    max_duration: int = 30,
+    open_loan: float = 0.1,
+    missing_checkout: float = 0.0,
+    swapped: float = 0.0,
+    future_year: float = 0.0
+) -> pd.DataFrame:
+    """
+    'Book checkout' and 'Book Returned' as datetime64[us]: checkouts over `days` days
+    from `start`, returned 0..max_duration-1 days later. The rates give the share of
+    loans still open (no return date), without a checkout, with the two dates swapped
+    and with the return typed ten years ahead.
+    """
+    rng = np.random.default_rng(seed)
+    checkout = np.datetime64(start, 'D') + rng.integers(0, days, n_rows).astype('timedelta64[D]')
+    returned = checkout + rng.integers(0, max_duration, n_rows).astype('timedelta64[D]')
+    is_swapped = rng.random(n_rows) < swapped
+    checkout, returned = np.where(is_swapped, returned, checkout), np.where(is_swapped, checkout, returned)
+    returned = np.where(rng.random(n_rows) < future_year, returned + np.timedelta64(3650, 'D'), returned)
+    df = pd.DataFrame({'Book checkout': checkout, 'Book Returned': returned}).astype('datetime64[us]')
+    df.loc[rng.random(n_rows) < open_loan, 'Book Returned'] = pd.NaT
+    df.loc[rng.random(n_rows) < missing_checkout, 'Book checkout'] = pd.NaT
+    return df
+
+
+def make_clean_books(
+    n_rows: int,
+    seed: int = 42,
+    n_titles: int = 5_000,
+    n_customers: int = 50_000,
+    max_allowed_days: int = 14,
+    **date_options
+) -> pd.DataFrame:
+    """
+    A book table as clean_data returns it: float IDs, loan dates (see make_loan_dates
+    for `date_options`), BorrowDuration in days and OverdueAlert. Open loans are
+    measured up to the last checkout day, so the table doesn't depend on today's date.
+    """
+    rng = np.random.default_rng(seed)
+    dates = make_loan_dates(n_rows, seed=seed, **date_options)
+    as_of = dates['Book checkout'].max()
+    is_open = dates['Book Returned'].isna()
+    duration = (dates['Book Returned'].fillna(as_of) - dates['Book checkout']).dt.days
+    overdue = duration > max_allowed_days
+    return pd.DataFrame({
+        'Id': np.arange(1, n_rows + 1, dtype=float),
+        'Books': make_titles(n_titles, rng)[rng.integers(0, n_titles, n_rows)],
+        **dates,
+        'Days allowed to borrow': '2 weeks',
+        'Customer ID': rng.integers(1, n_customers + 1, n_rows).astype(float),
+        'BorrowDuration': duration,
+        'OverdueAlert': np.where(overdue, 'OVERDUE', np.where(is_open, 'SCHEDULED', 'ON TIME')),
+    })
+
+
+def make_customers(n_customers: int, seed: int = 42) -> pd.DataFrame:
+    """A customer table as clean_data returns it: float IDs 1..n and names."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Customer ID': np.arange(1, n_customers + 1, dtype=float),
+        'Customer Name': _customer_names(n_customers, rng),
+    })
+
+
+def make_enriched_books(n_titles: int, seed: int = 42, n_authors: int = 1_000) -> pd.DataFrame:
+    """Open Library records for the first `n_titles` titles of make_titles, as enrich_books returns them."""
+    rng = np.random.default_rng(seed)
+    titles = make_titles(n_titles, rng)
+    return pd.DataFrame({
+        'Title': titles,
+        'Author': np.array([f"Author {i}" for i in range(n_authors)], dtype=object)[rng.integers(0, n_authors, n_titles)],
+        'First_Publish_Year': rng.integers(1800, 2024, n_titles),
+        'ISBN': '',
+        'OpenLibrary_ID': [f"/works/OL{i}W" for i in range(n_titles)],
+    })
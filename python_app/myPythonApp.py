@@ -1,66 +1,477 @@
 import argparse
-import pandas as pd
-from utils.booksAPIFetch import enrich_books
-import utils.projectFunctions as projectFunctions
-from utils.DE_metrics import get_num_customers, get_num_books, get_num_api_requests
-
-# Set up command-line arguments
-parser = argparse.ArgumentParser(description="Clean library data and optionally write to SQL Server.")
-parser.add_argument("--write-to-sql", action="store_true", help="Write cleaned data to SQL Server")
-args = parser.parse_args()
-
-# --- Clean Customer Data ---
-customer_cleaned = projectFunctions.clean_data(
-    "./raw_data/03_Library SystemCustomers.csv",
-    output_file="./output/customerCleanedPy.csv"
-)
-print("✅ Customer data cleansed.")
-
-# --- Clean Book Data (with date correction) ---
-book_cleaned = projectFunctions.clean_data(
-    "./raw_data/03_Library Systembook.csv",
-    date_columns=['Book checkout', 'Book Returned'],
-    output_file="./output/bookCleanedPy.csv"
-)
-print("✅ Book data cleansed.")
-
-# --- Clean Books Enhanced API Information ---
-# Enrich with Open Library API
-df_enriched = enrich_books(book_cleaned)
-df_enriched.to_csv("./raw_data/bookEnrichedWithAPI.csv", index=False)
-print("✅ Book data enriched.")
-
-book_api = projectFunctions.clean_data(
-    "./raw_data/bookEnrichedWithAPI.csv",
-    output_file="./output/bookEnrichedAPICleanedPy.csv"
-)
-print("✅ Book Enriched data cleansed.")
-
-# --- Load Cleaned CSVs ---
-df_customer = pd.read_csv('./output/customerCleanedPy.csv')
-df_book = pd.read_csv('./output/bookCleanedPy.csv')
-df_bookEnriched = pd.read_csv('./output/bookEnrichedAPICleanedPy.csv')
-print("✅ All cleansed CSVs loaded.")
-
-# --- Metrics Calculation ---
-num_customers = get_num_customers(df_customer)
-num_books = get_num_books(df_book)
-num_api_requests = get_num_api_requests(df_bookEnriched)
-
-metrics_df = pd.DataFrame([{
-    "num_customers": num_customers,
-    "num_books": num_books,
-    "num_api_requests": num_api_requests
-}])
-print(f"📊 Metrics: Customers={num_customers}, Books={num_books}, API Requests={num_api_requests}")
-
-# --- Optional SQL Write ---
-if args.write_to_sql:
+import cProfile
+import importlib.util
+import os
+import sys
+
+# Heavy modules (pandas, requests, SQLAlchemy) are imported inside the stage that
+# needs them, so `--help` and single subcommands start without the rest.
+
+COMMANDS = {
+    "clean": "Clean the raw Customer and Book files into ./output",
+    "enrich": "Look up the cleaned books on Open Library and clean the result",
+    "metrics": "Compute the metrics and dashboard aggregates from the cleaned outputs",
+    "load": "Write the cleaned outputs and metrics to SQL Server",
+    "all": "Run every stage in one process (the default when no subcommand is given)",
+}
+
+CUSTOMER_RAW = "./raw_data/03_Library SystemCustomers.csv"
+BOOK_RAW = "./raw_data/03_Library Systembook.csv"
+BOOK_API_RAW = "./raw_data/bookEnrichedWithAPI.csv"
+
+# What the stages see for options their subcommand doesn't have
+STAGE_DEFAULTS = {"chunksize": 0, "incremental": False, "workers": 1, "compact_dtypes": False,
+                  "backend": "pandas", "schema": False, "stream": 0, "write_to_sql": False, "sql_upsert": False, "sql_chunksize": 10_000, "sql_url": None}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Clean library data and optionally write to SQL Server.")
+    subparsers = parser.add_subparsers(dest="command", metavar="{" + ",".join(COMMANDS) + "}")
+
+    for command, help_text in COMMANDS.items():
+        sub = subparsers.add_parser(command, help=help_text, description=help_text)
+        if command in ("clean", "all"):
+            mode = sub.add_mutually_exclusive_group()
+            mode.add_argument("--chunksize", type=int, default=0, help="Clean the raw files in chunks of this many rows (for files larger than memory)")
+            mode.add_argument("--incremental", action="store_true", help="Only clean and enrich rows that changed since the last --incremental run")
+            if command == "all":
+                mode.add_argument("--stream", type=int, default=0, metavar="ROWS",
+                                  help="Stream chunks of ROWS loans through clean, enrich, enriched clean and load/metrics at the same time")
+            sub.add_argument("--workers", type=int, default=1, help="Clean the Customer and Book files in parallel processes")
+            sub.add_argument("--compact-dtypes", action="store_true", help="Shrink the cleaned tables in memory (Int32 IDs, day counts, categoricals) and report the saving; outputs are unchanged")
+            sub.add_argument("--backend", choices=["pandas", "polars", "duckdb"], default="pandas",
+                             help="Engine for clean_data steps 1-7; polars and duckdb run them as one multithreaded plan")
+            sub.add_argument("--schema", action="store_true",
+                             help="Read the raw files with the column types declared in scripts/SQLTableCreation, reporting values that don't fit")
+        if command == "enrich":
+            sub.add_argument("--incremental", action="store_true", help="Only enrich titles not enriched by an earlier --incremental run")
+        if command == "all":
+            sub.add_argument("--write-to-sql", action="store_true", help="Write cleaned data to SQL Server")
+        if command in ("load", "all"):
+            sub.add_argument("--sql-upsert", action="store_true", help="MERGE into the SQL tables on their keys instead of replacing them")
+            sub.add_argument("--sql-chunksize", type=int, default=10_000, help="Rows per batch when writing to SQL Server")
+            sub.add_argument("--sql-url", metavar="URL",
+                             help="SQLAlchemy URL to write to instead of the local SQL Server, e.g. sqlite:///output/library.db")
+        sub.add_argument("--format", choices=["csv", "parquet", "arrow"], default="csv", help="File format of the cleaned outputs")
+        sub.add_argument("--profile", action="store_true", help="Time every stage and clean_data step; writes ./output/profile.json")
+        sub.add_argument("--profile-dump", metavar="PATH", help="Also write a cProfile dump of the whole run (view with snakeviz or pstats)")
+        # Options the stages read that this subcommand doesn't offer
+        sub.set_defaults(**{key: value for key, value in STAGE_DEFAULTS.items() if sub.get_default(key) is None})
+    return parser
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # No subcommand (e.g. `myPythonApp.py --write-to-sql`) runs the whole pipeline, as before
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv.insert(0, "all")
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.chunksize and args.format != "csv":
+        parser.error("--chunksize only supports --format csv")
+    if args.stream and (args.format != "csv" or args.workers > 1 or args.backend != "pandas" or args.compact_dtypes):
+        parser.error("--stream only supports --format csv, one worker and the pandas backend")
+    if args.backend != "pandas" and (args.chunksize or args.incremental or args.workers > 1):
+        parser.error("--backend only applies to a plain clean (no --chunksize, --incremental or --workers)")
+    if args.schema and (args.incremental or args.backend != "pandas"):
+        parser.error("--schema doesn't apply to --incremental or a non-pandas --backend")
+    # The default SQL Server URL goes through pyodbc, which isn't installed everywhere (e.g. the Docker image)
+    if (args.command == "load" or args.write_to_sql) and not args.sql_url and importlib.util.find_spec("pyodbc") is None:
+        parser.error("writing to SQL Server needs pyodbc and its ODBC driver; install them or pass --sql-url")
+    return args
+
+
+def main(argv: list = None):
+    args = parse_args(argv)
+
+    if args.profile or args.profile_dump:
+        from utils.pipelineProfiler import PipelineProfiler
+        profiler = PipelineProfiler()
+    else:
+        from utils.pipelineProfiler import NULL_PROFILER
+        profiler = NULL_PROFILER
+
+    if args.profile_dump:
+        with cProfile.Profile() as cprofile:
+            run_command(args, profiler)
+        cprofile.dump_stats(args.profile_dump)
+        print(f"🔍 cProfile dump written to {args.profile_dump}")
+    else:
+        run_command(args, profiler)
+
+    if profiler.enabled:
+        profiler.to_json("./output/profile.json")
+        print(profiler.format_table())
+        print("🔍 Profile written to ./output/profile.json")
+
+
+def output_paths(file_format: str) -> dict:
+    # Cleaned outputs; the extension picks the format
+    return {
+        "customers": f"./output/customerCleanedPy.{file_format}",
+        "books": f"./output/bookCleanedPy.{file_format}",
+        "books_api": f"./output/bookEnrichedAPICleanedPy.{file_format}",
+        # Per-customer / per-title loan sums (utils/loanRollups.py)
+        "customer_rollup": f"./output/customerRollupPy.{file_format}",
+        "title_rollup": f"./output/titleRollupPy.{file_format}",
+    }
+
+
+def load_cleaned(args, profiler, *names) -> list:
+    # Standalone subcommands start from the files an earlier stage wrote
+    import pandas as pd
+    from utils.projectFunctions import load_output
+    paths = output_paths(args.format)
+    with profiler.stage("load cleaned outputs"):
+        frames = [profiler.run(f"load {name}", load_output, paths[name]) for name in names]
+    # CSV has no date type: parse the loan dates back, so the frames match what the clean returned
+    for df in frames:
+        for col in ('Book checkout', 'Book Returned'):
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col])
+    return frames
+
+
+def run_command(args, profiler):
+    if args.command == "clean":
+        run_clean(args, profiler)
+    elif args.command == "enrich":
+        (book_cleaned,) = load_cleaned(args, profiler, "books")
+        run_enrich(args, profiler, book_cleaned)
+    elif args.command == "metrics":
+        run_metrics(args, profiler, *load_cleaned(args, profiler, "customers", "books", "books_api"))
+    elif args.command == "load":
+        tables = load_cleaned(args, profiler, "customers", "books", "books_api")
+        run_load(args, profiler, *tables, metrics_frame(*tables))
+    else:
+        run_pipeline(args, profiler)
+
+
+def run_pipeline(args, profiler):
+    if args.stream:
+        return run_streaming(args, profiler)
+    customer_cleaned, book_cleaned = run_clean(args, profiler)
+    book_api = run_enrich(args, profiler, book_cleaned)
+    if args.compact_dtypes:
+        # The compact frames have Int32 IDs, day counts and categoricals. Metrics, rollups,
+        # dashboard aggregates and SQL tables start from the saved outputs instead, as the
+        # `metrics` and `load` subcommands do, so they don't change with --compact-dtypes
+        del customer_cleaned, book_cleaned
+        customer_cleaned, book_cleaned = load_cleaned(args, profiler, "customers", "books")
+    metrics_df = run_metrics(args, profiler, customer_cleaned, book_cleaned, book_api)
+
+    # --- Optional SQL Write ---
+    if args.write_to_sql:
+        run_load(args, profiler, customer_cleaned, book_cleaned, book_api, metrics_df)
+    else:
+        print("⚠️ SQL write skipped. Use --write-to-sql to enable.")
+
+
+def run_streaming(args, profiler):
+    import functools
+    import pandas as pd
+    import utils.projectFunctions as projectFunctions
+    from utils.DE_metrics import get_num_customers
+    from utils.dashboardMetrics import save_aggregates
+    from utils.booksAPIFetch import enrich_books
+    from utils.openLibraryCache import OpenLibraryCache
+    from utils.streamingPipeline import stream_pipeline
+    paths = output_paths(args.format)
+    sql_writers = {}
+
+    # Customers are small and every later stage may need them: cleaned up front
+    with profiler.stage("clean customers") as stage:
+        customer_cleaned = projectFunctions.clean_data(CUSTOMER_RAW, output_file=paths["customers"], profiler=profiler,
+                                                       schema="Customers" if args.schema else None)
+        stage["rows_out"] = len(customer_cleaned)
+    print("✅ Customer data cleansed.")
+
+    if args.write_to_sql:
+        from utils.loadToServer import write_df_to_sql
+        sql_options = {"database": 'MVP_Library', "chunksize": args.sql_chunksize, "upsert": args.sql_upsert,
+                       "connection_string": args.sql_url}
+        write_df_to_sql(customer_cleaned, table_name='Customers', **sql_options)
+
+        def chunk_writer(table_name):
+            # The first non-empty chunk replaces the table, the rest are appended (or all MERGEd
+            # with --sql-upsert); an empty chunk would create the table with placeholder column types
+            chunks_written = [0]
+
+            def write(chunk):
+                if chunk.empty:
+                    return
+                if_exists = 'replace' if chunks_written[0] == 0 else 'append'
+                write_df_to_sql(chunk, table_name=table_name, if_exists=if_exists, **sql_options)
+                chunks_written[0] += 1
+            return write
+        sql_writers = {"on_books": chunk_writer('Books'), "on_books_api": chunk_writer('BooksEnriched')}
+
+    with profiler.stage(f"stream books (chunks of {args.stream:,})") as stage:
+        with OpenLibraryCache("./output/openLibraryCache.sqlite") as api_cache:
+            result = stream_pipeline(
+                BOOK_RAW, paths["books"], BOOK_API_RAW, paths["books_api"],
+                chunksize=args.stream,
+                enrich=functools.partial(enrich_books, cache=api_cache),
+                schema="Books" if args.schema else None,
+                **sql_writers
+            )
+        stage["rows_out"] = result["books_rows"] + result["books_api_rows"]
+    print(f"✅ Book data cleansed, enriched and cleansed again "
+          f"({result['books_rows']} loans, {result['books_api_rows']} enriched rows in {result['chunks']} chunks).")
+
+    metrics_df = pd.DataFrame([{
+        "num_customers": get_num_customers(customer_cleaned),
+        "num_books": len(result["title_rollup"]),
+        "num_api_requests": result["books_api_rows"],
+    }])
+    print(f"📊 Metrics: Customers={metrics_df.at[0, 'num_customers']}, Books={metrics_df.at[0, 'num_books']}, "
+          f"API Requests={metrics_df.at[0, 'num_api_requests']}")
+    result["customer_rollup"].save(paths["customer_rollup"])
+    result["title_rollup"].save(paths["title_rollup"])
+    print("✅ Loan rollups written.")
+    with profiler.stage("dashboard aggregates"):
+        save_aggregates("./output", result["aggregates"].aggregates(customer_cleaned))
+    print("✅ Dashboard aggregates written.")
+
+    if args.write_to_sql:
+        write_df_to_sql(metrics_df, table_name='Metrics', **sql_options)
+        write_df_to_sql(result["customer_rollup"].table(customer_cleaned), table_name='CustomerRollup', **sql_options)
+        write_df_to_sql(result["title_rollup"].table(), table_name='TitleRollup', **sql_options)
+        print("✅ Data written to the SQL database.")
+    else:
+        print("⚠️ SQL write skipped. Use --write-to-sql to enable.")
+
+
+def run_clean(args, profiler) -> tuple:
+    import utils.projectFunctions as projectFunctions
+    paths = output_paths(args.format)
+    customer_output, book_output = paths["customers"], paths["books"]
+    # --schema: read each raw file with its table's declared column types (utils/csvSchemas.py)
+    customer_schema, book_schema = ("Customers", "Books") if args.schema else (None, None)
+
+    if args.incremental:
+        from utils.incrementalRun import RunManifest, clean_data_incremental
+        manifest = RunManifest("./output/manifest.json")
+        # --- Clean only new or changed Customer and Book rows ---
+        with profiler.stage("clean customers (incremental)") as stage:
+            customer_cleaned, new_customers = clean_data_incremental(
+                CUSTOMER_RAW,
+                output_file=customer_output,
+                manifest=manifest
+            )
+            stage["rows_in"], stage["rows_out"] = len(new_customers), len(customer_cleaned)
+        print(f"✅ Customer data cleansed. ({len(new_customers)} new rows)")
+
+        with profiler.stage("clean books (incremental)") as stage:
+            book_cleaned, new_books = clean_data_incremental(
+                BOOK_RAW,
+                output_file=book_output,
+                manifest=manifest,
+                date_columns=['Book checkout', 'Book Returned']
+            )
+            stage["rows_in"], stage["rows_out"] = len(new_books), len(book_cleaned)
+        print(f"✅ Book data cleansed. ({len(new_books)} new rows)")
+        manifest.save()
+    elif args.chunksize:
+        # --- Clean Customer and Book Data chunk by chunk ---
+        with profiler.stage("clean customers (chunked)") as stage:
+            stage["rows_out"] = projectFunctions.clean_data_in_chunks(
+                CUSTOMER_RAW,
+                output_file=customer_output,
+                chunksize=args.chunksize,
+                schema=customer_schema
+            )
+        print("✅ Customer data cleansed.")
+
+        with profiler.stage("clean books (chunked)") as stage:
+            stage["rows_out"] = projectFunctions.clean_data_in_chunks(
+                BOOK_RAW,
+                output_file=book_output,
+                date_columns=['Book checkout', 'Book Returned'],
+                chunksize=args.chunksize,
+                schema=book_schema
+            )
+        # Chunked outputs were never held in memory as a whole, so load them back
+        customer_cleaned, book_cleaned = load_cleaned(args, profiler, "customers", "books")
+        print("✅ Book data cleansed.")
+    elif args.workers > 1:
+        from utils.parallelClean import clean_files_parallel
+        # --- Clean Customer and Book Data at the same time, one process each ---
+        # (steps run in the worker processes, so only the stage as a whole is timed)
+        with profiler.stage(f"clean customers + books ({args.workers} workers)") as stage:
+            customer_cleaned, book_cleaned = clean_files_parallel([
+                {"file_path": CUSTOMER_RAW, "output_file": customer_output, "schema": customer_schema},
+                {"file_path": BOOK_RAW, "output_file": book_output,
+                 "date_columns": ['Book checkout', 'Book Returned'], "schema": book_schema},
+            ], max_workers=args.workers)
+            stage["rows_out"] = len(customer_cleaned) + len(book_cleaned)
+        print("✅ Customer and Book data cleansed.")
+    else:
+        # --- Clean Customer Data ---
+        with profiler.stage("clean customers") as stage:
+            customer_cleaned = projectFunctions.clean_data(
+                CUSTOMER_RAW,
+                output_file=customer_output,
+                backend=args.backend,
+                schema=customer_schema,
+                profiler=profiler
+            )
+            stage["rows_out"] = len(customer_cleaned)
+        print("✅ Customer data cleansed.")
+
+        # --- Clean Book Data (with date correction) ---
+        with profiler.stage("clean books") as stage:
+            book_cleaned = projectFunctions.clean_data(
+                BOOK_RAW,
+                date_columns=['Book checkout', 'Book Returned'],
+                output_file=book_output,
+                backend=args.backend,
+                schema=book_schema,
+                profiler=profiler
+            )
+            stage["rows_out"] = len(book_cleaned)
+        print("✅ Book data cleansed.")
+
+    if args.compact_dtypes:
+        # Shrunk after the clean in every mode, so the saving can be reported
+        before = [projectFunctions.memory_usage_mb(df) for df in (customer_cleaned, book_cleaned)]
+        with profiler.stage("optimize dtypes"):
+            customer_cleaned = profiler.run("customers", projectFunctions.optimize_dtypes, customer_cleaned)
+            book_cleaned = profiler.run("books", projectFunctions.optimize_dtypes, book_cleaned)
+        after = [projectFunctions.memory_usage_mb(df) for df in (customer_cleaned, book_cleaned)]
+        print(f"📦 In memory: customers {before[0]:.2f} -> {after[0]:.2f} MB, "
+              f"books {before[1]:.2f} -> {after[1]:.2f} MB")
+
+    return customer_cleaned, book_cleaned
+
+
+def run_enrich(args, profiler, book_cleaned):
+    import pandas as pd
+    import utils.projectFunctions as projectFunctions
+    from utils.booksAPIFetch import enrich_books
+    from utils.openLibraryCache import OpenLibraryCache
+    book_api_output = output_paths(args.format)["books_api"]
+
+    if args.incremental:
+        from utils.incrementalRun import RunManifest, clean_data_incremental
+        manifest = RunManifest("./output/manifest.json")
+
+    # --- Clean Books Enhanced API Information ---
+    # Enrich with Open Library API (lookups are cached on disk between runs)
+    if args.incremental:
+        # Only titles never enriched before; their rows are appended to the enriched file
+        titles_to_enrich = manifest.unseen_titles(book_cleaned["Books"])
+        book_cleaned_for_api = pd.DataFrame({"Books": titles_to_enrich})
+    else:
+        book_cleaned_for_api = book_cleaned
+
+    with profiler.stage("enrich books") as stage:
+        with OpenLibraryCache("./output/openLibraryCache.sqlite") as api_cache:
+            answered_titles = set()
+            df_enriched = enrich_books(book_cleaned_for_api, cache=api_cache, answered_titles=answered_titles)
+            cache_stats = api_cache.stats()
+        stage["rows_in"], stage["rows_out"] = len(book_cleaned_for_api), len(df_enriched)
+
+        if args.incremental and os.path.exists(BOOK_API_RAW) and manifest.data["enriched_titles"]:
+            if not df_enriched.empty:
+                df_enriched.to_csv(BOOK_API_RAW, mode="a", header=False, index=False)
+        else:
+            df_enriched.to_csv(BOOK_API_RAW, index=False)
+    print(f"✅ Book data enriched. (cache hits={cache_stats['hits']}, misses={cache_stats['misses']}, evictions={cache_stats['evictions']})")
+
+    with profiler.stage("clean enriched books") as stage:
+        if args.incremental:
+            # Titles whose lookup failed (network error, 429/5xx) stay unseen and are retried next run
+            manifest.add_enriched_titles([title for title in titles_to_enrich if title in answered_titles])
+            failed = len(titles_to_enrich) - len(answered_titles & set(titles_to_enrich))
+            if failed:
+                print(f"⚠️ {failed} titles could not be looked up; the next --incremental run retries them.")
+            book_api, new_api_rows = clean_data_incremental(
+                BOOK_API_RAW,
+                output_file=book_api_output,
+                manifest=manifest
+            )
+            manifest.save()
+        else:
+            book_api = projectFunctions.clean_data(
+                BOOK_API_RAW,
+                output_file=book_api_output,
+                schema="BooksEnriched" if args.schema else None,
+                profiler=profiler
+            )
+        stage["rows_out"] = len(book_api)
+    print("✅ Book Enriched data cleansed.")
+
+    return book_api
+
+
+def metrics_frame(df_customer, df_book, df_bookEnriched):
+    import pandas as pd
+    from utils.DE_metrics import get_num_customers, get_num_books, get_num_api_requests
+
+    num_customers = get_num_customers(df_customer)
+    num_books = get_num_books(df_book)
+    num_api_requests = get_num_api_requests(df_bookEnriched)
+    print(f"📊 Metrics: Customers={num_customers}, Books={num_books}, API Requests={num_api_requests}")
+
+    return pd.DataFrame([{
+        "num_customers": num_customers,
+        "num_books": num_books,
+        "num_api_requests": num_api_requests
+    }])
+
+
+def run_metrics(args, profiler, df_customer, df_book, df_bookEnriched):
+    from utils.dashboardMetrics import write_aggregates
+    from utils.loanRollups import LoanRollup
+    paths = output_paths(args.format)
+
+    # --- Metrics Calculation ---
+    with profiler.stage("metrics"):
+        metrics_df = metrics_frame(df_customer, df_book, df_bookEnriched)
+
+    # Per-customer and per-title rollups, stored so the SQL load reads them instead of every loan
+    with profiler.stage("loan rollups") as stage:
+        for name, key_col in (("customer_rollup", "Customer ID"), ("title_rollup", "Books")):
+            rollup = profiler.run(name, LoanRollup.from_loans, df_book, key_col)
+            rollup.save(paths[name])
+        stage["rows_in"] = len(df_book)
+    print("✅ Loan rollups written.")
+
+    # Precompute everything the dashboard shows so it doesn't have to parse the outputs
+    with profiler.stage("dashboard aggregates"):
+        write_aggregates("./output", df_customer, df_book, df_bookEnriched)
+    print("✅ Dashboard aggregates written.")
+    return metrics_df
+
+
+def run_load(args, profiler, df_customer, df_book, df_bookEnriched, metrics_df):
     from utils.loadToServer import write_df_to_sql
-    write_df_to_sql(df_book, table_name='Books', database='MVP_Library')
-    write_df_to_sql(df_customer, table_name='Customers', database='MVP_Library')
-    write_df_to_sql(df_bookEnriched, table_name='BooksEnriched', database='MVP_Library')
-    write_df_to_sql(metrics_df, table_name='Metrics', database='MVP_Library')
-    print("✅ Data written to SQL Server.")
-else:
-    print("⚠️ SQL write skipped. Use --write-to-sql to enable.")
+    from utils.loanRollups import LoanRollup
+    paths = output_paths(args.format)
+
+    # The rollups `metrics` stored; built from the loans when it hasn't run
+    rollups = {}
+    for name, key_col in (("customer_rollup", "Customer ID"), ("title_rollup", "Books")):
+        if os.path.exists(paths[name]):
+            rollups[name] = LoanRollup.load(paths[name], key_col)
+        else:
+            rollups[name] = LoanRollup.from_loans(df_book, key_col)
+
+    sql_options = {"database": 'MVP_Library', "chunksize": args.sql_chunksize, "upsert": args.sql_upsert,
+                   "connection_string": args.sql_url}
+    with profiler.stage("SQL write"):
+        profiler.run("Books", write_df_to_sql, df_book, table_name='Books', **sql_options)
+        profiler.run("Customers", write_df_to_sql, df_customer, table_name='Customers', **sql_options)
+        profiler.run("BooksEnriched", write_df_to_sql, df_bookEnriched, table_name='BooksEnriched', **sql_options)
+        profiler.run("Metrics", write_df_to_sql, metrics_df, table_name='Metrics', **sql_options)
+        profiler.run("CustomerRollup", write_df_to_sql, rollups["customer_rollup"].table(df_customer),
+                     table_name='CustomerRollup', **sql_options)
+        profiler.run("TitleRollup", write_df_to_sql, rollups["title_rollup"].table(),
+                     table_name='TitleRollup', **sql_options)
+    print("✅ Data written to the SQL database.")
+
+
+# The guard keeps worker processes (--workers) from re-running the pipeline on import
+if __name__ == "__main__":
+    main()
@@ -8,33 +8,81 @@ import matplotlib.pyplot as plt
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
 try:
-    from utils.DE_metrics import get_num_customers, get_num_books, get_num_api_requests
+    from utils.dashboardMetrics import load_aggregates, source_files, find_output, AGGREGATES_FILE, BOOKS_OUTPUT
+    from utils.loanIndex import LoanIndex
 except ModuleNotFoundError:
-    # Try absolute path if running from a different working directory
-    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
-    from DE_metrics import get_num_customers, get_num_books, get_num_api_requests
+    # Try the app folder itself if running from a different working directory
+    sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+    from utils.dashboardMetrics import load_aggregates, source_files, find_output, AGGREGATES_FILE, BOOKS_OUTPUT
+    from utils.loanIndex import LoanIndex
 
-customers = pd.read_csv("output/customerCleanedPy.csv")
-books = pd.read_csv("output/bookCleanedPy.csv")
-api_books = pd.read_csv("output/bookEnrichedAPICleanedPy.csv")
+OUTPUT_DIR = "output"
 
-st.metric("Number of Customers", get_num_customers(customers))
-st.metric("Number of Books", get_num_books(books))
-st.metric("Number of API Requests", get_num_api_requests(api_books))
+
+def files_signature(output_dir: str) -> tuple:
+    # Size and mtime of every file the aggregates depend on; any change gives a new cache key
+    signature = []
+    for path in source_files(output_dir) + [os.path.join(output_dir, AGGREGATES_FILE)]:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+@st.cache_data
+def cached_aggregates(output_dir: str, signature: tuple) -> dict:
+    # Widget interactions rerun the script; this only runs again when the files change
+    return load_aggregates(output_dir)
+
+
+@st.cache_resource
+def cached_loan_index(books_file: str, signature: tuple) -> LoanIndex:
+    # Built on the first lookup and shared by every session until the book output changes
+    return LoanIndex.from_output(books_file)
+
+
+aggregates = cached_aggregates(OUTPUT_DIR, files_signature(OUTPUT_DIR))
+metrics = aggregates["metrics"]
+charts = aggregates["charts"]
+
+st.metric("Number of Customers", metrics["num_customers"])
+st.metric("Number of Books", metrics["num_books"])
+st.metric("Number of API Requests", metrics["num_api_requests"])
 
 # Example: Bar chart of top 5 most borrowed books
 st.subheader("Top 5 Most Borrowed Books")
-top_books = books["Books"].value_counts().head(5)
+top_books = pd.Series(charts.get("top_books", {}), dtype="int64")
 st.bar_chart(top_books.rename_axis("Book Title").rename("Number of Borrows"))
 
 # Example: Pie chart of overdue vs on time
-if "OverdueAlert" in books.columns:
+if "overdue_alerts" in charts:
     st.write("Overdue vs On Time Returns")
-    st.pyplot(books["OverdueAlert"].value_counts().plot.pie(autopct='%1.1f%%', figsize=(4,4)).get_figure())
+    st.pyplot(pd.Series(charts["overdue_alerts"]).plot.pie(autopct='%1.1f%%', figsize=(4,4)).get_figure())
 
 # Example: Histogram of borrow durations
-if "BorrowDuration" in books.columns:
+if "borrow_durations" in charts:
     st.write("Borrow Duration Distribution")
-    st.bar_chart(books["BorrowDuration"].dropna())
+    durations = pd.Series(charts["borrow_durations"], dtype="int64")
+    durations.index = durations.index.astype(int)
+    st.bar_chart(durations.rename_axis("Borrow Duration (days)").rename("Number of Loans"))
+
+# Loan lookup by customer or title (the book table is only loaded once someone searches)
+st.subheader("Loan Lookup")
+customer_query = st.text_input("Customer ID")
+title_query = st.text_input("Book title")
+if customer_query or title_query:
+    signature = files_signature(OUTPUT_DIR)
+    loan_index = cached_loan_index(find_output(OUTPUT_DIR, BOOKS_OUTPUT), signature)
+    if customer_query:
+        try:
+            customer_id = float(customer_query)
+        except ValueError:
+            st.write("Customer ID must be a number.")
+        else:
+            st.write("On loan:")
+            st.dataframe(loan_index.on_loan(customer_id))
+    if title_query:
+        st.write("Loans of this title:")
+        st.dataframe(loan_index.loans_for_title(title_query))
 
-#to run: python -m streamlit run streamlitDashboard.py --server.port 8502
\ No newline at end of file
+#to run: python -m streamlit run streamlitDashboard.py --server.port 8502
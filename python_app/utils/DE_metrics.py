@@ -1,5 +1,76 @@
+import numpy as np
 import pandas as pd
 
+def _count_values(series: pd.Series) -> tuple:
+    """Hash each value once: return (counts, uniques) in first-seen order, missing values left out."""
+    # value_counts(sort=False) keeps the order values first appear in (for str columns too,
+    # where pyarrow counts them); a categorical column lists its categories in category order
+    value_counts = series.value_counts(sort=False)
+    value_counts = value_counts[value_counts > 0]  # categories no row uses
+    return value_counts.to_numpy(), value_counts.index
+
+def _mode_from_counts(counts: np.ndarray, uniques) -> object:
+    """
+    Most frequent value; ties go to the smallest value, like Series.mode().iloc[0].
+    Ties between values that can't be compared (e.g. 3 and "3") go to the first seen.
+    """
+    if len(counts) == 0:
+        return None
+    tied = uniques[counts == counts.max()]
+    try:
+        return min(tied)
+    except TypeError:
+        return tied[0]  # uniques come from _count_values, first seen first
+
+def _loan_totals(books_df: pd.DataFrame) -> dict:
+    """Average borrow duration, overdue and still-open loans from the loan columns' arrays."""
+    totals = {"average_borrow_duration": 0.0, "num_overdue": 0, "num_currently_borrowed": 0}
+    if "BorrowDuration" in books_df.columns:
+        duration = books_df["BorrowDuration"].to_numpy(dtype="float64", na_value=np.nan)
+        measured = ~np.isnan(duration)
+        count = measured.sum()
+        # Missing durations count as 0 in the sum, as in Series.mean()
+        totals["average_borrow_duration"] = np.where(measured, duration, 0).sum() / count if count else np.nan
+    if "OverdueAlert" in books_df.columns:
+        totals["num_overdue"] = books_df["OverdueAlert"].eq("OVERDUE").sum()
+    if "Book Returned" in books_df.columns:
+        totals["num_currently_borrowed"] = books_df["Book Returned"].isna().sum()
+    return totals
+
+def compute_all_metrics(books_df: pd.DataFrame, customers_df: pd.DataFrame, api_df: pd.DataFrame) -> dict:
+    """
+    Return every metric in this module, scanning each column used only once.
+    The get_* functions below return the same values one at a time.
+    """
+    metrics = {
+        "num_customers": 0,
+        "num_books": 0,
+        "num_api_requests": len(api_df),
+        "num_unique_authors": 0,
+        "most_borrowed_book": "",
+        "most_active_customer": "",
+        **_loan_totals(books_df),
+    }
+
+    if "Customer ID" in customers_df.columns:
+        metrics["num_customers"] = len(pd.unique(customers_df["Customer ID"].dropna()))
+    if "Author" in api_df.columns:
+        metrics["num_unique_authors"] = len(pd.unique(api_df["Author"].dropna()))
+
+    # Titles and customer IDs: one hashing pass each gives both the unique count and the mode
+    if "Books" in books_df.columns:
+        counts, uniques = _count_values(books_df["Books"])
+        metrics["num_books"] = len(uniques)
+        if len(uniques):
+            metrics["most_borrowed_book"] = _mode_from_counts(counts, uniques)
+
+    if "Customer ID" in books_df.columns:
+        counts, uniques = _count_values(books_df["Customer ID"])
+        if len(uniques):
+            metrics["most_active_customer"] = str(_mode_from_counts(counts, uniques))
+
+    return metrics
+
 def get_num_customers(customers_df: pd.DataFrame) -> int:
     """Return the number of unique customers."""
     if "Customer ID" in customers_df.columns:
@@ -25,13 +96,15 @@ def get_num_unique_authors(api_df: pd.DataFrame) -> int:
 def get_most_borrowed_book(books_df: pd.DataFrame) -> str:
     """Return the most borrowed book."""
     if "Books" in books_df.columns:
-        return books_df["Books"].mode().iloc[0]
+        book = _mode_from_counts(*_count_values(books_df["Books"]))
+        return book if book is not None else ""
     return ""
 
 def get_most_active_customer(books_df: pd.DataFrame) -> str:
     """Return the most active customer."""
     if "Customer ID" in books_df.columns:
-        return str(books_df["Customer ID"].mode().iloc[0])
+        customer = _mode_from_counts(*_count_values(books_df["Customer ID"]))
+        return str(customer) if customer is not None else ""
     return ""
 
 def get_average_borrow_duration(books_df: pd.DataFrame) -> float:
@@ -1,35 +1,341 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+
+from utils.openLibraryCache import OpenLibraryCache
+from utils.titleIndex import TitleIndex
+
+try:
+    import aiohttp  # non-blocking client for enrich_books_async; worker threads are used without it
+except ImportError:
+    aiohttp = None
+
+OPENLIBRARY_URL = "https://openlibrary.org"
+
+# Only the fields fetch_openlibrary_data reads, and only the first match
+SEARCH_FIELDS = "title,author_name,first_publish_year,isbn,key"
+
+# Responses worth retrying: rate limited or a temporary server-side problem
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HostRateLimiter:
+    """Spaces out requests so each host sees at most `requests_per_second`."""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, url: str) -> float:
+        # Reserve the next free slot for this host; returns how long to wait for it
+        if not self.interval:
+            return 0.0
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        return slot - now
+
+    def wait(self, url: str) -> None:
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str) -> None:
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """Create a keep-alive session whose connection pool fits `pool_size` workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_with_retry(
+    url: str,
+    session: requests.Session = None,
+    rate_limiter: HostRateLimiter = None,
+    max_retries: int = 3,
+    backoff: float = 0.5
+) -> requests.Response:
+    """
+    GET a URL, retrying on 429/5xx with exponential backoff.
+    A Retry-After header (in seconds) from the server takes precedence over the backoff.
+    """
+    http = session if session is not None else requests
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.wait(url)
+        response = http.get(url)
+        if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+            return response
+
+        time.sleep(_retry_delay(response.headers, attempt, backoff))
+    return response
 
-def fetch_openlibrary_data(title: str):
-    url = f"https://openlibrary.org/search.json?title={title}"
+
+def _retry_delay(headers, attempt: int, backoff: float) -> float:
+    retry_after = headers.get("Retry-After", "")
+    return float(retry_after) if retry_after.isdigit() else backoff * 2 ** attempt
+
+
+def search_url(title: str, base_url: str = OPENLIBRARY_URL) -> str:
+    # Titles hold spaces, '&', '#' and the like, so encode them; the field list keeps its commas
+    return f"{base_url}/search.json?" + urlencode({"title": title, "fields": SEARCH_FIELDS, "limit": 1}, safe=",")
+
+
+def _book_record(data: dict):
+    # First match of a search.json response, or None when nothing matched
+    if data["numFound"] == 0 or not data["docs"]:
+        return None
+    doc = data["docs"][0]
+    return {
+        "Title": doc.get("title", ""),
+        "Author": doc.get("author_name", [""])[0],
+        "First_Publish_Year": doc.get("first_publish_year", ""),
+        "ISBN": doc.get("isbn", [""])[0] if "isbn" in doc else "",
+        "OpenLibrary_ID": doc.get("key", ""),
+    }
+
+
+def _fetch(
+    title: str,
+    session: requests.Session = None,
+    rate_limiter: HostRateLimiter = None,
+    base_url: str = OPENLIBRARY_URL,
+    cache: OpenLibraryCache = None
+) -> tuple:
+    # (answered, record): answered is False when the request failed, so the title is worth retrying
+    # Answer from the on-disk cache when we can, including cached "no match" results
+    if cache is not None:
+        found, book_data = cache.get(title)
+        if found:
+            return True, book_data
+
+    url = search_url(title, base_url)
 
     try:
-        response = requests.get(url)
+        response = get_with_retry(url, session=session, rate_limiter=rate_limiter)
         response.raise_for_status()
-        data = response.json()
-
-        if data["numFound"] > 0:
-            doc = data["docs"][0]  # use the first match
-            return {
-                "Title": doc.get("title", ""),
-                "Author": doc.get("author_name", [""])[0],
-                "First_Publish_Year": doc.get("first_publish_year", ""),
-                "ISBN": doc.get("isbn", [""])[0] if "isbn" in doc else "",
-                "OpenLibrary_ID": doc.get("key", ""),
-            }
-        else:
-            return None
+        book_data = _book_record(response.json())
+
+        # Errors above skip this, so failed lookups are retried on the next run
+        if cache is not None:
+            cache.put(title, book_data)
+        return True, book_data
     except Exception as e:
         print(f"❌ Error for '{title}': {e}")
-        return None
+        return False, None
+
+
+def fetch_openlibrary_data(
+    title: str,
+    session: requests.Session = None,
+    rate_limiter: HostRateLimiter = None,
+    base_url: str = OPENLIBRARY_URL,
+    cache: OpenLibraryCache = None
+):
+    return _fetch(title, session, rate_limiter, base_url, cache)[1]
+
+
+def _lookup_titles(titles: list, max_workers: int, requests_per_second: float, base_url: str, cache: OpenLibraryCache) -> list:
+    # One (answered, record) per title, in order (record None where there was no match or the request failed)
+    rate_limiter = HostRateLimiter(requests_per_second)
+    with make_session(max_workers) as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            lambda title: _fetch(title, session, rate_limiter, base_url, cache),
+            titles
+        ))
+
 
-def enrich_books(book_df: pd.DataFrame):
-    enriched = []
+def _title_index(book_df: pd.DataFrame) -> TitleIndex:
+    # The most borrowed spelling of each title is the one sent to the API
+    return TitleIndex(book_df["Books"].dropna().unique(), counts=book_df["Books"].value_counts().to_dict())
 
-    for title in book_df["Books"].dropna().unique():
-        book_data = fetch_openlibrary_data(title)
-        if book_data:
-            enriched.append(book_data)
+
+def enrich_books(
+    book_df: pd.DataFrame,
+    max_workers: int = 8,
+    requests_per_second: float = 10,
+    base_url: str = OPENLIBRARY_URL,
+    cache: OpenLibraryCache = None,
+    canonicalize: bool = True,
+    answered_titles: set = None
+):
+    """
+    Look up every unique title on Open Library using a pool of `max_workers` threads
+    that share one keep-alive session. Rows come back in the same order as the titles.
+    Titles found in `cache` are answered without any HTTP request.
+    With `canonicalize`, variants of one title ("Dune", "Dune ", "dune") are grouped
+    by TitleIndex and only one of them is looked up.
+    Titles whose lookup got an answer (a record or a definite no match, not a failed
+    request) are added to `answered_titles` when it is given.
+    """
+    if canonicalize:
+        title_index = _title_index(book_df)
+        titles = list(title_index.representative.values())
+        groups = [title_index.variants(key) for key in title_index.representative]
+    else:
+        titles = book_df["Books"].dropna().unique()
+        groups = [[title] for title in titles]
+
+    results = _lookup_titles(titles, max_workers, requests_per_second, base_url, cache)
+    if answered_titles is not None:
+        answered_titles.update(title for (answered, _), group in zip(results, groups) if answered for title in group)
+    enriched = [book_data for _, book_data in results if book_data]
 
     return pd.DataFrame(enriched)
+
+
+def enrich_title_variants(
+    book_df: pd.DataFrame,
+    max_workers: int = 8,
+    requests_per_second: float = 10,
+    base_url: str = OPENLIBRARY_URL,
+    cache: OpenLibraryCache = None
+) -> pd.DataFrame:
+    """
+    Like enrich_books, but with one row per raw title in book_df["Books"]: the raw
+    title, its Title_Key (shared by all its variants, stable to join on) and the
+    Open Library fields of its group's lookup. Titles without a match are left out.
+    """
+    title_index = _title_index(book_df)
+    keys = list(title_index.representative)
+    results = _lookup_titles(list(title_index.representative.values()), max_workers, requests_per_second, base_url, cache)
+    by_key = {key: book_data for key, (_, book_data) in zip(keys, results) if book_data}
+
+    rows = [
+        {"Books": title, "Title_Key": key, **by_key[key]}
+        for key in keys if key in by_key
+        for title in title_index.variants(key)
+    ]
+    return pd.DataFrame(rows)
+
+
+class _AiohttpClient:
+    """aiohttp session with a connection pool of `pool_size`; retries 429/5xx like get_with_retry."""
+
+    def __init__(self, pool_size: int):
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=pool_size))
+
+    async def get_json(self, url: str, rate_limiter: HostRateLimiter, max_retries: int = 3, backoff: float = 0.5) -> dict:
+        for attempt in range(max_retries + 1):
+            await rate_limiter.wait_async(url)
+            async with self.session.get(url) as response:
+                if response.status not in RETRY_STATUSES or attempt == max_retries:
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+                delay = _retry_delay(response.headers, attempt, backoff)
+            await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        await self.session.close()
+
+
+class _ThreadedClient:
+    """Without aiohttp: the keep-alive requests session runs in worker threads, off the event loop."""
+
+    def __init__(self, pool_size: int):
+        self.session = make_session(pool_size)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size)
+
+    async def get_json(self, url: str, rate_limiter: HostRateLimiter) -> dict:
+        response = await asyncio.get_running_loop().run_in_executor(
+            self.executor, lambda: get_with_retry(url, session=self.session, rate_limiter=rate_limiter)
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self) -> None:
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+
+def make_async_client(pool_size: int = 10):
+    """Client for fetch_openlibrary_data_async: aiohttp when installed, worker threads otherwise."""
+    return _AiohttpClient(pool_size) if aiohttp is not None else _ThreadedClient(pool_size)
+
+
+async def fetch_openlibrary_data_async(
+    title: str,
+    client=None,
+    rate_limiter: HostRateLimiter = None,
+    base_url: str = OPENLIBRARY_URL,
+    cache: OpenLibraryCache = None
+):
+    """asyncio version of fetch_openlibrary_data; `client` comes from make_async_client."""
+    # The cache is SQLite on disk, so read and write it in a worker thread, off the event loop
+    if cache is not None:
+        found, book_data = await asyncio.to_thread(cache.get, title)
+        if found:
+            return book_data
+
+    own_client = client is None
+    client = make_async_client(1) if own_client else client
+    try:
+        book_data = _book_record(await client.get_json(search_url(title, base_url), rate_limiter or HostRateLimiter(0)))
+        if cache is not None:
+            await asyncio.to_thread(cache.put, title, book_data)
+        return book_data
+    except Exception as e:
+        print(f"❌ Error for '{title}': {e}")
+        return None
+    finally:
+        if own_client:
+            await client.close()
+
+
+async def enrich_books_async(
+    book_df: pd.DataFrame,
+    max_concurrency: int = 8,
+    requests_per_second: float = 10,
+    base_url: str = OPENLIBRARY_URL,
+    cache: OpenLibraryCache = None,
+    canonicalize: bool = True
+):
+    """
+    Async generator version of enrich_books: yields each record as soon as its
+    lookup finishes (so in completion order, not title order), with at most
+    `max_concurrency` requests in flight. Titles without a match yield nothing.
+
+        async for book_data in enrich_books_async(books):
+            ...
+    """
+    if canonicalize:
+        titles = list(_title_index(book_df).representative.values())
+    else:
+        titles = book_df["Books"].dropna().unique()
+
+    rate_limiter = HostRateLimiter(requests_per_second)
+    slots = asyncio.Semaphore(max_concurrency)
+    client = make_async_client(max_concurrency)
+
+    async def lookup(title):
+        async with slots:
+            return await fetch_openlibrary_data_async(title, client, rate_limiter, base_url, cache)
+
+    tasks = [asyncio.ensure_future(lookup(title)) for title in titles]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            book_data = await finished
+            if book_data:
+                yield book_data
+    finally:
+        # The consumer may stop early; don't leave requests running
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await client.close()
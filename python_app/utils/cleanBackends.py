@@ -0,0 +1,302 @@
+"""
+clean_data's steps 1-7 as one lazy, multi-threaded query: polars (LazyFrame) or
+DuckDB (SQL). clean_data(backend=...) runs them; the result is the same pandas
+DataFrame the pandas path returns, down to dtypes and index labels.
+
+The plans assume what the raw files hold: date columns are day-first
+dd/mm/yyyy (pandas infers the format from the first value instead), and
+'Book checkout'/'Book Returned', when a file has both, are in date_columns.
+"""
+from datetime import date, datetime, time
+
+import pandas as pd
+
+from utils.projectFunctions import MISSING_VALUES
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+BACKENDS = ('pandas', 'polars', 'duckdb')
+CHECKOUT_COL = 'Book checkout'
+RETURNED_COL = 'Book Returned'
+DATE_FORMAT = '%d/%m/%Y'
+VALID_DATE = r'^(\d+)/[^/]*/[^/]*$'  # correct_dates: "<day>/<x>/<y>", day checked separately
+ROW = '__row'
+WHOLE_NUMBER = r'\s*[+-]?\d+\s*'
+INT_TYPES = {'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT', 'UTINYINT', 'USMALLINT', 'UINTEGER', 'UBIGINT'}
+
+# pandas' default na_values (read_csv keeps them with keep_default_na=True) plus ours
+NA_VALUES = sorted(set(MISSING_VALUES) | {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+
+
+def _loan_columns(columns: list, date_columns: list) -> bool:
+    has_loans = CHECKOUT_COL in columns and RETURNED_COL in columns
+    if has_loans and not {CHECKOUT_COL, RETURNED_COL} <= set(date_columns):
+        raise ValueError(f"'{CHECKOUT_COL}' and '{RETURNED_COL}' must be in date_columns for this backend.")
+    return has_loans
+
+
+def _like_pandas(df: pd.DataFrame, raw_missing: dict, date_columns: list, has_loans: bool) -> pd.DataFrame:
+    # Give the backend's result the dtypes and index pandas' read_csv and steps 1-7 produce
+    df = df.set_index(ROW)
+    df.index = pd.Index(df.index.to_numpy(dtype='int64'))
+    for col in df.columns:
+        if col in date_columns:
+            # to_datetime on no values at all picks second resolution
+            df[col] = df[col].astype('datetime64[s]' if df.empty else 'datetime64[us]')
+        elif col in ('BorrowDuration', 'OverdueAlert'):
+            continue
+        elif pd.api.types.is_integer_dtype(df[col].dtype) or pd.api.types.is_float_dtype(df[col].dtype):
+            # pandas reads an integer column with any missing value as float
+            if raw_missing.get(col) or df[col].isna().any() or pd.api.types.is_float_dtype(df[col].dtype):
+                df[col] = df[col].astype('float64')
+            else:
+                df[col] = df[col].astype('int64')
+        elif df[col].isna().all() and raw_missing.get(col) == 'all':
+            df[col] = df[col].astype('float64')  # a column that is empty in the file
+        elif pd.api.types.is_object_dtype(df[col].dtype) or pd.api.types.is_string_dtype(df[col].dtype):
+            df[col] = df[col].astype('str')
+
+    if has_loans:
+        if df.empty:
+            df['BorrowDuration'] = pd.Series(index=df.index, dtype='float64')
+            df['OverdueAlert'] = pd.Series(index=df.index, dtype='float64')
+        else:
+            duration = df['BorrowDuration']
+            df['BorrowDuration'] = duration.astype('float64' if duration.isna().any() else 'int64')
+            df['OverdueAlert'] = df['OverdueAlert'].astype('str')
+    return df
+
+
+def _today() -> datetime:
+    return datetime.combine(date.today(), time())
+
+
+def clean_frame_polars(
+    file_path: str,
+    date_columns: list = [],
+    default_date: str = '01/01/2023',
+    max_year_diff: int = 5,
+    max_allowed_days: int = 14
+) -> pd.DataFrame:
+    """clean_data steps 1-7 as one polars LazyFrame, collected on all cores."""
+    if pl is None:
+        raise ImportError("The polars backend needs polars (pip install polars).")
+    options = (date_columns, default_date, max_year_diff, max_allowed_days)
+    try:
+        # Column types come from the first rows, which costs one pass less than reading the whole file for them
+        return _clean_frame_polars(file_path, *options, infer_schema_length=100)
+    except pl.exceptions.ComputeError:
+        # A column changes type further down (e.g. 3.5 after whole numbers); infer from every row like pandas
+        return _clean_frame_polars(file_path, *options, infer_schema_length=None)
+
+
+def _clean_frame_polars(file_path, date_columns, default_date, max_year_diff, max_allowed_days, infer_schema_length):
+    # Step 1: Scan the file; date columns stay text until step 4, like in pandas.
+    # cache() lets the plan and the missing-value counts below share one read
+    raw = pl.scan_csv(
+        file_path, null_values=NA_VALUES, infer_schema_length=infer_schema_length,
+        schema_overrides={col: pl.String for col in date_columns}
+    ).cache()
+    schema = raw.collect_schema()
+    columns = list(schema.names())
+    date_columns = [col for col in date_columns if col in columns]
+    has_loans = _loan_columns(columns, date_columns)
+    text_columns = [col for col, dtype in schema.items() if dtype == pl.String]
+    number_columns = [col for col, dtype in schema.items() if dtype.is_numeric()]
+
+    # Step 1.1: Whitespace-only text to null ("NaN" and empty fields are null already)
+    plan = raw.with_row_index(ROW).with_columns([
+        pl.when(pl.col(col).str.strip_chars() == "").then(None).otherwise(pl.col(col)).alias(col)
+        for col in text_columns
+    ])
+
+    # Step 2: Drop rows with no values, and rows missing both title and customer
+    plan = plan.filter(~pl.all_horizontal([pl.col(col).is_null() for col in columns]))
+    if 'Books' in columns and 'Customer ID' in columns:
+        plan = plan.filter(~(pl.col('Books').is_null() & pl.col('Customer ID').is_null()))
+
+    # Step 3: Drop duplicate rows (first one kept, order kept)
+    plan = plan.unique(subset=columns, keep='first', maintain_order=True)
+
+    # Step 4: Correct date columns: unquote, anything that isn't a day <= 31 gets the default
+    for col in date_columns:
+        value = pl.col(col).str.replace_all('"', '', literal=True)
+        day = value.str.extract(VALID_DATE, 1).cast(pl.Int64, strict=False)
+        plan = plan.with_columns(
+            pl.when(day <= 31).then(value).otherwise(pl.lit(default_date))
+            .str.strptime(pl.Datetime('us'), DATE_FORMAT, strict=False).alias(col)
+        )
+
+    if has_loans:
+        checkout, returned = pl.col(CHECKOUT_COL), pl.col(RETURNED_COL)
+
+        # Steps 5-6: Swap reversed dates, then move far-future returns into the checkout year
+        swapped = (checkout > returned).fill_null(False)
+        plan = plan.with_columns(
+            pl.when(swapped).then(returned).otherwise(checkout).alias(CHECKOUT_COL),
+            pl.when(swapped).then(checkout).otherwise(returned).alias(RETURNED_COL),
+        )
+        if max_year_diff is not None:
+            future = ((returned.dt.year() - checkout.dt.year()) > max_year_diff).fill_null(False)
+            day = (pl.when((returned.dt.month() == 2) & (returned.dt.day() == 29) & ~checkout.dt.is_leap_year())
+                   .then(28).otherwise(returned.dt.day()))
+            moved = (pl.datetime(checkout.dt.year(), returned.dt.month(), day, time_unit='us')
+                     + (returned - returned.dt.truncate('1d')))
+            plan = plan.with_columns(pl.when(future).then(moved).otherwise(returned).alias(RETURNED_COL))
+
+        # Step 7: Days borrowed (open loans up to today) and the alert
+        duration = (pl.coalesce(returned, pl.lit(_today(), dtype=pl.Datetime('us'))) - checkout).dt.total_days()
+        plan = plan.with_columns(
+            duration.alias('BorrowDuration'),
+            pl.when(duration > max_allowed_days).then(pl.lit('OVERDUE'))
+            .when(returned.is_null()).then(pl.lit('SCHEDULED'))
+            .otherwise(pl.lit('ON TIME')).alias('OverdueAlert'),
+        )
+
+    # Which columns had missing values in the file decides their pandas dtype
+    missing = raw.select(
+        [pl.col(col).null_count().alias(col) for col in number_columns + text_columns] + [pl.len().alias(ROW)]
+    )
+    result, counts = pl.collect_all([plan, missing])
+    counts = counts.row(0, named=True)
+    raw_missing = {col: ('all' if counts[col] == counts[ROW] else counts[col] > 0) for col in columns if col in counts}
+    return _like_pandas(result.to_pandas(), raw_missing, date_columns, has_loans)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def clean_frame_duckdb(
+    file_path: str,
+    date_columns: list = [],
+    default_date: str = '01/01/2023',
+    max_year_diff: int = 5,
+    max_allowed_days: int = 14
+) -> pd.DataFrame:
+    """clean_data steps 1-7 as one DuckDB SQL query, run on all cores."""
+    if duckdb is None:
+        raise ImportError("The duckdb backend needs duckdb (pip install duckdb).")
+    options = (date_columns, default_date, max_year_diff, max_allowed_days)
+    try:
+        # Column types come from a sample of rows, which costs one pass less than reading the whole file for them
+        return _clean_frame_duckdb(file_path, *options, sample_size=20_480)
+    except (duckdb.ConversionException, duckdb.InvalidInputException):
+        # A column changes type further down (e.g. 3.5 after whole numbers); infer from every row like pandas
+        return _clean_frame_duckdb(file_path, *options, sample_size=-1)
+
+
+def _clean_frame_duckdb(file_path, date_columns, default_date, max_year_diff, max_allowed_days, sample_size):
+    null_list = "[" + ", ".join("'" + value.replace("'", "''") + "'" for value in NA_VALUES) + "]"
+    reader = f"read_csv(?, header = true, nullstr = {null_list}, sample_size = {int(sample_size)}"
+
+    with duckdb.connect() as con:
+        # Step 1: Read the file once into a table numbered in file order;
+        # date columns stay text until step 4, like in pandas
+        sampled = dict((row[0], row[1]) for row in con.execute(f"DESCRIBE SELECT * FROM {reader})", [file_path]).fetchall())
+        columns = list(sampled)
+        date_columns = [col for col in date_columns if col in columns]
+        has_loans = _loan_columns(columns, date_columns)
+        q = {col: _quote(col) for col in columns}
+
+        # DuckDB rounds a later "3.5" into a column sampled as whole numbers, so those
+        # are read as text and must all be whole numbers (else the caller reads again)
+        int_columns = [col for col, dtype in sampled.items() if dtype in INT_TYPES and col not in date_columns]
+        text_read = date_columns + int_columns
+        types = ", types = {" + ", ".join(f"'{col}': 'VARCHAR'" for col in text_read) + "}" if text_read else ""
+        checked = ", ".join(
+            f"CASE WHEN {q[col]} IS NULL OR regexp_full_match({q[col]}, '{WHOLE_NUMBER}') THEN CAST({q[col]} AS BIGINT)"
+            f" ELSE error('column sampled as integer has other values') END AS {q[col]}"
+            for col in int_columns
+        )
+        replace = f" REPLACE ({checked})" if int_columns else ""
+        con.execute(f"CREATE TEMP TABLE raw AS SELECT row_number() OVER () - 1 AS {ROW}, *{replace} FROM {reader}{types})", [file_path])
+        schema = dict((row[0], row[1]) for row in con.execute("DESCRIBE raw").fetchall())
+        text_columns = [col for col, dtype in schema.items() if dtype == 'VARCHAR']
+
+        all_columns = ", ".join(q[col] for col in columns)
+
+        # Step 1.1: Whitespace-only text to null ("NaN" and empty fields are null already)
+        blanked = ", ".join(
+            f"CASE WHEN regexp_full_match({q[col]}, '\\s*') THEN NULL ELSE {q[col]} END AS {q[col]}"
+            if col in text_columns else q[col]
+            for col in columns
+        )
+        # Step 2: Drop rows with no values, and rows missing both title and customer
+        keep = "NOT (" + " AND ".join(f"{q[col]} IS NULL" for col in columns) + ")"
+        if 'Books' in columns and 'Customer ID' in columns:
+            keep += ' AND NOT ("Books" IS NULL AND "Customer ID" IS NULL)'
+
+        steps = [
+            f"blanked AS (SELECT {ROW}, {blanked} FROM raw)",
+            f"kept AS (SELECT * FROM blanked WHERE {keep})",
+            # Step 3: Drop duplicate rows, keeping the first (GROUP BY counts NULLs as equal, like pandas)
+            f"deduped AS (SELECT * FROM kept WHERE {ROW} IN (SELECT min({ROW}) FROM kept GROUP BY {all_columns}))",
+        ]
+
+        # Step 4: Correct date columns: unquote, anything that isn't a day <= 31 gets the default
+        corrected = []
+        for col in date_columns:
+            value = f"replace({q[col]}, '\"', '')"
+            day = f"TRY_CAST(regexp_extract({value}, '{VALID_DATE}', 1) AS BIGINT)"
+            corrected.append(
+                f"CAST(try_strptime(CASE WHEN {day} <= 31 THEN {value} ELSE '{default_date}' END, '{DATE_FORMAT}') AS TIMESTAMP) AS {q[col]}"
+            )
+        steps.append(f"dated AS (SELECT * REPLACE ({', '.join(corrected)}) FROM deduped)" if corrected
+                     else "dated AS (SELECT * FROM deduped)")
+
+        select = "SELECT * FROM dated"
+        if has_loans:
+            co, re = q[CHECKOUT_COL], q[RETURNED_COL]
+            # Steps 5-6: Swap reversed dates, then move far-future returns into the checkout year
+            steps.append(
+                f"swapped AS (SELECT * REPLACE (CASE WHEN {co} > {re} THEN {re} ELSE {co} END AS {co},"
+                f" CASE WHEN {co} > {re} THEN {co} ELSE {re} END AS {re}) FROM dated)"
+            )
+            if max_year_diff is not None:
+                leap = f"(year({co}) % 4 = 0 AND (year({co}) % 100 <> 0 OR year({co}) % 400 = 0))"
+                day = f"CASE WHEN month({re}) = 2 AND day({re}) = 29 AND NOT {leap} THEN 28 ELSE day({re}) END"
+                moved = f"make_timestamp(year({co}), month({re}), {day}, 0, 0, 0) + ({re} - date_trunc('day', {re}))"
+                steps.append(
+                    f"repaired AS (SELECT * REPLACE (CASE WHEN year({re}) - year({co}) > {int(max_year_diff)}"
+                    f" THEN {moved} ELSE {re} END AS {re}) FROM swapped)"
+                )
+            else:
+                steps.append("repaired AS (SELECT * FROM swapped)")
+
+            # Step 7: Days borrowed (open loans up to today) and the alert
+            duration = f"date_diff('day', {co}, coalesce({re}, TIMESTAMP '{_today().isoformat(sep=' ')}'))"
+            select = (
+                f"SELECT *, {duration} AS BorrowDuration,"
+                f" CASE WHEN {duration} > {int(max_allowed_days)} THEN 'OVERDUE'"
+                f" WHEN {re} IS NULL THEN 'SCHEDULED' ELSE 'ON TIME' END AS OverdueAlert FROM repaired"
+            )
+
+        result = con.execute(f"WITH {', '.join(steps)} {select} ORDER BY {ROW}").arrow()
+        # Newer DuckDB hands back a RecordBatchReader, older a Table
+        result = (result.read_all() if hasattr(result, 'read_all') else result).to_pandas()
+
+        # Which columns had missing values in the file decides their pandas dtype
+        counts = con.execute(f"SELECT count(*), {', '.join(f'count({q[col]})' for col in columns)} FROM raw").fetchone()
+    raw_missing = {col: ('all' if present == 0 else present < counts[0]) for col, present in zip(columns, counts[1:])}
+    return _like_pandas(result, raw_missing, date_columns, has_loans)
+
+
+# Function to run clean_data steps 1-7 on a non-pandas backend
+def clean_frame(file_path: str, date_columns: list = [], backend: str = 'polars') -> pd.DataFrame:
+    if backend == 'polars':
+        return clean_frame_polars(file_path, date_columns)
+    if backend == 'duckdb':
+        return clean_frame_duckdb(file_path, date_columns)
+    raise ValueError(f"Unknown backend '{backend}'; expected one of {', '.join(BACKENDS)}.")
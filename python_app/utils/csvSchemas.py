@@ -0,0 +1,225 @@
+"""
+Declared column types for the raw CSV files, taken from their tables in
+scripts/SQLTableCreation. Reading with them skips pandas' type inference: only
+the declared columns are parsed (usecols), each straight into its type (INT as
+nullable Int64, VARCHAR/NVARCHAR as text, DATE as dd/mm/yyyy dates), and on the
+pyarrow engine when pyarrow is installed.
+
+Values that don't fit their type are not silently turned into something else:
+they are collected, one row per bad value, and either raised (SchemaError) or
+summarised in a warning.
+"""
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from utils.projectFunctions import read_csv
+
+try:
+    import pyarrow  # noqa: F401  (read_csv's engine='pyarrow')
+except ImportError:
+    pyarrow = None
+
+SQL_SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'SQLTableCreation')
+
+# CSV header -> SQL column of each raw file's table
+DATASET_COLUMNS = {
+    'Customers': {'Customer ID': 'CustomerID', 'Customer Name': 'CustomerName'},
+    'Books': {
+        'Id': 'Id', 'Books': 'Title', 'Book checkout': 'BookCheckout', 'Book Returned': 'BookReturned',
+        'Days allowed to borrow': 'DaysAllowed', 'Customer ID': 'CustomerID',
+    },
+    'BooksEnriched': {
+        'Title': 'Title', 'Author': 'Author', 'First_Publish_Year': 'First_Publish_Year',
+        'ISBN': 'ISBN', 'OpenLibrary_ID': 'OpenLibrary_ID',
+    },
+}
+
+INT_RANGES = {'TINYINT': (0, 2**8 - 1), 'SMALLINT': (-2**15, 2**15 - 1), 'INT': (-2**31, 2**31 - 1), 'BIGINT': (-2**63, 2**63 - 1)}
+FLOAT_TYPES = {'FLOAT', 'REAL', 'DECIMAL', 'NUMERIC'}
+DATE_TYPES = {'DATE', 'DATETIME', 'DATETIME2', 'SMALLDATETIME'}
+DATE_FORMAT = '%d/%m/%Y'
+# Everything else (VARCHAR, NVARCHAR, CHAR, ...) is read as text
+
+VIOLATION_COLUMNS = ['row', 'column', 'value', 'problem']
+
+
+class SchemaError(ValueError):
+    """Values of a CSV that don't fit its declared column types; `violations` lists them."""
+
+    def __init__(self, message: str, violations: pd.DataFrame):
+        super().__init__(message)
+        self.violations = violations
+
+
+@lru_cache(maxsize=None)
+def sql_column_types(script_path: str = SQL_SCRIPT) -> dict:
+    """{table: {column: (TYPE, length or None)}} for each CREATE TABLE in the script ('MAX' has no length)."""
+    with open(script_path) as f:
+        script = f.read()
+
+    tables = {}
+    for table, body in re.findall(r'CREATE TABLE\s+(?:\w+\.)?(\w+)\s*\((.*?)\);', script, flags=re.S | re.I):
+        columns = {}
+        for line in body.splitlines():
+            parts = line.strip().rstrip(',').split()
+            if len(parts) < 2 or parts[0].upper() in ('PRIMARY', 'FOREIGN', 'UNIQUE', 'CONSTRAINT', 'CHECK'):
+                continue
+            sql_type, length = re.match(r'(\w+)(?:\((\w+)\))?', parts[1]).groups()
+            columns[parts[0]] = (sql_type.upper(), int(length) if length and length.isdigit() else None)
+        tables[table] = columns
+    return tables
+
+
+def _kind(sql_type: str) -> str:
+    if sql_type in INT_RANGES:
+        return 'int'
+    if sql_type in FLOAT_TYPES:
+        return 'float'
+    if sql_type in DATE_TYPES:
+        return 'date'
+    return 'text'
+
+
+# How each kind is read; ints come in as float64 (also takes "3.0") and are checked and converted after
+READ_DTYPES = {'int': 'float64', 'float': 'float64', 'date': 'str', 'text': 'str'}
+
+
+class CsvSchema:
+    """
+    The declared columns of one raw CSV: {CSV column: (SQL type, length)}.
+
+    `read` returns the declared columns only, typed; `conform` checks and converts
+    an already-read frame (e.g. a chunk) and returns it with its violations.
+    """
+
+    def __init__(self, name: str, columns: dict):
+        self.name = name
+        self.columns = columns
+
+    @classmethod
+    def for_dataset(cls, dataset: str, script_path: str = SQL_SCRIPT) -> "CsvSchema":
+        """The schema of a DATASET_COLUMNS entry ('Customers', 'Books' or 'BooksEnriched')."""
+        if dataset not in DATASET_COLUMNS:
+            raise ValueError(f"Unknown dataset '{dataset}'. Choose from {sorted(DATASET_COLUMNS)}.")
+        sql_types = sql_column_types(script_path)[dataset]
+        return cls(dataset, {col: sql_types[sql_col] for col, sql_col in DATASET_COLUMNS[dataset].items()})
+
+    def read_options(self, file_path: str) -> tuple:
+        """(read_csv kwargs, declared columns missing from the file's header)."""
+        header = pd.read_csv(file_path, nrows=0).columns
+        usecols = [col for col in header if col in self.columns]
+        dtype = {col: READ_DTYPES[_kind(self.columns[col][0])] for col in usecols}
+        return {'usecols': usecols, 'dtype': dtype}, [col for col in self.columns if col not in header]
+
+    def read(self, file_path: str, on_violation: str = 'raise', parse_dates: bool = True, **kwargs) -> pd.DataFrame:
+        """
+        Read `file_path` with the declared types. With on_violation='warn', a summary
+        of the values that don't fit is printed instead of raising; bad numbers and
+        dates are then missing, over-long text is kept. With parse_dates=False, DATE
+        columns are checked but left as text.
+        """
+        options, missing = self.read_options(file_path)
+        engine = 'pyarrow' if pyarrow is not None else 'c'
+        try:
+            df = read_csv(file_path, engine=engine, **options, **kwargs)
+        except ValueError:
+            # A number column holds text: read everything as text so conform can say where
+            df = read_csv(file_path, engine=engine, usecols=options['usecols'],
+                          dtype={col: 'str' for col in options['usecols']}, **kwargs)
+
+        df, violations = self.conform(df, parse_dates)
+        report_violations(pd.concat([_missing_columns(missing), violations], ignore_index=True), self.name, on_violation)
+        return df
+
+    def read_chunks(self, file_path: str, chunksize: int, on_violation: str = 'raise', parse_dates: bool = True, **kwargs):
+        """`read` one chunk at a time (C engine; pyarrow can't read in chunks), every chunk with the same dtypes."""
+        options, missing = self.read_options(file_path)
+        report_violations(_missing_columns(missing), self.name, on_violation)
+        # A later chunk may hold text in a number column, so numbers are parsed by conform
+        options['dtype'] = {col: 'str' for col in options['usecols']}
+        # The reader is closed however the generator ends (exhausted, closed early or an error)
+        with read_csv(file_path, chunksize=chunksize, **options, **kwargs) as raw_chunks:
+            for chunk in raw_chunks:
+                chunk, violations = self.conform(chunk, parse_dates)
+                report_violations(violations, self.name, on_violation)
+                yield chunk
+
+    def conform(self, df: pd.DataFrame, parse_dates: bool = True) -> tuple:
+        """(df with its declared columns typed, violations): bad numbers and dates become missing."""
+        df = df.copy(deep=False)
+        violations = []
+
+        def flag(col, bad, problem):
+            bad = np.asarray(bad, dtype=bool)
+            if bad.any():
+                violations.append(pd.DataFrame({
+                    'row': df.index[bad], 'column': col, 'value': df[col].to_numpy(dtype=object)[bad], 'problem': problem,
+                }))
+
+        for col in df.columns.intersection(list(self.columns)):
+            sql_type, length = self.columns[col]
+            kind = _kind(sql_type)
+            if kind in ('int', 'float'):
+                values = df[col]
+                if not pd.api.types.is_numeric_dtype(values):
+                    text = values.str.strip()
+                    values = pd.to_numeric(text, errors='coerce')
+                    # Blank fields are missing values, not bad numbers
+                    flag(col, text.fillna('').ne('') & values.isna(), f"not a number ({sql_type})")
+                numbers = values.to_numpy(dtype='float64', na_value=np.nan)
+                if kind == 'int':
+                    low, high = INT_RANGES[sql_type]
+                    with np.errstate(invalid='ignore'):
+                        bad = ~np.isnan(numbers) & ((np.mod(numbers, 1) != 0) | (numbers < low) | (numbers > high))
+                    flag(col, bad, f"not a whole number in {sql_type} range")
+                    missing = bad | np.isnan(numbers)
+                    df[col] = pd.arrays.IntegerArray(np.where(missing, 0, numbers).astype('int64'), missing)
+                else:
+                    df[col] = numbers
+            elif kind == 'date':
+                # Loan dates repeat heavily, so parse each distinct value once (as correct_dates does)
+                codes, uniques = pd.factorize(df[col])
+                text = pd.Series(uniques, dtype=object).astype(str).str.strip().str.strip('"')
+                parsed = pd.to_datetime(text, format=DATE_FORMAT, errors='coerce')
+                # codes of missing values are -1, which picks the appended False / NaT
+                bad = parsed.isna() & text.ne('')
+                flag(col, np.append(bad.to_numpy(), False)[codes], "not a dd/mm/yyyy date")
+                if parse_dates:
+                    df[col] = pd.Series(np.append(parsed.to_numpy(), np.datetime64('NaT'))[codes], index=df.index)
+            elif length is not None:
+                flag(col, df[col].str.len().gt(length).to_numpy(dtype=bool, na_value=False), f"longer than {sql_type}({length})")
+
+        return df, _violation_frame(violations)
+
+
+def _violation_frame(frames: list) -> pd.DataFrame:
+    if not frames:
+        return pd.DataFrame({col: pd.Series(dtype='Int64' if col == 'row' else object) for col in VIOLATION_COLUMNS})
+    return pd.concat(frames, ignore_index=True).astype({'row': 'Int64'})
+
+
+def _missing_columns(columns: list) -> pd.DataFrame:
+    return _violation_frame([pd.DataFrame({'row': pd.NA, 'column': columns, 'value': None, 'problem': 'missing column'})] if columns else [])
+
+
+def report_violations(violations: pd.DataFrame, name: str, on_violation: str = 'raise') -> None:
+    """Raise SchemaError (on_violation='raise') or print a summary ('warn') when there are any."""
+    if on_violation not in ('raise', 'warn'):
+        raise ValueError("on_violation must be 'raise' or 'warn'.")
+    if violations.empty:
+        return
+    counts = violations.groupby(['column', 'problem'], sort=False).size()
+    summary = "; ".join(f"{col}: {count} {problem}" for (col, problem), count in counts.items())
+    message = f"{name}: {len(violations)} values don't fit the declared schema ({summary})"
+    if on_violation == 'raise':
+        raise SchemaError(message, violations)
+    print(f"⚠️ {message}.")
+
+
+def read_csv_with_schema(file_path: str, dataset: str, on_violation: str = 'raise', parse_dates: bool = True, **kwargs) -> pd.DataFrame:
+    """Read a raw file with its dataset's declared column types (see CsvSchema.read)."""
+    return CsvSchema.for_dataset(dataset).read(file_path, on_violation, parse_dates, **kwargs)
@@ -0,0 +1,178 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.DE_metrics import compute_all_metrics, _mode_from_counts
+from utils.projectFunctions import load_output
+
+# Cleaned outputs by name without extension; each may be .csv, .parquet or .arrow
+CUSTOMERS_OUTPUT = "customerCleanedPy"
+BOOKS_OUTPUT = "bookCleanedPy"
+API_BOOKS_OUTPUT = "bookEnrichedAPICleanedPy"
+OUTPUT_EXTENSIONS = (".parquet", ".arrow", ".feather", ".csv")
+AGGREGATES_FILE = "dashboardAggregates.json"
+
+
+def _to_json_value(value):
+    # numpy scalars -> plain Python, NaN -> None
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def _counts(series: pd.Series) -> dict:
+    # value_counts on a categorical column also lists categories that no longer occur
+    return {str(key): int(count) for key, count in series.items() if count}
+
+
+def find_output(output_dir: str, name: str) -> str:
+    """Path of the most recently written format of a cleaned output."""
+    candidates = [os.path.join(output_dir, name + ext) for ext in OUTPUT_EXTENSIONS]
+    existing = [path for path in candidates if os.path.exists(path)]
+    if not existing:
+        raise FileNotFoundError(f"No cleaned output '{name}' in {output_dir}")
+    return max(existing, key=os.path.getmtime)
+
+
+def source_files(output_dir: str) -> list:
+    return [find_output(output_dir, name) for name in (CUSTOMERS_OUTPUT, BOOKS_OUTPUT, API_BOOKS_OUTPUT)]
+
+
+def source_signature(output_dir: str) -> dict:
+    """Size and modification time of each cleaned output; aggregates are only valid for these."""
+    signature = {}
+    for path in source_files(output_dir):
+        stat = os.stat(path)
+        signature[os.path.basename(path)] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
+
+def compute_aggregates(customers: pd.DataFrame, books: pd.DataFrame, api_books: pd.DataFrame) -> dict:
+    """Everything the dashboard shows: every DE_metrics value plus the data behind each chart."""
+    metrics = compute_all_metrics(books, customers, api_books)
+
+    charts = {}
+    if "Books" in books.columns:
+        charts["top_books"] = _counts(books["Books"].value_counts().head(5))
+    if "OverdueAlert" in books.columns:
+        charts["overdue_alerts"] = _counts(books["OverdueAlert"].value_counts())
+    if "BorrowDuration" in books.columns:
+        # Number of loans per borrow duration (in days)
+        durations = books["BorrowDuration"].dropna().astype(int).value_counts().sort_index()
+        charts["borrow_durations"] = _counts(durations)
+
+    return {
+        "metrics": {name: _to_json_value(value) for name, value in metrics.items()},
+        "charts": charts,
+    }
+
+
+class StreamingAggregates:
+    """
+    compute_aggregates for a book table that arrives in chunks (e.g. from stream_pipeline):
+    only the per-value counts and running totals are kept between chunks, and
+    `aggregates(customers)` gives the same result as compute_aggregates on the whole table.
+    """
+
+    def __init__(self):
+        self.value_counts = {}  # column -> counts in first-seen order, as value_counts(sort=False)
+        self.totals = {"duration_sum": 0.0, "duration_count": 0, "num_overdue": 0, "num_currently_borrowed": 0}
+        self.api_rows = 0
+        self.authors = set()
+
+    def _add_counts(self, column: str, values: pd.Series) -> None:
+        counts = values.value_counts(sort=False)
+        if column in self.value_counts:
+            # groupby(sort=False) keeps the earlier chunks' values first
+            counts = pd.concat([self.value_counts[column], counts]).groupby(level=0, sort=False).sum()
+        self.value_counts[column] = counts
+
+    def add_books(self, chunk: pd.DataFrame) -> None:
+        if chunk.empty:
+            return  # an empty chunk's columns may not have the table's dtypes
+        for column in ("Books", "Customer ID", "OverdueAlert"):
+            if column in chunk.columns:
+                self._add_counts(column, chunk[column])
+        if "BorrowDuration" in chunk.columns:
+            durations = chunk["BorrowDuration"].dropna()
+            self._add_counts("BorrowDuration", durations.astype(int))
+            self.totals["duration_sum"] += durations.sum()
+            self.totals["duration_count"] += len(durations)
+        if "OverdueAlert" in chunk.columns:
+            self.totals["num_overdue"] += chunk["OverdueAlert"].eq("OVERDUE").sum()
+        if "Book Returned" in chunk.columns:
+            self.totals["num_currently_borrowed"] += chunk["Book Returned"].isna().sum()
+
+    def add_api_books(self, chunk: pd.DataFrame) -> None:
+        self.api_rows += len(chunk)
+        if "Author" in chunk.columns:
+            self.authors.update(chunk["Author"].dropna())
+
+    def aggregates(self, customers: pd.DataFrame) -> dict:
+        counts = {column: values[values > 0] for column, values in self.value_counts.items()}
+        metrics = {
+            "num_customers": len(pd.unique(customers["Customer ID"].dropna())) if "Customer ID" in customers.columns else 0,
+            "num_books": len(counts.get("Books", ())),
+            "num_api_requests": self.api_rows,
+            "num_unique_authors": len(self.authors),
+            "most_borrowed_book": "",
+            "most_active_customer": "",
+            "average_borrow_duration": 0.0,
+            "num_overdue": self.totals["num_overdue"],
+            "num_currently_borrowed": self.totals["num_currently_borrowed"],
+        }
+        if "BorrowDuration" in counts:
+            count = self.totals["duration_count"]
+            metrics["average_borrow_duration"] = self.totals["duration_sum"] / count if count else np.nan
+        if len(counts.get("Books", ())):
+            metrics["most_borrowed_book"] = _mode_from_counts(counts["Books"].to_numpy(), counts["Books"].index)
+        if len(counts.get("Customer ID", ())):
+            metrics["most_active_customer"] = str(_mode_from_counts(counts["Customer ID"].to_numpy(), counts["Customer ID"].index))
+
+        # value_counts() is value_counts(sort=False) followed by this stable sort
+        charts = {}
+        if "Books" in counts:
+            charts["top_books"] = _counts(counts["Books"].sort_values(ascending=False, kind="stable").head(5))
+        if "OverdueAlert" in counts:
+            charts["overdue_alerts"] = _counts(counts["OverdueAlert"].sort_values(ascending=False, kind="stable"))
+        if "BorrowDuration" in counts:
+            charts["borrow_durations"] = _counts(counts["BorrowDuration"].sort_index())
+
+        return {
+            "metrics": {name: _to_json_value(value) for name, value in metrics.items()},
+            "charts": charts,
+        }
+
+
+def save_aggregates(output_dir: str, aggregates: dict) -> dict:
+    """Write aggregates next to the cleaned outputs they were built from, signed with those outputs."""
+    aggregates["sources"] = source_signature(output_dir)
+    with open(os.path.join(output_dir, AGGREGATES_FILE), "w") as f:
+        json.dump(aggregates, f, indent=2)
+    return aggregates
+
+
+def write_aggregates(output_dir: str, customers: pd.DataFrame, books: pd.DataFrame, api_books: pd.DataFrame) -> dict:
+    """Precompute the dashboard aggregates next to the cleaned outputs they were built from."""
+    return save_aggregates(output_dir, compute_aggregates(customers, books, api_books))
+
+
+def load_aggregates(output_dir: str) -> dict:
+    """
+    Return the dashboard aggregates, from the precomputed file when it matches the
+    current cleaned outputs, otherwise recomputed from the outputs.
+    """
+    aggregates_path = os.path.join(output_dir, AGGREGATES_FILE)
+    if os.path.exists(aggregates_path):
+        with open(aggregates_path) as f:
+            aggregates = json.load(f)
+        if aggregates.get("sources") == source_signature(output_dir):
+            return aggregates
+
+    # Missing or stale: the outputs changed after the aggregates were written
+    customers, books, api_books = (load_output(path) for path in source_files(output_dir))
+    return compute_aggregates(customers, books, api_books)
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from utils.projectFunctions import (
+    read_csv, save_output, load_output, drop_missing_rows, fix_loan_dates, hash_rows, add_borrow_duration_and_alert
+)
+
+LOAN_DATE_COLUMNS = ['Book checkout', 'Book Returned']
+
+
+# Function to fingerprint a file by its size and content hash
+def file_fingerprint(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return f"{os.path.getsize(file_path)}:{digest.hexdigest()}"
+
+
+class RunManifest:
+    """
+    What the last incremental run saw, stored as JSON next to the outputs:
+    a fingerprint per input file, the date its output was last refreshed, and
+    which titles have already been sent to the enrichment API.
+    Per-row hashes live in `<output_file>.rowhashes.npy`, one per output row.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = {"files": {}, "enriched_titles": []}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.data = json.load(f)
+
+    def file_entry(self, file_path: str) -> dict:
+        return self.data["files"].get(os.path.abspath(file_path), {})
+
+    def set_file_entry(self, file_path: str, fingerprint: str, refreshed_on: str) -> None:
+        self.data["files"][os.path.abspath(file_path)] = {"fingerprint": fingerprint, "refreshed_on": refreshed_on}
+
+    def unseen_titles(self, titles) -> list:
+        seen = set(self.data["enriched_titles"])
+        return [title for title in pd.unique(pd.Series(titles).dropna()) if title not in seen]
+
+    def add_enriched_titles(self, titles) -> None:
+        self.data["enriched_titles"].extend(titles)
+
+    def save(self) -> None:
+        with open(self.path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+
+
+def _row_hashes_file(output_file: str) -> str:
+    return output_file + ".rowhashes.npy"
+
+
+def _has_loan_dates(df: pd.DataFrame) -> bool:
+    return all(col in df.columns for col in LOAN_DATE_COLUMNS)
+
+
+# Function to clean only the rows that changed since the last run and merge them into output_file
+def clean_data_incremental(
+    file_path: str,
+    output_file: str,
+    manifest: RunManifest,
+    date_columns: list = []
+) -> tuple:
+    """
+    Incremental version of clean_data. Returns (cleaned, new_rows): the full cleaned
+    table and just the rows that were cleaned on this run.
+
+    Rows are matched by the hash of the row after blank values are replaced (what
+    drop_duplicates compares), so new rows are cleaned and appended, rows that
+    disappeared from the input are dropped from the output, and unchanged rows are
+    reused as they are. Open loans are re-measured so BorrowDuration/OverdueAlert
+    stay current. An input whose fingerprint hasn't changed isn't read at all.
+    """
+    fingerprint = file_fingerprint(file_path)
+    today = date.today().isoformat()
+    entry = manifest.file_entry(file_path)
+    have_outputs = os.path.exists(output_file) and os.path.exists(_row_hashes_file(output_file))
+
+    if have_outputs:
+        existing = load_output(output_file)
+        existing_hashes = np.load(_row_hashes_file(output_file))
+        if _has_loan_dates(existing):
+            for col in LOAN_DATE_COLUMNS:
+                existing[col] = pd.to_datetime(existing[col])
+    else:
+        existing, existing_hashes = None, np.empty(0, dtype=np.uint64)
+
+    # Unchanged input: nothing to clean, only refresh open-loan durations once a day
+    if have_outputs and entry.get("fingerprint") == fingerprint:
+        if _has_loan_dates(existing) and entry.get("refreshed_on") != today:
+            existing = add_borrow_duration_and_alert(existing)
+            save_output(existing, output_file)
+            manifest.set_file_entry(file_path, fingerprint, today)
+        return existing, existing.iloc[0:0]
+
+    # Steps 1-2: Read the raw data, replace blank values and drop empty rows
+    df_noNA = drop_missing_rows(read_csv(file_path))
+    current_hashes = hash_rows(df_noNA)
+
+    # Keep output rows whose source row is still in the input
+    if existing is not None:
+        still_present = np.isin(existing_hashes, current_hashes)
+        existing = existing[still_present]
+        existing_hashes = existing_hashes[still_present]
+
+    # Step 3: New rows are first occurrences not already in the output
+    is_new = ~pd.Series(current_hashes).duplicated().to_numpy() & ~np.isin(current_hashes, existing_hashes)
+    new_rows = df_noNA[is_new]
+
+    # Steps 4-7: Correct dates and add borrow duration/alert for the new rows only
+    new_rows = fix_loan_dates(new_rows, date_columns)
+
+    if existing is None:
+        cleaned = new_rows
+    else:
+        cleaned = pd.concat([existing, new_rows], ignore_index=True)
+        # Re-measure every loan against today, not just the new ones
+        if _has_loan_dates(cleaned):
+            cleaned = add_borrow_duration_and_alert(cleaned)
+
+    # Step 8: Save the merged output with the row hashes it was built from
+    save_output(cleaned, output_file)
+    np.save(_row_hashes_file(output_file), np.concatenate([existing_hashes, current_hashes[is_new]]))
+    manifest.set_file_entry(file_path, fingerprint, today)
+
+    return cleaned, new_rows
@@ -1,7 +1,123 @@
+import os
+import re
+import time
+from functools import lru_cache
+
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
-import pyodbc
+
+try:
+    import pyodbc  # noqa: F401  (SQL Server driver, not needed for local SQLite runs)
+except ImportError:
+    pyodbc = None
+
+SQL_SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'SQLTableCreation')
+
+
+def build_connection_string(
+    database: str,
+    server: str = 'localhost',
+    driver: str = 'ODBC Driver 17 for SQL Server',
+    trusted_connection: bool = True,
+    username: str = None,
+    password: str = None
+) -> str:
+    """Build the SQLAlchemy URL for SQL Server (Windows or SQL authentication)."""
+    if trusted_connection:
+        return f"mssql+pyodbc://@{server}/{database}?trusted_connection=yes&driver={driver}"
+    if not username or not password:
+        raise ValueError("Username and password must be provided for SQL authentication.")
+    return f"mssql+pyodbc://{username}:{password}@{server}/{database}?driver={driver}"
+
+
+@lru_cache(maxsize=None)
+def get_engine(conn_str: str) -> Engine:
+    """
+    Return one pooled engine per connection string, shared by every write_df_to_sql call.
+    SQL Server connections send inserts in batches with pyodbc's fast_executemany.
+    """
+    if conn_str.startswith("mssql+pyodbc"):
+        return create_engine(conn_str, pool_pre_ping=True, fast_executemany=True)
+    return create_engine(conn_str, pool_pre_ping=True)
+
+
+def table_keys_from_script(script_path: str = SQL_SCRIPT) -> dict:
+    """
+    Read the PRIMARY KEY / UNIQUE columns of each table in scripts/SQLTableCreation.
+    IDENTITY columns are skipped because the data never carries them.
+    """
+    with open(script_path) as f:
+        script = f.read()
+
+    keys = {}
+    for table, body in re.findall(r'CREATE TABLE\s+(?:\w+\.)?(\w+)\s*\((.*?)\);', script, flags=re.S | re.I):
+        columns = []
+        for line in body.splitlines():
+            parts = line.strip().rstrip(',').split()
+            if not parts or parts[0].upper() in ('FOREIGN', 'CONSTRAINT'):
+                continue
+            definition = line.upper()
+            if ('PRIMARY KEY' in definition or 'UNIQUE' in definition) and 'IDENTITY' not in definition:
+                columns.append(parts[0])
+        keys[table] = columns
+    return keys
+
+
+def _simplify(name: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+def match_key_columns(df: pd.DataFrame, sql_keys: list) -> list:
+    """Map SQL key names to DataFrame columns, ignoring case, spaces and underscores ('CustomerID' -> 'Customer ID')."""
+    by_simple_name = {_simplify(col): col for col in df.columns}
+    return [by_simple_name[_simplify(key)] for key in sql_keys if _simplify(key) in by_simple_name]
+
+
+def _merge_statement(engine: Engine, table_name: str, staging_table: str, columns: list, keys: list) -> str:
+    quote = engine.dialect.identifier_preparer.quote
+    target, staging = quote(table_name), quote(staging_table)
+    column_list = ", ".join(quote(col) for col in columns)
+    updates = [col for col in columns if col not in keys]
+
+    if engine.dialect.name == "mssql":
+        on = " AND ".join(f"target.{quote(k)} = source.{quote(k)}" for k in keys)
+        statement = f"MERGE INTO {target} AS target USING {staging} AS source ON {on}"
+        if updates:
+            statement += " WHEN MATCHED THEN UPDATE SET " + ", ".join(f"target.{quote(c)} = source.{quote(c)}" for c in updates)
+        values = ", ".join(f"source.{quote(col)}" for col in columns)
+        return statement + f" WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({values});"
+
+    # SQLite / PostgreSQL upsert ("WHERE true" keeps SQLite's parser happy with ON CONFLICT after a SELECT)
+    conflict = ", ".join(quote(k) for k in keys)
+    action = "DO UPDATE SET " + ", ".join(f"{quote(c)} = excluded.{quote(c)}" for c in updates) if updates else "DO NOTHING"
+    return (f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {staging} WHERE true "
+            f"ON CONFLICT ({conflict}) {action}")
+
+
+def _upsert(df: pd.DataFrame, table_name: str, engine: Engine, keys: list, chunksize: int, method) -> int:
+    # Rows without a key can't be matched, and the same key twice would make MERGE fail
+    keyed = df.dropna(subset=keys).drop_duplicates(subset=keys, keep='last')
+    if len(keyed) < len(df):
+        print(f"⚠️ {len(df) - len(keyed)} rows without a unique key skipped for '{table_name}'.")
+
+    staging_table = f"{table_name}_staging"
+    with engine.begin() as conn:
+        if not inspect(conn).has_table(table_name):
+            keyed.head(0).to_sql(table_name, con=conn, index=False)
+            if engine.dialect.name != "mssql":
+                quote = engine.dialect.identifier_preparer.quote
+                conn.execute(text(
+                    f"CREATE UNIQUE INDEX {quote(table_name + '_keys')} ON {quote(table_name)} "
+                    f"({', '.join(quote(k) for k in keys)})"
+                ))
+
+        keyed.to_sql(staging_table, con=conn, if_exists='replace', index=False, chunksize=chunksize, method=method)
+        conn.execute(text(_merge_statement(engine, table_name, staging_table, list(keyed.columns), keys)))
+        conn.execute(text(f"DROP TABLE {engine.dialect.identifier_preparer.quote(staging_table)}"))
+    return len(keyed)
+
 
 def write_df_to_sql(
     df: pd.DataFrame,
@@ -12,7 +128,12 @@ def write_df_to_sql(
     if_exists: str = 'replace',
     trusted_connection: bool = True,
     username: str = None,
-    password: str = None
+    password: str = None,
+    chunksize: int = 10_000,
+    method: str = None,
+    upsert: bool = False,
+    key_columns: list = None,
+    connection_string: str = None
 ) -> None:
     """
     Write a pandas DataFrame to a SQL Server table using SQLAlchemy with error handling.
@@ -27,23 +148,34 @@ def write_df_to_sql(
         trusted_connection (bool): Use Windows Authentication if True.
         username (str): SQL Server username (if using SQL auth).
         password (str): SQL Server password (if using SQL auth).
+        chunksize (int): Rows sent per batch (default 10,000).
+        method (str): pandas insert method: None (executemany, fastest with fast_executemany) or 'multi'.
+        upsert (bool): Load into a staging table and MERGE into the target on its keys instead of if_exists.
+        key_columns (list): Key columns for upsert; defaults to the table's keys in scripts/SQLTableCreation.
+        connection_string (str): SQLAlchemy URL to use instead of SQL Server, e.g. 'sqlite:///library.db'.
     """
 
     try:
-        # Encode the connection string
-        if trusted_connection:
-            conn_str = f"mssql+pyodbc://@{server}/{database}?trusted_connection=yes&driver={driver}"
-        else:
-            if not username or not password:
-                raise ValueError("Username and password must be provided for SQL authentication.")
-            conn_str = f"mssql+pyodbc://{username}:{password}@{server}/{database}?driver={driver}"
+        # The engine (and its connection pool) is created once per connection string
+        conn_str = connection_string or build_connection_string(
+            database, server, driver, trusted_connection, username, password
+        )
+        engine = get_engine(conn_str)
 
-        # SQLAlchemy engine
-        engine = create_engine(conn_str)
+        if upsert and key_columns is None:
+            key_columns = match_key_columns(df, table_keys_from_script().get(table_name, []))
+
+        start = time.perf_counter()
+        if upsert and key_columns:
+            rows = _upsert(df, table_name, engine, key_columns, chunksize, method)
+        else:
+            # Tables without keys (e.g. Metrics) are written as usual
+            df.to_sql(table_name, con=engine, if_exists=if_exists, index=False, chunksize=chunksize, method=method)
+            rows = len(df)
+        elapsed = time.perf_counter() - start
 
-        # Write to SQL
-        df.to_sql(table_name, con=engine, if_exists=if_exists, index=False)
-        print(f"✅ Data written to table '{table_name}' successfully.")
+        rate = rows / elapsed if elapsed else float('inf')
+        print(f"✅ Data written to table '{table_name}' successfully ({rows} rows, {rate:,.0f} rows/sec).")
 
     except SQLAlchemyError as e:
         print(f"❌ SQLAlchemy error while writing to '{table_name}': {e}")
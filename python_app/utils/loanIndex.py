@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from utils.openLibraryCache import normalize_title
+from utils.projectFunctions import load_output
+
+
+def _positions_by_key(keys: pd.Series) -> dict:
+    """Hash index: each distinct non-missing key -> row positions, in table order."""
+    codes, uniques = pd.factorize(keys)
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    # Missing keys (code -1) sort first; skip them
+    groups = np.split(order[(codes < 0).sum():], np.cumsum(counts)[:-1])
+    return dict(zip(pd.Index(uniques).tolist(), groups))
+
+
+class LoanIndex:
+    """
+    In-memory indexes over a cleaned book table (the output of clean_data):
+
+    - hash index on Customer ID: loans_for_customer, on_loan
+    - hash index on the normalized title (case and whitespace folded): loans_for_title, customers_for_title
+    - sorted index on Book checkout: checked_out_between
+
+    Building the index scans the table once; each query after that only touches
+    the matching rows. Queries return rows of the table as DataFrames.
+    """
+
+    def __init__(
+        self,
+        books_df: pd.DataFrame,
+        customer_col: str = 'Customer ID',
+        title_col: str = 'Books',
+        checkout_col: str = 'Book checkout',
+        returned_col: str = 'Book Returned'
+    ):
+        self.df = books_df.reset_index(drop=True)
+        self.customer_col = customer_col
+
+        self._by_customer = _positions_by_key(self.df[customer_col])
+
+        # Normalize each distinct title once rather than every row
+        codes, uniques = pd.factorize(self.df[title_col])
+        normalized = pd.Index(uniques).map(normalize_title).to_numpy(dtype=object)
+        self._by_title = _positions_by_key(pd.Series(np.where(codes >= 0, normalized[codes], None)))
+
+        checkout = pd.to_datetime(self.df[checkout_col], errors='coerce').to_numpy()
+        dated = np.flatnonzero(~np.isnat(checkout))
+        self._checkout_order = dated[np.argsort(checkout[dated], kind='stable')]
+        self._checkout_sorted = checkout[self._checkout_order]
+
+        self._is_open = self.df[returned_col].isna().to_numpy() if returned_col in self.df.columns else None
+
+    @classmethod
+    def from_output(cls, file_path: str, **columns) -> "LoanIndex":
+        """Build the index from a cleaned output file (.csv, .parquet or .arrow)."""
+        books = load_output(file_path)
+        checkout_col = columns.get('checkout_col', 'Book checkout')
+        returned_col = columns.get('returned_col', 'Book Returned')
+        for col in (checkout_col, returned_col):
+            if col in books.columns:
+                books[col] = pd.to_datetime(books[col], errors='coerce')
+        return cls(books, **columns)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def _rows(self, positions: np.ndarray, open_only: bool = False) -> pd.DataFrame:
+        if open_only and self._is_open is not None:
+            positions = positions[self._is_open[positions]]
+        return self.df.iloc[positions]
+
+    def loans_for_customer(self, customer_id, open_only: bool = False) -> pd.DataFrame:
+        """Every loan of a customer (only the ones not returned yet with open_only=True)."""
+        return self._rows(self._by_customer.get(customer_id, np.empty(0, dtype=np.intp)), open_only)
+
+    def on_loan(self, customer_id) -> pd.DataFrame:
+        """What a customer currently has on loan."""
+        return self.loans_for_customer(customer_id, open_only=True)
+
+    def loans_for_title(self, title: str, open_only: bool = False) -> pd.DataFrame:
+        """Every loan of a title; 'the hobbit ' finds 'The Hobbit'."""
+        return self._rows(self._by_title.get(normalize_title(title), np.empty(0, dtype=np.intp)), open_only)
+
+    def customers_for_title(self, title: str) -> list:
+        """Who borrowed a title, in order of first loan."""
+        return self.loans_for_title(title)[self.customer_col].dropna().unique().tolist()
+
+    def checked_out_between(self, start, end) -> pd.DataFrame:
+        """Loans checked out from `start` to `end` (both inclusive), in checkout order."""
+        start = np.datetime64(pd.Timestamp(start))
+        end = np.datetime64(pd.Timestamp(end))
+        first = np.searchsorted(self._checkout_sorted, start, side='left')
+        last = np.searchsorted(self._checkout_sorted, end, side='right')
+        return self.df.iloc[self._checkout_order[first:last]]
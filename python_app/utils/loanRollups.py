@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from utils.projectFunctions import save_output, load_output
+
+# Additive per-key sums; everything the rollup shows is derived from these
+SUM_COLUMNS = ['loan_count', 'borrow_duration_sum', 'borrow_duration_count', 'overdue_count', 'currently_borrowed']
+
+
+def _join_key(keys: pd.Series) -> pd.Series:
+    """Whole-number IDs as Int64, so 3.0 from a loan table with gaps meets 3 from the customer table."""
+    if pd.api.types.is_integer_dtype(keys) or (pd.api.types.is_float_dtype(keys) and np.all(np.mod(keys.dropna(), 1) == 0)):
+        return keys.astype('Int64')
+    return keys
+
+
+def loan_sums(books_df: pd.DataFrame, key_col: str) -> pd.DataFrame:
+    """SUM_COLUMNS for each distinct key in one hashing pass (loans without a key are left out)."""
+    codes, uniques = pd.factorize(_join_key(books_df[key_col]))
+    keyed = codes >= 0
+    codes = codes[keyed]
+    n_keys = len(uniques)
+
+    def count(mask) -> np.ndarray:
+        return np.bincount(codes[np.asarray(mask)[keyed]], minlength=n_keys)
+
+    sums = {'loan_count': np.bincount(codes, minlength=n_keys)}
+    if 'BorrowDuration' in books_df.columns:
+        duration = books_df['BorrowDuration'].to_numpy(dtype='float64', na_value=np.nan)[keyed]
+        measured = ~np.isnan(duration)
+        sums['borrow_duration_sum'] = np.bincount(codes[measured], weights=duration[measured], minlength=n_keys)
+        sums['borrow_duration_count'] = np.bincount(codes[measured], minlength=n_keys)
+    if 'OverdueAlert' in books_df.columns:
+        sums['overdue_count'] = count(books_df['OverdueAlert'].eq('OVERDUE'))
+    if 'Book Returned' in books_df.columns:
+        sums['currently_borrowed'] = count(books_df['Book Returned'].isna())
+
+    index = pd.Index(uniques, name=key_col)
+    return pd.DataFrame(sums, index=index).reindex(columns=SUM_COLUMNS, fill_value=0)
+
+
+class LoanRollup:
+    """
+    Materialized per-key rollup of a cleaned book table (the output of clean_data),
+    e.g. per 'Customer ID' or per title ('Books'):
+
+    - loan_count, overdue_count, currently_borrowed
+    - average_borrow_duration (from the stored sum and count of BorrowDuration)
+
+    Only additive sums are stored, so `update(added, removed)` folds in changed loans
+    without touching the rest: pass new loans as `added`, and for loans whose
+    BorrowDuration/OverdueAlert/return changed, the old rows as `removed` and the
+    new ones as `added`.
+    """
+
+    def __init__(self, key_col: str, sums: pd.DataFrame = None):
+        self.key_col = key_col
+        if sums is None:
+            sums = pd.DataFrame(columns=SUM_COLUMNS, index=pd.Index([], name=key_col), dtype='int64')
+        self.sums = sums
+
+    @classmethod
+    def from_loans(cls, books_df: pd.DataFrame, key_col: str) -> "LoanRollup":
+        return cls(key_col, loan_sums(books_df, key_col))
+
+    def __len__(self) -> int:
+        return len(self.sums)
+
+    def update(self, added: pd.DataFrame = None, removed: pd.DataFrame = None) -> "LoanRollup":
+        sums = self.sums
+        if added is not None and len(added):
+            sums = sums.add(loan_sums(added, self.key_col), fill_value=0)
+        if removed is not None and len(removed):
+            sums = sums.sub(loan_sums(removed, self.key_col), fill_value=0)
+        # add/sub align on the key index and turn counts into floats; keys with no loans left go
+        counts = [col for col in SUM_COLUMNS if col != 'borrow_duration_sum']
+        sums = sums.astype({col: 'int64' for col in counts})
+        self.sums = sums[sums['loan_count'] > 0]
+        return self
+
+    def table(self, lookup: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        The rollup as a table, one row per key in key order. With `lookup` (e.g. the
+        customer table), its rows are joined on the key index, keys with no loans included.
+        """
+        sums = self.sums.sort_index()
+        table = pd.DataFrame({
+            'loan_count': sums['loan_count'],
+            'average_borrow_duration': sums['borrow_duration_sum'] / sums['borrow_duration_count'].where(sums['borrow_duration_count'] > 0),
+            'overdue_count': sums['overdue_count'],
+            'currently_borrowed': sums['currently_borrowed'],
+        }, index=sums.index)
+
+        if lookup is not None:
+            lookup = lookup.dropna(subset=[self.key_col])
+            lookup = lookup.set_index(_join_key(lookup[self.key_col])).drop(columns=self.key_col)
+            lookup = lookup[~lookup.index.duplicated()]
+            lookup.index.name = self.key_col
+            # Each side is one row per key, so this is an index join, not a merge of loan rows
+            table = lookup.join(table, how='outer')
+            counts = ['loan_count', 'overdue_count', 'currently_borrowed']
+            table[counts] = table[counts].fillna(0).astype('int64')
+        return table.reset_index()
+
+    def save(self, output_file: str) -> None:
+        """Store the sums (not the derived table) so a later run can keep updating them."""
+        save_output(self.sums.reset_index(), output_file)
+
+    @classmethod
+    def load(cls, output_file: str, key_col: str) -> "LoanRollup":
+        sums = load_output(output_file)
+        sums[key_col] = _join_key(sums[key_col])
+        return cls(key_col, sums.set_index(key_col))
+
+
+def customer_rollup(books_df: pd.DataFrame, customers_df: pd.DataFrame = None) -> pd.DataFrame:
+    """Per-customer loans, average borrow duration, overdue and currently borrowed counts."""
+    return LoanRollup.from_loans(books_df, 'Customer ID').table(customers_df)
+
+
+def title_rollup(books_df: pd.DataFrame) -> pd.DataFrame:
+    """Per-title loans, average borrow duration, overdue and currently borrowed counts."""
+    return LoanRollup.from_loans(books_df, 'Books').table()
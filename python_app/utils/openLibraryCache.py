@@ -0,0 +1,121 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+def normalize_title(title: str) -> str:
+    """Cache key for a title: surrounding/repeated whitespace collapsed and case folded."""
+    return " ".join(str(title).split()).casefold()
+
+
+class OpenLibraryCache:
+    """
+    Persistent SQLite cache of Open Library lookups, keyed by normalized title.
+
+    - Entries older than `ttl_seconds` are treated as missing and removed.
+    - At most `max_entries` are kept; the least recently used are evicted first.
+    - Titles with no match are cached too (stored as NULL), so they aren't re-queried.
+    - `hits`, `misses` and `evictions` count what happened since the cache was opened.
+
+    Hits only note their last use in memory; those timestamps are written in one
+    commit when the cache closes (or before an eviction, which needs them).
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 30 * 24 * 3600, max_entries: int = 100_000, clock=time.time):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # enrich_books looks titles up from several threads, so share one connection behind a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lookups ("
+            " title_key TEXT PRIMARY KEY,"
+            " record TEXT,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS lookups_last_used ON lookups (last_used)")
+        self._conn.commit()
+        # Row count kept up to date by put/get, so inserts don't have to count the table
+        self._count = self._conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+        self._last_used = {}
+
+    def get(self, title: str) -> tuple:
+        """Return (found, record). A cached "no match" comes back as (True, None)."""
+        key = normalize_title(title)
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record, created_at FROM lookups WHERE title_key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM lookups WHERE title_key = ?", (key,))
+                    self._conn.commit()
+                    self._count -= 1
+                    self._last_used.pop(key, None)
+                self.misses += 1
+                return False, None
+
+            self._last_used[key] = now
+            self.hits += 1
+            return True, json.loads(row[0]) if row[0] is not None else None
+
+    def put(self, title: str, record) -> None:
+        """Store a lookup result; pass None to remember that the title had no match."""
+        key = normalize_title(title)
+        now = self.clock()
+        value = json.dumps(record) if record is not None else None
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM lookups WHERE title_key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookups (title_key, record, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._last_used.pop(key, None)
+            if exists is None:
+                self._count += 1
+            excess = self._count - self.max_entries
+            if excess > 0:
+                # The least recently used are picked by last_used, so write the pending hits first
+                self._write_last_used()
+                self._conn.execute(
+                    "DELETE FROM lookups WHERE title_key IN"
+                    " (SELECT title_key FROM lookups ORDER BY last_used LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions += excess
+                self._count -= excess
+            self._conn.commit()
+
+    def _write_last_used(self) -> None:
+        if self._last_used:
+            self._conn.executemany("UPDATE lookups SET last_used = ? WHERE title_key = ?",
+                                   [(used, key) for key, used in self._last_used.items()])
+            self._last_used.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        with self._lock:
+            self._write_last_used()
+            self._conn.commit()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from utils.projectFunctions import add_borrow_duration_and_alert
+
+
+class OverdueAlertEngine:
+    """
+    Keeps OverdueAlert up to date for a cleaned book table (the output of clean_data)
+    without recomputing every row on each run.
+
+    Only open loans (checked out, not returned) can change status from one day to the
+    next, so they're kept in an array sorted by the moment they become overdue
+    (checkout + max_allowed_days + 1 day, matching BorrowDuration > max_allowed_days).
+    `refresh(as_of)` cuts off the front of that array up to `as_of`: those loans are
+    the only rows updated, and they are returned as the delta to notify about.
+
+    The table is computed once as of the `as_of` given here; loans already overdue
+    then are in `overdue`, not in the first delta.
+    """
+
+    def __init__(
+        self,
+        books_df: pd.DataFrame,
+        as_of=None,
+        checkout_col: str = 'Book checkout',
+        returned_col: str = 'Book Returned',
+        max_allowed_days: int = 14
+    ):
+        if not books_df.index.is_unique:
+            raise ValueError("OverdueAlertEngine needs a table with a unique index.")
+        self.checkout_col = checkout_col
+        self.returned_col = returned_col
+        self.max_allowed_days = max_allowed_days
+        self.as_of = pd.Timestamp(as_of if as_of is not None else pd.Timestamp.now().normalize())
+
+        self.df = add_borrow_duration_and_alert(
+            books_df.copy(), checkout_col, returned_col, max_allowed_days, as_of=self.as_of
+        )
+        self._open = np.empty(0, dtype=np.intp)
+        self._pending = np.empty(0, dtype=np.intp)
+        self._overdue_from = np.empty(0, dtype='datetime64[us]')
+        self._add_open(self.df)
+
+    def _add_open(self, df: pd.DataFrame) -> None:
+        # Open loans not overdue yet go into the sorted array; loans with no checkout never become overdue
+        is_open = df[self.returned_col].isna() & df[self.checkout_col].notna()
+        # Positions in self.df; loans are only ever appended there, so they stay valid
+        self._open = np.concatenate([self._open, self.df.index.get_indexer(df.index[is_open])])
+        pending = df[is_open & (df['OverdueAlert'] != 'OVERDUE')]
+        overdue_from = (pending[self.checkout_col] + pd.Timedelta(days=self.max_allowed_days + 1)).to_numpy('datetime64[us]')
+        positions = np.concatenate([self._pending, self.df.index.get_indexer(pending.index)])
+        overdue_from = np.concatenate([self._overdue_from, overdue_from])
+        order = np.argsort(overdue_from, kind='stable')
+        self._pending, self._overdue_from = positions[order], overdue_from[order]
+
+    def __len__(self) -> int:
+        """Open loans still waiting to become overdue."""
+        return len(self._pending)
+
+    @property
+    def pending(self) -> pd.DataFrame:
+        """Open loans not overdue yet, soonest due first, with the day they're due back."""
+        rows = self.df.iloc[self._pending]
+        return rows.assign(DueDate=rows[self.checkout_col] + pd.Timedelta(days=self.max_allowed_days))
+
+    @property
+    def overdue(self) -> pd.DataFrame:
+        """Open loans that are overdue as of `as_of`."""
+        rows = self.df.iloc[np.sort(self._open)]
+        return rows[rows['OverdueAlert'].eq('OVERDUE')]
+
+    def refresh(self, as_of=None) -> pd.DataFrame:
+        """
+        Move the table to `as_of` (default: today) and return the loans that became
+        overdue since the last refresh. Open loans get their BorrowDuration brought
+        up to `as_of`; returned loans aren't touched.
+        """
+        as_of = pd.Timestamp(as_of if as_of is not None else pd.Timestamp.now().normalize())
+        if as_of < self.as_of:
+            raise ValueError(f"as_of {as_of} is before the last refresh ({self.as_of}).")
+        self.as_of = as_of
+
+        crossed = np.searchsorted(self._overdue_from, as_of.to_datetime64().astype('datetime64[us]'), side='right')
+        newly_overdue, self._pending, self._overdue_from = (
+            self._pending[:crossed], self._pending[crossed:], self._overdue_from[crossed:]
+        )
+
+        # Only the open rows are written, in place, rather than a new copy of the whole column
+        if len(self._open):
+            checkout = self.df[self.checkout_col].to_numpy()[self._open]
+            duration = (as_of.to_datetime64() - checkout) // np.timedelta64(1, 'D')
+            self.df.iloc[self._open, self.df.columns.get_loc('BorrowDuration')] = duration
+        self.df.iloc[newly_overdue, self.df.columns.get_loc('OverdueAlert')] = 'OVERDUE'
+        return self.df.iloc[np.sort(newly_overdue)]
+
+    def add_loans(self, new_loans: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add loans (cleaned rows, labels not in the table yet), measured as of the last
+        refresh. Ones already overdue are reported by the next refresh.
+        """
+        if self.df.index.intersection(new_loans.index).size or not new_loans.index.is_unique:
+            raise ValueError("New loans need index labels that aren't in the table yet.")
+        added = add_borrow_duration_and_alert(
+            new_loans.copy(), self.checkout_col, self.returned_col, self.max_allowed_days, as_of=self.as_of
+        )
+        # Left as due, so they come out of the next refresh like any loan that crossed
+        already_overdue = added[self.returned_col].isna() & added['OverdueAlert'].eq('OVERDUE')
+        added.loc[already_overdue, 'OverdueAlert'] = 'SCHEDULED'
+        self.df = pd.concat([self.df, added]) if len(self.df) else added
+        self._add_open(added)
+        return added
+
+    def mark_returned(self, labels, returned_on=None) -> None:
+        """Record loans as returned on `returned_on` (default: as_of) and drop them from the open set."""
+        labels = pd.Index(labels)
+        returned_on = pd.Timestamp(returned_on if returned_on is not None else self.as_of)
+        self.df.loc[labels, self.returned_col] = returned_on
+        updated = add_borrow_duration_and_alert(
+            self.df.loc[labels].copy(), self.checkout_col, self.returned_col, self.max_allowed_days, as_of=self.as_of
+        )
+        self.df.loc[labels, ['BorrowDuration', 'OverdueAlert']] = updated[['BorrowDuration', 'OverdueAlert']]
+
+        positions = self.df.index.get_indexer(labels)
+        self._open = self._open[~np.isin(self._open, positions)]
+        keep = ~np.isin(self._pending, positions)
+        self._pending, self._overdue_from = self._pending[keep], self._overdue_from[keep]
@@ -0,0 +1,107 @@
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource  # peak RSS; not available on Windows
+except ImportError:
+    resource = None
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process so far, in MB (None where it can't be read)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1024
+
+
+def _rows(value) -> int:
+    return len(value) if hasattr(value, 'columns') else None
+
+
+class PipelineProfiler:
+    """
+    Records wall time, CPU time, peak RSS growth and rows in/out for pipeline
+    stages and the steps run inside them.
+
+    - `stage(name)` is a context manager for a block of the pipeline; the record
+      it yields can be given `rows_in`/`rows_out`.
+    - `run(step, func, *args, **kwargs)` calls `func` as a step of the current stage.
+      Rows in come from the first DataFrame argument, rows out from the result.
+
+    CPU time is this process only, so work done in --workers processes isn't counted.
+    Peak RSS delta is how much the process's high-water mark rose during the block,
+    0 when it stayed under an earlier peak.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.records = []
+        self._stages = []
+
+    @contextmanager
+    def _measure(self, record: dict):
+        # Added before it runs so stages are listed ahead of their steps
+        self.records.append(record)
+        wall, cpu, rss = time.perf_counter(), time.process_time(), peak_rss_mb()
+        try:
+            yield record
+        finally:
+            record["wall_s"] = time.perf_counter() - wall
+            record["cpu_s"] = time.process_time() - cpu
+            record["peak_rss_delta_mb"] = peak_rss_mb() - rss if rss is not None else None
+
+    @contextmanager
+    def stage(self, name: str):
+        self._stages.append(name)
+        try:
+            with self._measure({"stage": name, "step": None, "rows_in": None, "rows_out": None}) as record:
+                yield record
+        finally:
+            self._stages.pop()
+
+    def run(self, step: str, func, *args, **kwargs):
+        rows_in = next((_rows(arg) for arg in args if _rows(arg) is not None), None)
+        stage = self._stages[-1] if self._stages else None
+        with self._measure({"stage": stage, "step": step, "rows_in": rows_in, "rows_out": None}) as record:
+            result = func(*args, **kwargs)
+            record["rows_out"] = _rows(result)
+        return result
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"records": self.records}, f, indent=2)
+
+    def format_table(self) -> str:
+        def number(value, fmt):
+            return format(value, fmt) if value is not None else "-"
+
+        lines = [f"{'stage / step':<40} {'wall s':>8} {'cpu s':>8} {'peak RSS +MB':>13} {'rows in':>10} {'rows out':>10}"]
+        for record in self.records:
+            label = f"  {record['step']}" if record["step"] else record["stage"]
+            lines.append(
+                f"{label[:40]:<40} {number(record['wall_s'], '.3f'):>8} {number(record['cpu_s'], '.3f'):>8} "
+                f"{number(record['peak_rss_delta_mb'], '.1f'):>13} "
+                f"{number(record['rows_in'], ','):>10} {number(record['rows_out'], ','):>10}"
+            )
+        return "\n".join(lines)
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off: runs everything, records nothing."""
+
+    enabled = False
+
+    @contextmanager
+    def stage(self, name: str):
+        yield {}
+
+    def run(self, step: str, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+
+NULL_PROFILER = NullProfiler()
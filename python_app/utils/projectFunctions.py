@@ -1,9 +1,19 @@
+import contextlib
+import os
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from pandas.tseries.api import guess_datetime_format
 
-# Function to read a CSV file
-def read_csv(file_path: str) -> pd.DataFrame:
-    return pd.read_csv(file_path)
+from utils.pipelineProfiler import NULL_PROFILER
+
+# Values the raw files use for "no value"; read_csv turns them into NaN while parsing,
+# on top of pandas' own list (keep_default_na). Whitespace-only cells are left to drop_missing_rows.
+MISSING_VALUES = ['', 'NaN']
+
+# Function to read a CSV file (extra keyword arguments go straight to pandas, e.g. chunksize)
+def read_csv(file_path: str, **kwargs) -> pd.DataFrame:
+    return pd.read_csv(file_path, **{'na_values': MISSING_VALUES, 'keep_default_na': True, **kwargs})
 
 # Function to clean data by dropping rows where all values are NaN
 def drop_na(df: pd.DataFrame) -> pd.DataFrame:
@@ -13,35 +23,181 @@ def drop_na(df: pd.DataFrame) -> pd.DataFrame:
 def drop_duplicates(df: pd.DataFrame) -> pd.DataFrame:
     return df.drop_duplicates()
 
+# Function to strip quotes and replace anything that isn't a dd/mm/yyyy-like date with the default
+def clean_date_text(values: pd.Series, default_date: str = '01/01/2023') -> pd.Series:
+    values = pd.Series(values, dtype=object).astype(str).str.replace('"', '', regex=False).astype(object)
+
+    # Anything that isn't "<day>/<x>/<y>" with a day of at most 31 gets the default date
+    day = values.str.extract(r'^(\d+)/[^/]*/[^/]*\Z', expand=False)
+    is_valid = day.map(int, na_action='ignore') <= 31
+    return values.where(is_valid, default_date)
+
+# Function to find the format correct_dates infers for a column from its first value
+def infer_date_format(values: pd.Series, default_date: str = '01/01/2023') -> str:
+    # to_datetime guesses the format from the first value and parses everything with it;
+    # a part of the column has its own first value, so the guess is made once for the whole
+    if values.empty:
+        return None
+    return guess_datetime_format(clean_date_text(values.iloc[:1], default_date).iloc[0], dayfirst=True)
+
 # Function to clean and correct invalid date formats in a column
-def correct_dates(df: pd.DataFrame, column_name: str, default_date: str = '01/01/2023') -> pd.DataFrame:
-    df[column_name] = df[column_name].astype(str).str.replace('"', '', regex=False)
-    df[column_name] = df[column_name].apply(
-        lambda x: x if len(x.split('/')) == 3 and x.split('/')[0].isdigit() and int(x.split('/')[0]) <= 31 else default_date
-    )
-    df[column_name] = pd.to_datetime(df[column_name], dayfirst=True, errors='coerce')
+def correct_dates(df: pd.DataFrame, column_name: str, default_date: str = '01/01/2023', date_format: str = None) -> pd.DataFrame:
+    # Loan dates repeat heavily, so clean and parse each distinct value once.
+    # factorize keeps first-seen order, so to_datetime still infers its format
+    # from the same leading value as when it parsed the whole column.
+    # Pass date_format (see infer_date_format) when df is only part of the column.
+    codes, uniques = pd.factorize(df[column_name], use_na_sentinel=False)
+    uniques = clean_date_text(uniques, default_date)
+
+    if date_format:
+        parsed = pd.to_datetime(uniques, format=date_format, errors='coerce')
+    else:
+        parsed = pd.to_datetime(uniques, dayfirst=True, errors='coerce')
+    df[column_name] = pd.Series(parsed.to_numpy()[codes], index=df.index)
     return df
 
 # Function to save a cleaned dataframe to a CSV file
 def save_to_csv(df: pd.DataFrame, output_file: str) -> None:
     df.to_csv(output_file, index=False)
 
-def fix_swapped_dates(df: pd.DataFrame, checkout_col: str = 'Book checkout', returned_col: str = 'Book Returned') -> pd.DataFrame:
-
-    #Ensures 'Book checkout' is earlier than 'Book Returned'.
-    #If not, it swaps them.
+# Function to turn repetitive text columns (titles, alerts, ...) into categoricals
+def categorize_text_columns(df: pd.DataFrame, max_unique_ratio: float = 0.5) -> pd.DataFrame:
+    text_columns = [
+        col for col in df.columns
+        if (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]))
+        and not isinstance(df[col].dtype, pd.CategoricalDtype)
+        and df[col].nunique() <= max_unique_ratio * len(df)
+    ]
+    return df.astype({col: 'category' for col in text_columns})
+
+# dtype hints for read_csv: repeated text is parsed straight into categoricals.
+# Columns a file doesn't have are ignored. IDs are left to optimize_dtypes: parsing
+# them as Int32 in read_csv is several times slower than converting afterwards.
+COMPACT_READ_DTYPES = {
+    'Books': 'category',
+    'Days allowed to borrow': 'category',
+}
+ID_COLUMNS = ('Id', 'Customer ID')
+DAY_UNITS = {'day': 1, 'week': 7}
+
+# Function to read a CSV file straight into compact dtypes
+def read_csv_compact(file_path: str, **kwargs) -> pd.DataFrame:
+    try:
+        return read_csv(file_path, dtype=COMPACT_READ_DTYPES, **kwargs)
+    except (ValueError, TypeError):
+        # Read as usual and let optimize_dtypes convert what it can
+        return read_csv(file_path, **kwargs)
+
+# Function to turn "2 weeks" / "10 days" / "14" into a day count (<NA> when it can't be read)
+def parse_borrow_days(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('Int32')
+
+    # Only a handful of distinct values, so parse the categories and map codes back
+    text = series.astype('category')
+    parts = text.cat.categories.astype(str).str.extract(r'(?i)^\s*(\d+)\s*(?:(day|week)s?)?\s*$')
+    days = pd.to_numeric(parts[0]) * parts[1].str.lower().map(DAY_UNITS).fillna(1)
+    days = pd.array(days, dtype='Int32').take(text.cat.codes.to_numpy(), allow_fill=True)
+    return pd.Series(days, index=series.index, name=series.name)
+
+# Function to shrink a cleaned dataframe's memory (opt-in, see clean_data(compact_dtypes=True))
+def optimize_dtypes(df: pd.DataFrame, max_unique_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    IDs (float64 when they have gaps, int64 otherwise) become nullable Int32,
+    'Days allowed to borrow' becomes an Int32 day count, and low-cardinality
+    text such as titles and OverdueAlert becomes categorical.
+    """
+    for col in ID_COLUMNS:
+        if col in df.columns and (pd.api.types.is_float_dtype(df[col]) or pd.api.types.is_integer_dtype(df[col])):
+            values = df[col].dropna()
+            if (values % 1 == 0).all() and not (values.abs() >= 2**31).any():
+                df[col] = df[col].astype('Int32')
+
+    if 'Days allowed to borrow' in df.columns:
+        df['Days allowed to borrow'] = parse_borrow_days(df['Days allowed to borrow'])
+
+    return categorize_text_columns(df, max_unique_ratio)
+
+# Function to report a dataframe's memory in MB, including the Python strings it holds
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1e6
+
+# Function to save a cleaned dataframe to Parquet (dates and categoricals keep their types)
+def save_to_parquet(df: pd.DataFrame, output_file: str) -> None:
+    categorize_text_columns(df).to_parquet(output_file, index=False)
+
+# Function to save a cleaned dataframe to an Arrow IPC (Feather v2) file
+def save_to_arrow(df: pd.DataFrame, output_file: str) -> None:
+    categorize_text_columns(df).reset_index(drop=True).to_feather(output_file)
+
+# Output formats by file extension; anything else is written as CSV
+PARQUET_EXTENSIONS = ('.parquet',)
+ARROW_EXTENSIONS = ('.arrow', '.feather')
+
+# Function to save a cleaned dataframe in the format given by the file extension
+def save_output(df: pd.DataFrame, output_file: str) -> None:
+    extension = os.path.splitext(output_file)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        save_to_parquet(df, output_file)
+    elif extension in ARROW_EXTENSIONS:
+        save_to_arrow(df, output_file)
+    else:
+        save_to_csv(df, output_file)
+
+# Function to load a file written by save_output
+def load_output(file_path: str) -> pd.DataFrame:
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        return pd.read_parquet(file_path)
+    if extension in ARROW_EXTENSIONS:
+        return pd.read_feather(file_path)
+    return pd.read_csv(file_path)
 
+def repair_loan_dates(
+    df: pd.DataFrame,
+    checkout_col: str = 'Book checkout',
+    returned_col: str = 'Book Returned',
+    max_year_diff: int = 5
+) -> pd.DataFrame:
+    """
+    Swaps checkout and return dates when checkout is later, then moves return dates
+    more than `max_year_diff` years after checkout into the checkout year, all in one
+    pass over whole columns. A 29 February moved into a non-leap year becomes
+    28 February. Pass max_year_diff=None to only swap.
+    """
     # Convert to datetime just in case they aren't already
-    df[checkout_col] = pd.to_datetime(df[checkout_col], errors='coerce')
-    df[returned_col] = pd.to_datetime(df[returned_col], errors='coerce')
-
-    # Find rows where checkout date is after returned date
-    mask = df[checkout_col] > df[returned_col]
+    checkout = pd.to_datetime(df[checkout_col], errors='coerce')
+    returned = pd.to_datetime(df[returned_col], errors='coerce')
+
+    # Swap if checkout > returned
+    swapped = checkout > returned
+    checkout, returned = checkout.where(~swapped, returned), returned.where(~swapped, checkout)
+
+    # Fix if return year is too far in future relative to checkout
+    if max_year_diff is not None:
+        future = (returned.dt.year - checkout.dt.year) > max_year_diff
+        if future.any():
+            future_returned = returned[future]
+            year = checkout[future].dt.year
+            month = future_returned.dt.month
+            day = future_returned.dt.day
+            is_leap_year = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+            day = day.where(~((month == 2) & (day == 29) & ~is_leap_year), 28)
+
+            # Same month, day and time of day, in the checkout year
+            time_of_day = future_returned - future_returned.dt.normalize()
+            moved = pd.to_datetime(pd.DataFrame({'year': year, 'month': month, 'day': day})) + time_of_day
+            returned = returned.where(~future, moved.astype(returned.dtype))
+
+    df[checkout_col] = checkout
+    df[returned_col] = returned
+    return df
 
-    # Swap the dates for those rows
-    df.loc[mask, [checkout_col, returned_col]] = df.loc[mask, [returned_col, checkout_col]].values
+def fix_swapped_dates(df: pd.DataFrame, checkout_col: str = 'Book checkout', returned_col: str = 'Book Returned') -> pd.DataFrame:
 
-    return df
+    #Ensures 'Book checkout' is earlier than 'Book Returned'.
+    #If not, it swaps them.
+    return repair_loan_dates(df, checkout_col, returned_col, max_year_diff=None)
 
 def fix_swapped_and_future_dates(
     df: pd.DataFrame,
@@ -54,82 +210,75 @@ def fix_swapped_and_future_dates(
     If not, swaps them.
     Also corrects return dates that are more than `max_year_diff` years after checkout.
     """
-    # Convert to datetime
-    df[checkout_col] = pd.to_datetime(df[checkout_col], errors='coerce')
-    df[returned_col] = pd.to_datetime(df[returned_col], errors='coerce')
-
-    # Step 1: Swap if checkout > returned
-    mask_swapped = df[checkout_col] > df[returned_col]
-    df.loc[mask_swapped, [checkout_col, returned_col]] = df.loc[mask_swapped, [returned_col, checkout_col]].values
-
-    # Step 2: Fix if return year is too far in future relative to checkout
-    mask_future = (df[returned_col].dt.year - df[checkout_col].dt.year) > max_year_diff
-
-    def correct_year(row):
-        checkout_date = row[checkout_col]
-        returned_date = row[returned_col]
-        # Set returned date to the same year as checkout
-        if pd.notna(returned_date) and pd.notna(checkout_date):
-            return returned_date.replace(year=checkout_date.year)
-        return pd.NaT
-
-    # Apply correction and ensure dtype compatibility
-    corrected = df.loc[mask_future].apply(lambda row: correct_year(row), axis=1)
-    corrected = pd.to_datetime(corrected)
-    df.loc[mask_future, returned_col] = corrected
-
-    return df
+    return repair_loan_dates(df, checkout_col, returned_col, max_year_diff)
 
 def add_borrow_duration_and_alert(
     df: pd.DataFrame,
     checkout_col: str = 'Book checkout',
     returned_col: str = 'Book Returned',
-    max_allowed_days: int = 14
+    max_allowed_days: int = 14,
+    as_of=None
 ) -> pd.DataFrame:
     """
     Adds a column for number of days borrowed and an alert:
     'ON TIME', 'OVERDUE', or 'SCHEDULED' for future due dates.
+    Open loans are measured up to `as_of` (default: today).
     """
-    today = pd.to_datetime(datetime.now().date())
+    today = pd.to_datetime(datetime.now().date() if as_of is None else as_of)
 
     # Ensure datetime format
     df[checkout_col] = pd.to_datetime(df[checkout_col], errors='coerce')
     df[returned_col] = pd.to_datetime(df[returned_col], errors='coerce')
 
-    def calculate_duration(row):
-        if pd.notna(row[returned_col]) and pd.notna(row[checkout_col]):
-            return (row[returned_col] - row[checkout_col]).days
-        elif pd.isna(row[returned_col]) and pd.notna(row[checkout_col]):
-            return (today - row[checkout_col]).days
-        else:
-            return None
-
-    def alert_status(row):
-        duration = row['BorrowDuration']
-        returned = row[returned_col]
-
-        if pd.isna(returned):
-            if duration is not None and duration > max_allowed_days:
-                return 'OVERDUE'
-            else:
-                return 'SCHEDULED'
-        else:
-            return 'OVERDUE' if duration > max_allowed_days else 'ON TIME'
+    # Nothing to measure: keep the empty float columns the row-wise version produced
+    if df.empty:
+        df['BorrowDuration'] = pd.Series(index=df.index, dtype='float64')
+        df['OverdueAlert'] = pd.Series(index=df.index, dtype='float64')
+        return df
+
+    # Open loans are measured up to as_of; rows without a checkout stay empty.
+    # Timedelta .dt.days floors like Timedelta.days and comes back as float64
+    # with NaN when any checkout is missing, the same dtype the row-wise apply gave.
+    end_dates = df[returned_col].where(df[returned_col].notna(), today)
+    duration = (end_dates - df[checkout_col]).dt.days
+
+    # Missing durations never count as overdue, so open loans without a
+    # checkout are 'SCHEDULED' and returned ones are 'ON TIME'.
+    is_overdue = (duration > max_allowed_days).to_numpy()
+    is_open = df[returned_col].isna().to_numpy()
+    alert = np.select(
+        [is_overdue, is_open],
+        ['OVERDUE', 'SCHEDULED'],
+        default='ON TIME'
+    )
 
     # Add duration and alert columns
-    df['BorrowDuration'] = df.apply(calculate_duration, axis=1)
-    df['OverdueAlert'] = df.apply(alert_status, axis=1)
+    df['BorrowDuration'] = duration
+    df['OverdueAlert'] = pd.Series(alert, index=df.index)
 
     return df
 
-# Function to clean data (combines dropna, drop duplicates, and correct dates if applicable)
-def clean_data(file_path: str, date_columns: list = [], output_file: str = "") -> pd.DataFrame:
-    # Step 1: Read in the raw data
-    rawData = read_csv(file_path)
-
-    # Step 1.1: Replace blank strings or "NaN" strings with real NaN
-    cleanData = rawData.replace(r'^\s*$', pd.NA, regex=True)
-    cleanedData = cleanData.replace("NaN", pd.NA)
+# Function to replace blank values and drop rows that carry no data
+def drop_missing_rows(rawData: pd.DataFrame) -> pd.DataFrame:
+    # Step 1.1: Replace blank or whitespace-only strings with real NaN.
+    # "NaN" and empty fields are already NaN from read_csv (MISSING_VALUES), and only
+    # text columns can hold blanks, so numbers are skipped and untouched columns aren't copied.
+    cleanedData = rawData.copy(deep=False)
+    for col in rawData.columns:
+        dtype = rawData[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            # Categorical columns (read_csv_compact) only need their categories checked
+            categories = dtype.categories
+            missing = categories[categories.astype(str).str.fullmatch(r'\s*|NaN')]
+            if len(missing):
+                cleanedData[col] = rawData[col].cat.remove_categories(missing)
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            try:
+                is_blank = rawData[col].str.strip().eq('').fillna(False).to_numpy(dtype=bool)
+            except AttributeError:
+                continue  # object column without any strings (e.g. Timestamps), so no blanks either
+            if is_blank.any():
+                cleanedData[col] = rawData[col].mask(is_blank)
 
     # Step 2: Drop rows with all NaN values
     df_noNA = drop_na(cleanedData)
@@ -138,28 +287,189 @@ def clean_data(file_path: str, date_columns: list = [], output_file: str = "") -
     if 'Books' in df_noNA.columns and 'Customer ID' in df_noNA.columns:
         df_noNA = df_noNA[~(df_noNA["Books"].isna() & df_noNA["Customer ID"].isna())]
 
-    # Step 3: Drop duplicate rows
-    df_no_duplicates = drop_duplicates(df_noNA)
+    return df_noNA
 
-    # Step 4: Correct date columns if provided
+# Function to correct loan dates and add the borrow duration and alert columns
+def fix_loan_dates(df: pd.DataFrame, date_columns: list = [], profiler=NULL_PROFILER, date_formats: dict = None) -> pd.DataFrame:
+    # Step 4: Correct date columns if provided (date_formats: {column: format} fixed up front)
+    date_formats = date_formats or {}
     for date_column in date_columns:
-        if date_column in df_no_duplicates.columns:
-            df_no_duplicates = correct_dates(df_no_duplicates, date_column)
-
-    # Step 5: Correct Checkout and Return dates
-    if 'Book checkout' in df_no_duplicates.columns and 'Book Returned' in df_no_duplicates.columns:
-        df_no_duplicates = fix_swapped_dates(df_no_duplicates)
+        if date_column in df.columns:
+            df = profiler.run(f"4 correct_dates ({date_column})", correct_dates, df, date_column,
+                              date_format=date_formats.get(date_column))
 
-    # Step 6: Correct incorrect dates in the data
-    if 'Book checkout' in df_no_duplicates.columns and 'Book Returned' in df_no_duplicates.columns:
-        df_no_duplicates = fix_swapped_and_future_dates(df_no_duplicates)
+    # Steps 5-6: Swap reversed Checkout/Return dates and correct far-future return years (one pass)
+    if 'Book checkout' in df.columns and 'Book Returned' in df.columns:
+        df = profiler.run("5-6 repair_loan_dates", repair_loan_dates, df)
 
     # Step 7: Count the days customer holds the book and give an alert if it's longer than 14 days 
-    if 'Book checkout' in df_no_duplicates.columns and 'Book Returned' in df_no_duplicates.columns:
-        df_no_duplicates = add_borrow_duration_and_alert(df_no_duplicates)
-    
-    # Step 8: Save the cleaned data if output file path is provided
-    if output_file:
-        save_to_csv(df_no_duplicates, output_file)
+    if 'Book checkout' in df.columns and 'Book Returned' in df.columns:
+        df = profiler.run("7 add_borrow_duration_and_alert", add_borrow_duration_and_alert, df)
+
+    return df
+
+# Function to clean data (combines dropna, drop duplicates, and correct dates if applicable)
+def clean_data(
+    file_path: str,
+    date_columns: list = [],
+    output_file: str = "",
+    compact_dtypes: bool = False,
+    profiler=NULL_PROFILER,
+    backend: str = 'pandas',
+    schema: str = None
+) -> pd.DataFrame:
+    if backend != 'pandas' and schema:
+        raise ValueError("schema only applies to the pandas backend.")
+    if backend != 'pandas':
+        # Steps 1-7 as one lazy, multi-threaded polars or DuckDB query (utils/cleanBackends.py)
+        from utils.cleanBackends import clean_frame
+        df_no_duplicates = profiler.run(f"1-7 {backend} plan", clean_frame, file_path, date_columns, backend)
+    else:
+        # Step 1: Read in the raw data (with a schema, the declared columns with their declared
+        # types; with compact_dtypes, repeated text is read as categoricals)
+        if schema:
+            from utils.csvSchemas import read_csv_with_schema
+            # Dates stay text for correct_dates; values that don't fit are reported, not raised
+            rawData = profiler.run("1 read_csv_with_schema", read_csv_with_schema, file_path, schema, 'warn', False)
+        elif compact_dtypes:
+            rawData = profiler.run("1 read_csv_compact", read_csv_compact, file_path)
+        else:
+            rawData = profiler.run("1 read_csv", read_csv, file_path)
 
-    return df_no_duplicates
\ No newline at end of file
+        # Steps 1.1-2: Replace blank values and drop empty rows
+        df_noNA = profiler.run("1.1-2 drop_missing_rows", drop_missing_rows, rawData)
+
+        # Step 3: Drop duplicate rows
+        df_no_duplicates = profiler.run("3 drop_duplicates", drop_duplicates, df_noNA)
+
+        # Steps 4-7: Correct dates and add borrow duration/alert
+        df_no_duplicates = fix_loan_dates(df_no_duplicates, date_columns, profiler)
+
+    # Step 8: Save the cleaned data if output file path is provided (.csv, .parquet or .arrow)
+    if output_file:
+        profiler.run("8 save_output", save_output, df_no_duplicates, output_file)
+
+    # Step 9: Optionally shrink the returned frame (Int32 IDs, day counts, categoricals).
+    # It runs after the save, so the file on disk is the same with or without compact_dtypes.
+    if compact_dtypes:
+        df_no_duplicates = profiler.run("9 optimize_dtypes", optimize_dtypes, df_no_duplicates)
+
+    return df_no_duplicates
+
+# Function to hash every row of a dataframe to a uint64
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    # Numbers are hashed as floats so 1 and 1.0 match when chunks infer different dtypes
+    numeric_columns = {
+        name: 'float64' for name, col in df.items()
+        if pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col)
+    }
+    hashable = df.astype(numeric_columns)
+    return pd.util.hash_pandas_object(hashable, index=False).to_numpy()
+
+class RowHashStore:
+    """
+    Remembers which rows have been seen, as 64-bit row hashes (8 bytes per row).
+    Hashes are kept in a few sorted runs that are merged as they grow, so both
+    lookups and inserts stay cheap however many chunks have been added.
+    """
+    def __init__(self):
+        self._runs = []
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    def __contains__(self, row_hash) -> bool:
+        return bool(self._seen(np.array([row_hash], dtype=np.uint64))[0])
+
+    def _seen(self, hashes: np.ndarray) -> np.ndarray:
+        seen = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            pos = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            seen |= run[pos] == hashes
+        return seen
+
+    def add_new(self, hashes: np.ndarray) -> np.ndarray:
+        """Store the hashes and return a mask of the ones not seen before (first occurrence wins)."""
+        first_in_batch = ~pd.Series(hashes).duplicated().to_numpy()
+        is_new = first_in_batch & ~self._seen(hashes)
+
+        run = np.sort(hashes[is_new])
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.union1d(self._runs.pop(), run)
+        if len(run):
+            self._runs.append(run)
+
+        return is_new
+
+# Function to find the dtypes read_csv would give the numeric columns of a whole file, chunk by chunk
+def whole_file_dtypes(file_path: str, chunksize: int = 100_000, **read_kwargs) -> dict:
+    # A chunk infers its own dtypes, so an ID column is int64 in a chunk without gaps and
+    # float64 in one with a NaN. Only the numeric columns of the first chunk can differ
+    # from chunk to chunk, so only they are read again, to combine their dtypes over the file.
+    read_kwargs = {key: value for key, value in read_kwargs.items() if key not in ('usecols', 'nrows')}
+    first = read_csv(file_path, nrows=chunksize, **read_kwargs)
+    pinned = read_kwargs.pop('dtype', None) or {}
+    numeric = [col for col in first.columns if pd.api.types.is_numeric_dtype(first[col]) and col not in pinned]
+    if not numeric:
+        return {}
+
+    dtypes = {col: [] for col in numeric}
+    with read_csv(file_path, usecols=numeric, chunksize=chunksize, **read_kwargs) as chunks:
+        for chunk in chunks:
+            for col in numeric:
+                dtypes[col].append(chunk[col].dtype)
+    combined = {}
+    for col, found in dtypes.items():
+        if len(set(found)) == 1:
+            combined[col] = found[0]
+        elif all(pd.api.types.is_numeric_dtype(dtype) for dtype in found):
+            combined[col] = 'float64'  # whole numbers with gaps, as one read of the file gives
+        else:
+            combined[col] = 'str'  # numbers and text mixed over the file are read as text
+    return combined
+
+# Function to clean a CSV that may not fit in memory, one chunk at a time
+def iter_clean_chunks(file_path: str, date_columns: list = [], chunksize: int = 100_000, schema: str = None, **read_kwargs):
+    # Yields the file cleaned chunk by chunk, with the same steps as clean_data.
+    # Duplicates are found across chunks by row hash, so memory is bounded by the
+    # chunk size plus 8 bytes per distinct row.
+    seen_rows = RowHashStore()
+
+    # Step 1: Read in the raw data one chunk at a time (with a schema, every chunk gets the declared types).
+    # Both readers hold the file open, so they're closed even when the caller stops early.
+    if schema:
+        from utils.csvSchemas import CsvSchema
+        reader = contextlib.closing(CsvSchema.for_dataset(schema).read_chunks(file_path, chunksize, 'warn', False, **read_kwargs))
+    else:
+        # Every chunk gets the dtypes the whole file would have, so IDs aren't 1 in one chunk and 1.0 in the next
+        dtype = {**whole_file_dtypes(file_path, chunksize, **read_kwargs), **(read_kwargs.pop('dtype', None) or {})}
+        reader = read_csv(file_path, chunksize=chunksize, dtype=dtype, **read_kwargs)
+    with reader as raw_chunks:
+        for rawChunk in raw_chunks:
+            # Steps 1.1-2: Replace blank values and drop empty rows
+            chunk = drop_missing_rows(rawChunk)
+
+            # Step 3: Drop rows already seen in this or an earlier chunk
+            chunk = chunk[seen_rows.add_new(hash_rows(chunk))]
+
+            # Steps 4-7: Correct dates and add borrow duration/alert
+            yield fix_loan_dates(chunk, date_columns)
+
+# Function to clean a file larger than memory, appending each cleaned chunk to output_file
+def clean_data_in_chunks(file_path: str, output_file: str, date_columns: list = [], chunksize: int = 100_000, schema: str = None, **read_kwargs) -> int:
+    # Runs iter_clean_chunks and writes each chunk as it comes. Returns the number of rows written.
+    # Chunks are read with the whole file's numeric dtypes (see whole_file_dtypes), so the
+    # output matches clean_data's; a schema pins every column to its declared type instead.
+    # Output is always CSV, the one format here that can be appended to.
+    if os.path.splitext(output_file)[1].lower() in PARQUET_EXTENSIONS + ARROW_EXTENSIONS:
+        raise ValueError("clean_data_in_chunks can only write CSV output.")
+    rows_written = 0
+
+    with contextlib.closing(iter_clean_chunks(file_path, date_columns, chunksize, schema, **read_kwargs)) as chunks:
+        for chunk_number, chunk in enumerate(chunks):
+            # Step 8: Append the cleaned chunk (the first one creates the file and header)
+            first_chunk = chunk_number == 0
+            chunk.to_csv(output_file, mode='w' if first_chunk else 'a', header=first_chunk, index=False)
+            rows_written += len(chunk)
+
+    return rows_written
@@ -0,0 +1,200 @@
+import contextlib
+import io
+import queue
+import threading
+
+import pandas as pd
+
+from utils.booksAPIFetch import enrich_books
+from utils.dashboardMetrics import StreamingAggregates
+from utils.loanRollups import LoanRollup
+from utils.openLibraryCache import normalize_title
+from utils.projectFunctions import iter_clean_chunks, read_csv, drop_missing_rows, hash_rows, RowHashStore
+
+LOAN_DATE_COLUMNS = ['Book checkout', 'Book Returned']
+
+# End-of-stream marker passed down each queue
+DONE = object()
+
+
+class _Stopped(Exception):
+    """Raised inside a stage when another stage failed and the pipeline is shutting down."""
+
+
+class StageRunner:
+    """
+    Runs pipeline stages in threads connected by bounded queues.
+
+    A stage blocks when the queue ahead of it is full, so a slow consumer (the SQL
+    load, the API) holds back the stages feeding it instead of letting chunks pile
+    up in memory: at most `queue_size` chunks wait between any two stages. If a
+    stage raises, the others stop at their next get/put and `join` re-raises it.
+    """
+
+    def __init__(self, queue_size: int = 2):
+        self.queue_size = queue_size
+        self._stop = threading.Event()
+        self._errors = []
+        self._threads = []
+
+    def make_queue(self) -> queue.Queue:
+        return queue.Queue(maxsize=self.queue_size)
+
+    def put(self, q: queue.Queue, item) -> None:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise _Stopped()
+
+    def items(self, q: queue.Queue, producers: int = 1):
+        """Items from `q` until each of its `producers` has sent DONE."""
+        finished = 0
+        while finished < producers:
+            try:
+                item = q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    raise _Stopped()
+                continue
+            if item is DONE:
+                finished += 1
+            else:
+                yield item
+
+    def start(self, name: str, work, *outboxes: queue.Queue) -> None:
+        """Run `work()` in a thread; DONE goes to each of `outboxes` when it returns."""
+        def run():
+            try:
+                work()
+                for q in outboxes:
+                    self.put(q, DONE)
+            except _Stopped:
+                pass
+            except BaseException as error:
+                self._errors.append(error)
+                self._stop.set()
+
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+        if self._errors:
+            raise self._errors[0]
+
+
+def _append_csv(df: pd.DataFrame, output_file: str, first: bool) -> None:
+    df.to_csv(output_file, mode='w' if first else 'a', header=first, index=False)
+
+
+def stream_pipeline(
+    book_file: str,
+    book_output: str,
+    api_raw_file: str,
+    api_output: str,
+    chunksize: int = 50_000,
+    queue_size: int = 2,
+    enrich=None,
+    on_books=None,
+    on_books_api=None,
+    schema: str = None
+) -> dict:
+    """
+    Runs clean → enrich → enriched clean → load/metrics over the loan file chunk by
+    chunk, with every stage working on a different chunk at the same time:
+
+    1. clean:         iter_clean_chunks on `book_file` (same steps as clean_data_in_chunks)
+    2. enrich:        looks up the titles of each chunk not looked up in an earlier one
+                      (`enrich(df)`, default enrich_books) and appends them to `api_raw_file`
+    3. enrich clean:  the enriched rows as clean_data would read them back from that file
+    4. sink:          appends both cleaned streams to `book_output`/`api_output` (CSV),
+                      updates the per-customer and per-title rollups and the dashboard
+                      aggregates, and passes each chunk to `on_books`/`on_books_api`
+                      (e.g. a SQL write)
+
+    Titles are matched across chunks by normalized form; TitleIndex's near-duplicate
+    grouping only applies within a chunk. `schema` (e.g. 'Books') reads `book_file`
+    with its declared column types, as clean_data(schema=...) does. Returns the
+    rollups, the StreamingAggregates and row counts.
+    """
+    enrich = enrich or enrich_books
+    runner = StageRunner(queue_size)
+    to_enrich, to_clean_api, to_sink = runner.make_queue(), runner.make_queue(), runner.make_queue()
+    result = {"books_rows": 0, "books_api_rows": 0, "chunks": 0, "api_chunks": 0}
+
+    def clean():
+        looked_up = set()
+        # Closed right away if a later stage fails and runner.put stops this stage mid-file
+        with contextlib.closing(iter_clean_chunks(book_file, LOAN_DATE_COLUMNS, chunksize, schema)) as chunks:
+            for chunk in chunks:
+                runner.put(to_sink, ("books", chunk))
+                # Only rows with titles no earlier chunk had go on to enrichment; once most titles
+                # have been seen that is rarely any, so a slow API doesn't hold up the load
+                titles = chunk["Books"].dropna()
+                keys = titles.map(normalize_title)
+                new_rows = chunk.loc[titles.index[~keys.isin(looked_up)]]
+                looked_up.update(keys)
+                if not new_rows.empty:
+                    runner.put(to_enrich, new_rows)
+
+    def enrich_new_titles():
+        first = True
+        for new_rows in runner.items(to_enrich):
+            enriched = enrich(new_rows)
+            if enriched.empty:
+                continue
+            # The raw file the batch pipeline writes and reads back
+            text = enriched.to_csv(index=False)
+            with open(api_raw_file, 'w' if first else 'a') as f:
+                f.write(text if first else text.split('\n', 1)[1])
+            first = False
+            runner.put(to_clean_api, text)
+        if first:
+            # Nothing was enriched: don't leave an earlier run's raw file looking like this run's
+            pd.DataFrame().to_csv(api_raw_file, index=False)
+
+    def clean_enriched():
+        seen_rows = RowHashStore()
+        for text in runner.items(to_clean_api):
+            # clean_data steps 1-3 on the rows as they read back from the CSV
+            chunk = drop_missing_rows(read_csv(io.StringIO(text)))
+            runner.put(to_sink, ("books_api", chunk[seen_rows.add_new(hash_rows(chunk))]))
+
+    customers, titles = LoanRollup('Customer ID'), LoanRollup('Books')
+    aggregates = StreamingAggregates()
+
+    def sink():
+        for name, chunk in runner.items(to_sink, producers=2):
+            if name == "books":
+                _append_csv(chunk, book_output, result["chunks"] == 0)
+                customers.update(added=chunk)
+                titles.update(added=chunk)
+                aggregates.add_books(chunk)
+                result["books_rows"] += len(chunk)
+                result["chunks"] += 1
+                if on_books:
+                    on_books(chunk)
+            else:
+                _append_csv(chunk, api_output, result["api_chunks"] == 0)
+                aggregates.add_api_books(chunk)
+                result["books_api_rows"] += len(chunk)
+                result["api_chunks"] += 1
+                if on_books_api:
+                    on_books_api(chunk)
+
+    runner.start("clean", clean, to_sink, to_enrich)
+    runner.start("enrich", enrich_new_titles, to_clean_api)
+    runner.start("enrich clean", clean_enriched, to_sink)
+    runner.start("sink", sink)
+    runner.join()
+
+    if result["api_chunks"] == 0:
+        # Nothing was enriched: still leave an (empty) output for the later stages to find
+        pd.DataFrame().to_csv(api_output, index=False)
+    result.update(customer_rollup=customers, title_rollup=titles, aggregates=aggregates)
+    return result
@@ -1,6 +1,10 @@
 import unittest
 import pandas as pd
-from utils.DE_metrics import get_num_customers, get_num_books, get_num_api_requests
+from utils.DE_metrics import (
+    get_num_customers, get_num_books, get_num_api_requests, get_num_unique_authors,
+    get_most_borrowed_book, get_most_active_customer, get_average_borrow_duration,
+    get_num_overdue, get_num_currently_borrowed, compute_all_metrics, _count_values, _mode_from_counts
+)
 
 class TestDEMetrics(unittest.TestCase):
     def test_get_num_customers(self):
@@ -21,5 +25,61 @@ class TestDEMetrics(unittest.TestCase):
         df_empty = pd.DataFrame({})
         self.assertEqual(get_num_api_requests(df_empty), 0)
 
+    def test_most_borrowed_book_ties_go_to_smallest(self):
+        df = pd.DataFrame({'Books': ['B', 'A', 'B', 'A', 'C', None, None, None]})
+        # Same answer as Series.mode().iloc[0]; missing titles don't count
+        self.assertEqual(get_most_borrowed_book(df), df['Books'].mode().iloc[0])
+        self.assertEqual(get_most_borrowed_book(df), 'A')
+
+    def test_count_values_first_seen_order(self):
+        counts, uniques = _count_values(pd.Series(['B', None, 'C', 'A', 'C', 'B', 'A']))
+        self.assertEqual(list(uniques), ['B', 'C', 'A'])
+        self.assertEqual(list(counts), [2, 2, 2])
+        counts, uniques = _count_values(pd.Series([7.0, None, 2.0, 7.0]))
+        self.assertEqual(list(uniques), [7.0, 2.0])
+        self.assertEqual(list(counts), [2, 1])
+
+    def test_most_borrowed_book_ties_of_mixed_types(self):
+        # 3 and "3" can't be ordered (min raises TypeError), so the tie goes to the first seen
+        with self.assertRaises(TypeError):
+            min([3, '3'])
+        self.assertEqual(_mode_from_counts(*_count_values(pd.Series(['3', 3, 3, '3'], dtype=object))), '3')
+        self.assertEqual(_mode_from_counts(*_count_values(pd.Series([3, '3', '3', 3], dtype=object))), 3)
+        df = pd.DataFrame({'Books': [3, 'A', '3', '3', 3]}, dtype=object)
+        self.assertEqual(get_most_borrowed_book(df), 3)
+
+    def test_compute_all_metrics(self):
+        books = pd.DataFrame({
+            'Books': ['A', 'B', 'A', None],
+            'Customer ID': [1.0, 2.0, 2.0, None],
+            'Book Returned': ['2023-01-10', None, '2023-01-20', None],
+            'BorrowDuration': [9, 20, 3, None],
+            'OverdueAlert': ['ON TIME', 'OVERDUE', 'ON TIME', 'SCHEDULED'],
+        })
+        customers = pd.DataFrame({'Customer ID': [1, 2, 3, 3]})
+        api = pd.DataFrame({'Author': ['X', 'Y', 'X']})
+
+        metrics = compute_all_metrics(books, customers, api)
+
+        # Every value matches the single-metric function with the same name
+        self.assertEqual(metrics, {
+            'num_customers': get_num_customers(customers),
+            'num_books': get_num_books(books),
+            'num_api_requests': get_num_api_requests(api),
+            'num_unique_authors': get_num_unique_authors(api),
+            'most_borrowed_book': get_most_borrowed_book(books),
+            'most_active_customer': get_most_active_customer(books),
+            'average_borrow_duration': get_average_borrow_duration(books),
+            'num_overdue': get_num_overdue(books),
+            'num_currently_borrowed': get_num_currently_borrowed(books),
+        })
+        self.assertEqual(metrics['most_active_customer'], '2.0')
+        self.assertEqual(metrics['num_currently_borrowed'], 2)
+
+    def test_compute_all_metrics_empty(self):
+        metrics = compute_all_metrics(pd.DataFrame({}), pd.DataFrame({}), pd.DataFrame({}))
+        self.assertEqual(metrics['num_books'], 0)
+        self.assertEqual(metrics['most_borrowed_book'], '')
+
 if __name__ == '__main__':
     unittest.main()
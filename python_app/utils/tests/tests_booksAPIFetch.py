@@ -1,12 +1,25 @@
+import asyncio
+import json
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
+from urllib.parse import parse_qs, urlsplit
 import sys
 import os
+import tempfile
+
+import pandas as pd
 
 # Add the parent directory of the project (python_app) to sys.path for absolute imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from utils.booksAPIFetch import fetch_openlibrary_data
+from utils import booksAPIFetch
+from utils.booksAPIFetch import (
+    fetch_openlibrary_data, fetch_openlibrary_data_async, enrich_books, enrich_title_variants, enrich_books_async, search_url
+)
+from utils.openLibraryCache import OpenLibraryCache
 
 
 class TestFetchOpenLibraryData(unittest.TestCase):
@@ -40,7 +53,7 @@ class TestFetchOpenLibraryData(unittest.TestCase):
             "ISBN": "1234567890",
             "OpenLibrary_ID": "/books/OL1234567M"
         })
-        mock_get.assert_called_once_with("https://openlibrary.org/search.json?title=Test Book")
+        mock_get.assert_called_once_with("https://openlibrary.org/search.json?title=Test+Book&fields=title,author_name,first_publish_year,isbn,key&limit=1")
 
     @patch('utils.booksAPIFetch.requests.get')
     def test_fetch_openlibrary_data_no_results(self, mock_get):
@@ -58,7 +71,7 @@ class TestFetchOpenLibraryData(unittest.TestCase):
 
         # Assertions
         self.assertIsNone(result)
-        mock_get.assert_called_once_with("https://openlibrary.org/search.json?title=Nonexistent Book")
+        mock_get.assert_called_once_with("https://openlibrary.org/search.json?title=Nonexistent+Book&fields=title,author_name,first_publish_year,isbn,key&limit=1")
 
     @patch('utils.booksAPIFetch.requests.get')
     def test_fetch_openlibrary_data_error_handling(self, mock_get):
@@ -70,7 +83,158 @@ class TestFetchOpenLibraryData(unittest.TestCase):
 
         # Assertions
         self.assertIsNone(result)
-        mock_get.assert_called_once_with("https://openlibrary.org/search.json?title=Error Book")
+        mock_get.assert_called_once_with("https://openlibrary.org/search.json?title=Error+Book&fields=title,author_name,first_publish_year,isbn,key&limit=1")
+
+    def test_search_url_encodes_title(self):
+        query = parse_qs(urlsplit(search_url("Pride & Prejudice #2?")).query)
+        self.assertEqual(query["title"], ["Pride & Prejudice #2?"])
+        self.assertEqual(query["limit"], ["1"])
+
+
+class StubOpenLibraryHandler(BaseHTTPRequestHandler):
+    # Simulates a slow Open Library search endpoint. Titles starting with "Busy"
+    # get a 429 on their first request, titles starting with "Missing" have no match
+    # and titles starting with "Broken" always get a 500.
+    latency = 0.2
+    seen_titles = set()
+    last_query = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        query = parse_qs(urlsplit(self.path).query)
+        title = query["title"][0]
+        StubOpenLibraryHandler.last_query = query
+
+        with self.lock:
+            first_request = title not in self.seen_titles
+            self.seen_titles.add(title)
+
+        if title.startswith("Broken") or title.startswith("Busy") and first_request:
+            self.send_response(500 if title.startswith("Broken") else 429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+
+        if title.startswith("Missing"):
+            body = {"numFound": 0, "docs": []}
+        else:
+            body = {"numFound": 1, "docs": [{"title": title.upper(), "author_name": ["Stub Author"], "key": f"/works/{title}"}]}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestEnrichBooks(unittest.TestCase):
+    def setUp(self):
+        StubOpenLibraryHandler.seen_titles = set()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenLibraryHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_enrich_books_concurrent_keeps_order(self):
+        titles = [f"Book{i}" for i in range(10)] + ["Busy1", "Missing1", "Book0", None]
+        book_df = pd.DataFrame({"Books": titles})
+
+        start = time.perf_counter()
+        result = enrich_books(book_df, max_workers=10, requests_per_second=0, base_url=self.base_url)
+        elapsed = time.perf_counter() - start
+
+        # Unique titles in first-seen order; the 429 was retried and the miss dropped
+        expected_titles = [f"BOOK{i}" for i in range(10)] + ["BUSY1"]
+        self.assertEqual(list(result["Title"]), expected_titles)
+        # 12 requests at 0.2s each would take 2.4s one after another
+        self.assertLess(elapsed, 1.5)
+
+    def test_enrich_books_rate_limited(self):
+        book_df = pd.DataFrame({"Books": ["A", "B", "C", "D", "E"]})
+
+        start = time.perf_counter()
+        result = enrich_books(book_df, max_workers=5, requests_per_second=10, base_url=self.base_url)
+        elapsed = time.perf_counter() - start
+
+        # Five requests to one host at 10 per second need at least 0.4s between first and last
+        self.assertEqual(len(result), 5)
+        self.assertGreaterEqual(elapsed, 0.4)
+
+    def test_enrich_books_one_request_per_title_group(self):
+        book_df = pd.DataFrame({"Books": ["Catcher in the Rye ", "catcher in the rye", "Catcher in the Rye",
+                                          "Catcher in the Rye", "Dune", "Dune "]})
+        result = enrich_books(book_df, max_workers=4, requests_per_second=0, base_url=self.base_url)
+
+        # The most borrowed spelling is looked up, once per group
+        self.assertEqual(StubOpenLibraryHandler.seen_titles, {"Catcher in the Rye", "Dune"})
+        self.assertEqual(list(result["Title"]), ["CATCHER IN THE RYE", "DUNE"])
+
+    def test_enrich_books_answered_titles(self):
+        book_df = pd.DataFrame({"Books": ["Dune", "Dune ", "Missing1", "Broken1"]})
+        answered = set()
+        enrich_books(book_df, requests_per_second=0, base_url=self.base_url, answered_titles=answered)
+
+        # A match and a definite no match count, for every variant; the failed request doesn't
+        self.assertEqual(answered, {"Dune", "Dune ", "Missing1"})
+
+    def test_enrich_title_variants_maps_back_to_raw_titles(self):
+        raw_titles = ["Lord of the rings the return of the kind", "Lord of the Rings the Return of the King",
+                      "Lord of the Rings the Return of the King", "Missing1", "IT", "It "]
+        result = enrich_title_variants(pd.DataFrame({"Books": raw_titles}), requests_per_second=0, base_url=self.base_url)
+
+        self.assertEqual(len(StubOpenLibraryHandler.seen_titles), 3)
+        self.assertEqual(sorted(result["Books"]), sorted(set(raw_titles) - {"Missing1"}))
+        by_title = result.set_index("Books")
+        self.assertEqual(by_title.loc["Lord of the rings the return of the kind", "Title"],
+                         "LORD OF THE RINGS THE RETURN OF THE KING")
+        self.assertEqual(by_title.loc["IT", "Title_Key"], by_title.loc["It ", "Title_Key"])
+
+    def check_async_streams_records(self):
+        book_df = pd.DataFrame({"Books": [f"Book{i}" for i in range(8)] + ["Missing1", "Busy1", "Book0 "]})
+
+        async def consume():
+            start = time.perf_counter()
+            first_after, records = None, []
+            async for book_data in enrich_books_async(book_df, max_concurrency=8, requests_per_second=0, base_url=self.base_url):
+                first_after = first_after or time.perf_counter() - start
+                records.append(book_data)
+            return first_after, time.perf_counter() - start, records
+
+        first_after, elapsed, records = asyncio.run(consume())
+
+        self.assertEqual(sorted(book_data["Title"] for book_data in records),
+                         sorted([f"BOOK{i}" for i in range(8)] + ["BUSY1"]))
+        # The first record arrives while the retried 429 is still in flight
+        self.assertLess(first_after, elapsed)
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(StubOpenLibraryHandler.last_query["fields"], ["title,author_name,first_publish_year,isbn,key"])
+        self.assertEqual(StubOpenLibraryHandler.last_query["limit"], ["1"])
+
+    @unittest.skipIf(booksAPIFetch.aiohttp is None, "aiohttp is not installed")
+    def test_enrich_books_async_streams_records_aiohttp(self):
+        self.check_async_streams_records()
+
+    def test_enrich_books_async_streams_records_threads(self):
+        with patch('utils.booksAPIFetch.aiohttp', None):
+            self.check_async_streams_records()
+
+    def test_fetch_openlibrary_data_async_with_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, OpenLibraryCache(os.path.join(tmp_dir, 'cache.db')) as cache:
+            book_data = asyncio.run(fetch_openlibrary_data_async("Tom & Jerry #1", base_url=self.base_url, cache=cache))
+            # The '&' and '#' reach the server as part of the title
+            self.assertEqual(book_data["Title"], "TOM & JERRY #1")
+            self.assertEqual(cache.get("Tom & Jerry #1"), (True, book_data))
+
+            # Answered from the cache, so no request reaches the stopped server
+            self.server.shutdown()
+            self.assertEqual(asyncio.run(fetch_openlibrary_data_async("Tom & Jerry #1", base_url=self.base_url, cache=cache)), book_data)
 
 
 if __name__ == '__main__':
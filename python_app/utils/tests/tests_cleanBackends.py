@@ -0,0 +1,100 @@
+import importlib.util
+import unittest
+import tempfile
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.projectFunctions import clean_data
+from benchmarks.syntheticData import make_raw_books
+
+HEADER = "Id,Books,Book checkout,Book Returned,Days allowed to borrow,Customer ID\n"
+CASES = {
+    # Blank and whitespace-only cells, duplicates, an open loan, a far-future return and day 32
+    "mixed": HEADER + (
+        '1,Dune,"""20/02/2023""",25/02/2023,2 weeks,1\n'
+        '2,IT,"""24/03/2023""",21/03/2023,2 weeks,2\n'
+        ',,,,,\n'
+        '3,Emma,"""01/04/2023""",,2 weeks,\n'
+        ' , ,NaN,,,\n'
+        '2,IT,"""24/03/2023""",21/03/2023,2 weeks,2\n'
+        '4,Dracula,"""10/06/2023""",10/07/2030,2 weeks,3\n'
+        '1,Dune,"""20/02/2023""",25/02/2023,2 weeks,1\n'
+        '5,Emma,"""32/05/2023""",01/06/2023,2 weeks,4\n'
+    ),
+    # Title and customer both "NaN"; a 29 February moved into a non-leap checkout year
+    "missing fields": HEADER + (
+        '1,Dune,"""20/02/2023""",25/02/2023,2 weeks,1\n'
+        '2,NaN,"""24/03/2023""",21/03/2023,2 weeks,NaN\n'
+        '3,IT,"""01/01/2021""",29/02/2040,2 weeks,5\n'
+        '4,Misery,bad date,,2 weeks,6\n'
+    ),
+    "customers": "Customer ID,Customer Name\n1,Jane\n,\n2,John\n1,Jane\nNaN,NaN\n3, \n",
+    "no rows left": HEADER + ',,,,,\n,,,,,\n',
+}
+DATE_COLUMNS = ['Book checkout', 'Book Returned']
+
+
+class BackendCases:
+    backend = None
+
+    def assert_matches_pandas(self, raw_file: str, date_columns: list) -> None:
+        expected = clean_data(raw_file, date_columns=date_columns)
+        result = clean_data(raw_file, date_columns=date_columns, backend=self.backend)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_cases_match_pandas(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name, raw in CASES.items():
+                with self.subTest(name):
+                    raw_file = os.path.join(tmp_dir, 'raw.csv')
+                    with open(raw_file, 'w') as f:
+                        f.write(raw)
+                    self.assert_matches_pandas(raw_file, DATE_COLUMNS)
+
+    def test_synthetic_books_match_pandas(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_file = os.path.join(tmp_dir, 'books.csv')
+            make_raw_books(20_000, n_titles=300).to_csv(raw_file, index=False)
+            self.assert_matches_pandas(raw_file, DATE_COLUMNS)
+
+    def test_type_change_after_sampled_rows(self):
+        # Whole numbers for a long stretch, then a decimal: type inference must look at every row
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_file = os.path.join(tmp_dir, 'raw.csv')
+            rows = [f"{i},Title {i % 7}" for i in range(30_000)] + ["3.5,Dune"]
+            with open(raw_file, 'w') as f:
+                f.write("Score,Books\n" + "\n".join(rows) + "\n")
+            self.assert_matches_pandas(raw_file, [])
+
+    def test_loan_columns_must_be_dates(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_file = os.path.join(tmp_dir, 'raw.csv')
+            with open(raw_file, 'w') as f:
+                f.write(CASES["mixed"])
+            with self.assertRaises(ValueError):
+                clean_data(raw_file, backend=self.backend)
+
+
+@unittest.skipUnless(importlib.util.find_spec('polars'), 'polars is not installed')
+class TestPolarsBackend(BackendCases, unittest.TestCase):
+    backend = 'polars'
+
+
+@unittest.skipUnless(importlib.util.find_spec('duckdb'), 'duckdb is not installed')
+class TestDuckDBBackend(BackendCases, unittest.TestCase):
+    backend = 'duckdb'
+
+
+class TestBackendChoice(unittest.TestCase):
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            clean_data('unused.csv', backend='spark')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import contextlib
+import io
+import unittest
+import tempfile
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.csvSchemas import CsvSchema, SchemaError, read_csv_with_schema, sql_column_types
+from utils.projectFunctions import clean_data, clean_data_in_chunks
+from benchmarks.syntheticData import make_raw_books
+
+BOOK_HEADER = 'Id,Books,Book checkout,Book Returned,Days allowed to borrow,Customer ID,Shelf\n'
+
+
+class TestCsvSchemas(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_column_types_from_script(self):
+        tables = sql_column_types()
+        self.assertEqual(tables['Books']['Title'], ('NVARCHAR', 255))
+        self.assertEqual(tables['Books']['CustomerID'], ('INT', None))
+        self.assertEqual(tables['BooksEnriched']['Title'], ('NVARCHAR', None))  # NVARCHAR(MAX)
+        self.assertEqual(CsvSchema.for_dataset('Books').columns['Book checkout'], ('DATE', None))
+
+    def test_reads_declared_types(self):
+        path = self.write('books.csv', BOOK_HEADER +
+                          '1,Dune,"""20/02/2023""",25/02/2023,2 weeks,3.0,A\n'
+                          '2,IT,24/03/2023,,14,,B\n')
+        df = read_csv_with_schema(path, 'Books')
+        # Undeclared columns aren't read
+        self.assertEqual(list(df.columns), ['Id', 'Books', 'Book checkout', 'Book Returned', 'Days allowed to borrow', 'Customer ID'])
+        self.assertEqual(str(df['Id'].dtype), 'Int64')
+        self.assertEqual(df['Customer ID'].tolist(), [3, pd.NA])
+        self.assertEqual(df['Book checkout'].tolist(), [pd.Timestamp('2023-02-20'), pd.Timestamp('2023-03-24')])
+        self.assertTrue(pd.isna(df.loc[1, 'Book Returned']))
+        self.assertEqual(df['Days allowed to borrow'].tolist(), ['2 weeks', '14'])
+
+    def test_violations_are_raised(self):
+        path = self.write('books.csv', BOOK_HEADER +
+                          '1,Dune,20/02/2023,25/02/2023,2 weeks,2.5,A\n'
+                          'x,IT,32/03/2023,,14,1,B\n'
+                          f'3,{"A" * 300},01/01/2023,,14,1,C\n')
+        with self.assertRaises(SchemaError) as raised:
+            read_csv_with_schema(path, 'Books')
+        violations = raised.exception.violations.sort_values(['row', 'column']).reset_index(drop=True)
+        self.assertEqual(violations['row'].tolist(), [0, 1, 1, 2])
+        self.assertEqual(violations['column'].tolist(), ['Customer ID', 'Book checkout', 'Id', 'Books'])
+        self.assertEqual(violations['problem'].tolist(), [
+            'not a whole number in INT range', 'not a dd/mm/yyyy date', 'not a number (INT)', 'longer than NVARCHAR(255)'])
+
+    def test_violations_warn(self):
+        path = self.write('books.csv', BOOK_HEADER + '1,Dune,32/03/2023,,14,2.5,A\n2,IT,01/01/2023,,14,1,B\n')
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            df = read_csv_with_schema(path, 'Books', on_violation='warn')
+        self.assertIn('2 values', output.getvalue())
+        # Reported values are missing, the rest of the row is kept
+        self.assertTrue(pd.isna(df.loc[0, 'Book checkout']) and pd.isna(df.loc[0, 'Customer ID']))
+        self.assertEqual(df.loc[1, 'Customer ID'], 1)
+
+    def test_missing_column(self):
+        path = self.write('customers.csv', 'Customer ID\n1\n')
+        with self.assertRaisesRegex(SchemaError, 'Customer Name: 1 missing column'):
+            read_csv_with_schema(path, 'Customers')
+
+    def test_clean_data_with_schema(self):
+        path = os.path.join(self.tmp_dir.name, 'raw.csv')
+        make_raw_books(3_000, n_titles=200).to_csv(path, index=False)
+        date_columns = ['Book checkout', 'Book Returned']
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            typed = clean_data(path, date_columns, schema='Books')
+        inferred = clean_data(path, date_columns)
+        self.assertEqual(str(typed['Customer ID'].dtype), 'Int64')
+        ids = {'Id': 'float64', 'Customer ID': 'float64'}
+        pd.testing.assert_frame_equal(typed.astype(ids), inferred.astype(ids))
+
+        # Chunks read with the schema are typed alike, so the chunked output matches
+        expected, chunked = os.path.join(self.tmp_dir.name, 'expected.csv'), os.path.join(self.tmp_dir.name, 'chunked.csv')
+        with contextlib.redirect_stdout(io.StringIO()):
+            clean_data(path, date_columns, output_file=expected, schema='Books')
+            clean_data_in_chunks(path, chunked, date_columns, chunksize=500, schema='Books')
+        with open(expected) as f, open(chunked) as g:
+            self.assertEqual(f.read(), g.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import json
+import tempfile
+import time
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.dashboardMetrics import (
+    compute_aggregates, write_aggregates, load_aggregates, StreamingAggregates, AGGREGATES_FILE
+)
+
+
+class TestDashboardMetrics(unittest.TestCase):
+    def setUp(self):
+        self.customers = pd.DataFrame({'Customer ID': [1, 2, 3]})
+        self.books = pd.DataFrame({
+            'Books': ['A', 'B', 'A'],
+            'Customer ID': [1, 1, 2],
+            'Book Returned': ['2023-01-10', None, '2023-01-20'],
+            'BorrowDuration': [9, 20, 3],
+            'OverdueAlert': ['ON TIME', 'OVERDUE', 'ON TIME'],
+        })
+        self.api_books = pd.DataFrame({'Title': ['A', 'B'], 'Author': ['X', 'X']})
+
+    def test_compute_aggregates(self):
+        aggregates = compute_aggregates(self.customers, self.books, self.api_books)
+        self.assertEqual(aggregates['metrics'], {
+            'num_customers': 3,
+            'num_books': 2,
+            'num_api_requests': 2,
+            'num_unique_authors': 1,
+            'most_borrowed_book': 'A',
+            'most_active_customer': '1',
+            'average_borrow_duration': 32 / 3,
+            'num_overdue': 1,
+            'num_currently_borrowed': 1,
+        })
+        self.assertEqual(aggregates['charts']['top_books'], {'A': 2, 'B': 1})
+        self.assertEqual(aggregates['charts']['overdue_alerts'], {'ON TIME': 2, 'OVERDUE': 1})
+        self.assertEqual(aggregates['charts']['borrow_durations'], {'3': 1, '9': 1, '20': 1})
+
+    def test_streaming_aggregates_match_compute_aggregates(self):
+        # Ties within the top 5 and for the mode that only form across chunks, float IDs
+        # with a gap, a float duration from a missing checkout and an empty chunk
+        books = pd.DataFrame({
+            'Books': ['C', 'B', 'A', 'D', 'E', 'F', 'B', 'C', 'F', None, 'A', 'G'],
+            'Customer ID': [3.0, 2.0, None, 2.0, 3.0, 1.0, 1.0, 1.0, 3.0, 2.0, 3.0, 2.0],
+            'Book Returned': [None, '2023-01-02', None, None, '2023-02-01', None,
+                              '2023-03-01', None, '2023-01-05', None, None, '2023-01-09'],
+            'BorrowDuration': [4.0, 20.0, None, 4.0, 15.0, 1.0, 20.0, 7.0, 4.0, 3.0, 7.0, 1.0],
+            'OverdueAlert': ['ON TIME', 'OVERDUE', 'ON TIME', 'ON TIME', 'OVERDUE', 'ON TIME',
+                             'OVERDUE', 'ON TIME', 'ON TIME', 'ON TIME', 'ON TIME', 'ON TIME'],
+        })
+        api_books = pd.DataFrame({'Title': ['A', 'B', 'C'], 'Author': ['X', None, 'Y']})
+
+        aggregates = StreamingAggregates()
+        for start, end in [(0, 5), (5, 5), (5, 9), (9, 12)]:
+            aggregates.add_books(books.iloc[start:end])
+        aggregates.add_api_books(api_books.iloc[:2])
+        aggregates.add_api_books(api_books.iloc[2:])
+
+        self.assertEqual(aggregates.aggregates(self.customers), compute_aggregates(self.customers, books, api_books))
+
+    def test_load_uses_precomputed_file_until_csvs_change(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            self.customers.to_csv(os.path.join(output_dir, 'customerCleanedPy.csv'), index=False)
+            self.books.to_csv(os.path.join(output_dir, 'bookCleanedPy.csv'), index=False)
+            self.api_books.to_csv(os.path.join(output_dir, 'bookEnrichedAPICleanedPy.csv'), index=False)
+            write_aggregates(output_dir, self.customers, self.books, self.api_books)
+
+            # Mark the file so we can tell it was used rather than recomputed
+            aggregates_path = os.path.join(output_dir, AGGREGATES_FILE)
+            with open(aggregates_path) as f:
+                aggregates = json.load(f)
+            aggregates['metrics']['num_books'] = -1
+            with open(aggregates_path, 'w') as f:
+                json.dump(aggregates, f)
+            self.assertEqual(load_aggregates(output_dir)['metrics']['num_books'], -1)
+
+            # Rewriting a CSV makes the precomputed file stale
+            time.sleep(0.01)
+            self.books.head(1).to_csv(os.path.join(output_dir, 'bookCleanedPy.csv'), index=False)
+            self.assertEqual(load_aggregates(output_dir)['metrics']['num_books'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import tempfile
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.projectFunctions import clean_data
+from utils.incrementalRun import RunManifest, clean_data_incremental
+
+HEADER = "Id,Books,Book checkout,Book Returned,Days allowed to borrow,Customer ID\n"
+ROWS = [
+    '1,Dune,"""20/02/2023""",25/02/2023,2 weeks,1\n',
+    '2,IT,"""24/03/2023""",21/03/2023,2 weeks,2\n',
+    ',,,,,\n',
+    '2,IT,"""24/03/2023""",21/03/2023,2 weeks,2\n',
+    '3,Emma,"""01/04/2023""",,2 weeks,\n',
+]
+NEW_ROWS = [
+    '4,Dracula,"""10/06/2023""",10/07/2023,2 weeks,3\n',
+    '1,Dune,"""20/02/2023""",25/02/2023,2 weeks,1\n',
+]
+DATE_COLUMNS = ['Book checkout', 'Book Returned']
+
+
+class TestCleanDataIncremental(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.raw_file = os.path.join(self.tmp_dir.name, 'raw.csv')
+        self.output_file = os.path.join(self.tmp_dir.name, 'cleaned.csv')
+        self.manifest = RunManifest(os.path.join(self.tmp_dir.name, 'manifest.json'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_raw(self, rows):
+        with open(self.raw_file, 'w') as f:
+            f.write(HEADER + ''.join(rows))
+
+    def full_run_output(self) -> str:
+        full_file = os.path.join(self.tmp_dir.name, 'full.csv')
+        clean_data(self.raw_file, date_columns=DATE_COLUMNS, output_file=full_file)
+        with open(full_file) as f:
+            return f.read()
+
+    def read_output(self) -> str:
+        with open(self.output_file) as f:
+            return f.read()
+
+    def test_first_run_matches_clean_data(self):
+        self.write_raw(ROWS)
+        cleaned, new_rows = clean_data_incremental(self.raw_file, self.output_file, self.manifest, DATE_COLUMNS)
+        self.assertEqual(len(new_rows), 3)
+        self.assertEqual(self.read_output(), self.full_run_output())
+
+    def test_appended_rows_only_clean_new_rows(self):
+        self.write_raw(ROWS)
+        clean_data_incremental(self.raw_file, self.output_file, self.manifest, DATE_COLUMNS)
+
+        self.write_raw(ROWS + NEW_ROWS)
+        cleaned, new_rows = clean_data_incremental(self.raw_file, self.output_file, self.manifest, DATE_COLUMNS)
+
+        # Only Dracula is new; the repeated Dune row is a duplicate of an existing one
+        self.assertEqual(list(new_rows['Books']), ['Dracula'])
+        self.assertEqual(self.read_output(), self.full_run_output())
+
+    def test_unchanged_input_is_skipped(self):
+        self.write_raw(ROWS)
+        clean_data_incremental(self.raw_file, self.output_file, self.manifest, DATE_COLUMNS)
+        cleaned, new_rows = clean_data_incremental(self.raw_file, self.output_file, self.manifest, DATE_COLUMNS)
+        self.assertEqual(len(new_rows), 0)
+        self.assertEqual(len(cleaned), 3)
+
+    def test_removed_rows_are_dropped(self):
+        self.write_raw(ROWS)
+        clean_data_incremental(self.raw_file, self.output_file, self.manifest, DATE_COLUMNS)
+
+        self.write_raw([row for row in ROWS if not row.startswith('2,')])
+        cleaned, new_rows = clean_data_incremental(self.raw_file, self.output_file, self.manifest, DATE_COLUMNS)
+        self.assertEqual(list(cleaned['Books']), ['Dune', 'Emma'])
+        self.assertEqual(self.read_output(), self.full_run_output())
+
+    def test_manifest_tracks_enriched_titles(self):
+        self.manifest.add_enriched_titles(['Dune'])
+        self.manifest.save()
+        manifest = RunManifest(self.manifest.path)
+        self.assertEqual(manifest.unseen_titles(['Dune', 'IT', None, 'IT']), ['IT'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import tempfile
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from sqlalchemy import inspect
+
+from utils.loadToServer import write_df_to_sql, get_engine, table_keys_from_script, match_key_columns
+
+
+class TestLoadToServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.conn_str = f"sqlite:///{os.path.join(self.tmp_dir.name, 'library.db')}"
+
+    def tearDown(self):
+        get_engine(self.conn_str).dispose()
+        self.tmp_dir.cleanup()
+
+    def read_table(self, table_name: str) -> pd.DataFrame:
+        return pd.read_sql_table(table_name, get_engine(self.conn_str))
+
+    def test_table_keys_from_script(self):
+        keys = table_keys_from_script()
+        self.assertEqual(keys['Books'], ['Id'])
+        self.assertEqual(keys['Customers'], ['CustomerID'])
+        self.assertEqual(keys['BooksEnriched'], ['OpenLibrary_ID'])
+        self.assertEqual(keys['Metrics'], [])
+
+    def test_match_key_columns(self):
+        df = pd.DataFrame(columns=['Customer ID', 'Customer Name'])
+        self.assertEqual(match_key_columns(df, ['CustomerID']), ['Customer ID'])
+
+    def test_engine_is_reused(self):
+        self.assertIs(get_engine(self.conn_str), get_engine(self.conn_str))
+
+    def test_write_replace(self):
+        df = pd.DataFrame({'Customer ID': [1, 2], 'Customer Name': ['Jane Doe', 'John Smith']})
+        write_df_to_sql(df, 'Customers', database='', connection_string=self.conn_str, chunksize=1)
+        write_df_to_sql(df, 'Customers', database='', connection_string=self.conn_str)
+        pd.testing.assert_frame_equal(self.read_table('Customers'), df)
+
+    def test_write_upsert(self):
+        first = pd.DataFrame({'Customer ID': [1, 2], 'Customer Name': ['Jane Doe', 'John Smith']})
+        second = pd.DataFrame({'Customer ID': [2, 3, None], 'Customer Name': ['John Smyth', 'Dan Reeves', 'No Key']})
+
+        write_df_to_sql(first, 'Customers', database='', connection_string=self.conn_str, upsert=True)
+        write_df_to_sql(second, 'Customers', database='', connection_string=self.conn_str, upsert=True)
+
+        # Keys come from scripts/SQLTableCreation: 2 is updated, 3 inserted, the row without a key skipped
+        result = self.read_table('Customers').sort_values('Customer ID').reset_index(drop=True)
+        self.assertEqual(list(result['Customer ID']), [1, 2, 3])
+        self.assertEqual(list(result['Customer Name']), ['Jane Doe', 'John Smyth', 'Dan Reeves'])
+        self.assertFalse(inspect(get_engine(self.conn_str)).has_table('Customers_staging'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import tempfile
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.loanIndex import LoanIndex
+from utils.projectFunctions import save_output
+
+
+def make_books():
+    return pd.DataFrame({
+        'Id': [1, 2, 3, 4, 5],
+        'Books': ['The Hobbit', 'Dune ', 'the  hobbit', None, 'Dune'],
+        'Book checkout': pd.to_datetime(['2023-03-01', '2023-01-15', '2023-02-10', None, '2023-01-15']),
+        'Book Returned': pd.to_datetime(['2023-03-10', None, None, '2023-04-01', '2023-01-20']),
+        'Customer ID': [1.0, 2.0, 1.0, None, 3.0],
+    }, index=[10, 11, 12, 13, 14])
+
+
+class TestLoanIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = LoanIndex(make_books())
+
+    def test_loans_for_customer(self):
+        self.assertEqual(self.index.loans_for_customer(1)['Id'].tolist(), [1, 3])
+        self.assertEqual(self.index.on_loan(1)['Id'].tolist(), [3])
+        self.assertTrue(self.index.loans_for_customer(99).empty)
+
+    def test_loans_for_title_is_normalized(self):
+        self.assertEqual(self.index.loans_for_title('THE HOBBIT')['Id'].tolist(), [1, 3])
+        self.assertEqual(self.index.loans_for_title('dune')['Id'].tolist(), [2, 5])
+        self.assertEqual(self.index.loans_for_title('Dune', open_only=True)['Id'].tolist(), [2])
+        self.assertEqual(self.index.customers_for_title('dune'), [2.0, 3.0])
+
+    def test_checked_out_between(self):
+        result = self.index.checked_out_between('2023-01-15', '2023-02-10')
+        # Inclusive on both ends, in checkout order; rows without a checkout are never returned
+        self.assertEqual(result['Id'].tolist(), [2, 5, 3])
+        self.assertTrue(self.index.checked_out_between('2024-01-01', '2024-12-31').empty)
+
+    def test_matches_full_scan(self):
+        books = make_books().reset_index(drop=True)
+        for customer in (1.0, 2.0, 3.0):
+            pd.testing.assert_frame_equal(self.index.loans_for_customer(customer),
+                                          books[books['Customer ID'] == customer])
+
+    def test_from_output(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, 'books.csv')
+            save_output(make_books(), output_file)
+            index = LoanIndex.from_output(output_file)
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.checked_out_between('2023-03-01', '2023-03-01')['Id'].tolist(), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.loanRollups import LoanRollup, customer_rollup, title_rollup
+from utils.projectFunctions import add_borrow_duration_and_alert
+
+
+def make_books():
+    return pd.DataFrame({
+        'Id': [1, 2, 3, 4, 5],
+        'Books': ['The Hobbit', 'Dune', 'The Hobbit', 'IT', 'Dune'],
+        'Book checkout': pd.to_datetime(['2023-03-01', '2023-01-15', '2023-02-10', '2023-03-01', '2023-01-15']),
+        'Book Returned': pd.to_datetime(['2023-03-10', None, '2023-03-20', '2023-03-03', '2023-01-20']),
+        'Customer ID': [1.0, 2.0, 1.0, np.nan, 3.0],
+        'BorrowDuration': [9, 76, 38, 2, 5],
+        'OverdueAlert': ['ON TIME', 'OVERDUE', 'OVERDUE', 'ON TIME', 'ON TIME'],
+    })
+
+
+def make_customers():
+    return pd.DataFrame({'Customer ID': [1, 2, 3, 4], 'Customer Name': ['Jane', 'John', 'Dan', 'Emory']})
+
+
+class TestLoanRollups(unittest.TestCase):
+    def test_customer_rollup(self):
+        rollup = customer_rollup(make_books(), make_customers()).set_index('Customer ID')
+        # 3.0 in the loans meets 3 in the customers; customer 4 has no loans yet
+        self.assertEqual(rollup['Customer Name'].tolist(), ['Jane', 'John', 'Dan', 'Emory'])
+        self.assertEqual(rollup['loan_count'].tolist(), [2, 1, 1, 0])
+        self.assertEqual(rollup.loc[1, 'average_borrow_duration'], 23.5)
+        self.assertTrue(np.isnan(rollup.loc[4, 'average_borrow_duration']))
+        self.assertEqual(rollup['overdue_count'].tolist(), [1, 1, 0, 0])
+        self.assertEqual(rollup['currently_borrowed'].tolist(), [0, 1, 0, 0])
+
+    def test_title_rollup(self):
+        rollup = title_rollup(make_books()).set_index('Books')
+        self.assertEqual(rollup.loc['Dune'].tolist(), [2, 40.5, 1, 1])
+        self.assertEqual(rollup.loc['IT'].tolist(), [1, 2.0, 0, 0])
+
+    def test_matches_groupby(self):
+        books = make_books()
+        expected = books.dropna(subset=['Customer ID']).groupby('Customer ID').agg(
+            loan_count=('Id', 'size'), average_borrow_duration=('BorrowDuration', 'mean'))
+        rollup = customer_rollup(books).set_index('Customer ID')
+        np.testing.assert_array_equal(rollup['loan_count'], expected['loan_count'])
+        np.testing.assert_allclose(rollup['average_borrow_duration'], expected['average_borrow_duration'])
+
+    def test_incremental_update(self):
+        books = make_books()
+        rollup = LoanRollup.from_loans(books.iloc[:2], 'Customer ID').update(added=books.iloc[2:])
+        pd.testing.assert_frame_equal(rollup.table(), customer_rollup(books))
+
+        # Customer 2 returns their book: swap the old row for the re-measured one
+        returned = books.iloc[[1]].copy()
+        returned['Book Returned'] = pd.Timestamp('2023-01-20')
+        returned = add_borrow_duration_and_alert(returned)
+        rollup.update(added=returned, removed=books.iloc[[1]])
+        updated = books.copy()
+        updated.iloc[[1]] = returned
+        pd.testing.assert_frame_equal(rollup.table(), customer_rollup(updated))
+
+        # Removing every loan of a customer drops them
+        rollup.update(removed=books.iloc[[4]])
+        self.assertNotIn(3, rollup.table()['Customer ID'].tolist())
+
+    def test_save_and_load(self):
+        rollup = LoanRollup.from_loans(make_books(), 'Customer ID')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, 'customerRollup.csv')
+            rollup.save(output_file)
+            loaded = LoanRollup.load(output_file, 'Customer ID')
+        pd.testing.assert_frame_equal(loaded.table(make_customers()), rollup.table(make_customers()))
+
+
+if __name__ == '__main__':
+    unittest.main()
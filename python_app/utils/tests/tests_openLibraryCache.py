@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import tempfile
+import sys
+import os
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.openLibraryCache import OpenLibraryCache, normalize_title
+from utils.booksAPIFetch import fetch_openlibrary_data
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOpenLibraryCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'cache.sqlite')
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_normalize_title(self):
+        self.assertEqual(normalize_title("  Catcher in the  Rye "), "catcher in the rye")
+
+    def test_hit_miss_and_persistence(self):
+        record = {"Title": "Dune", "Author": "Frank Herbert"}
+        with OpenLibraryCache(self.path, clock=self.clock) as cache:
+            self.assertEqual(cache.get("Dune"), (False, None))
+            cache.put("Dune ", record)
+            self.assertEqual(cache.get("dune"), (True, record))
+            self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "evictions": 0})
+
+        # A new cache on the same file still has the entry
+        with OpenLibraryCache(self.path, clock=self.clock) as cache:
+            self.assertEqual(cache.get("DUNE"), (True, record))
+
+    def test_negative_caching(self):
+        with OpenLibraryCache(self.path, clock=self.clock) as cache:
+            cache.put("No Such Book", None)
+            self.assertEqual(cache.get("No Such Book"), (True, None))
+
+    def test_ttl_expiry(self):
+        with OpenLibraryCache(self.path, ttl_seconds=60, clock=self.clock) as cache:
+            cache.put("Dune", {"Title": "Dune"})
+            self.clock.now += 61
+            self.assertEqual(cache.get("Dune"), (False, None))
+            self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        with OpenLibraryCache(self.path, max_entries=2, clock=self.clock) as cache:
+            cache.put("A", {"Title": "A"})
+            self.clock.now += 1
+            cache.put("B", {"Title": "B"})
+            self.clock.now += 1
+            cache.get("A")  # A is now more recently used than B
+            self.clock.now += 1
+            cache.put("C", {"Title": "C"})
+
+            self.assertEqual(cache.evictions, 1)
+            self.assertTrue(cache.get("A")[0])
+            self.assertFalse(cache.get("B")[0])
+            self.assertTrue(cache.get("C")[0])
+
+    def test_last_used_written_on_close(self):
+        with OpenLibraryCache(self.path, max_entries=2, clock=self.clock) as cache:
+            cache.put("A", {"Title": "A"})
+            self.clock.now += 1
+            cache.put("B", {"Title": "B"})
+            self.clock.now += 1
+            cache.get("A")
+            self.assertEqual(len(cache), 2)
+
+        # The hit on A was kept across the reopen, so B is the one evicted
+        with OpenLibraryCache(self.path, max_entries=2, clock=self.clock) as cache:
+            self.assertEqual(len(cache), 2)
+            self.clock.now += 1
+            cache.put("C", {"Title": "C"})
+            self.assertEqual(len(cache), 2)
+            self.assertFalse(cache.get("B")[0])
+            self.assertTrue(cache.get("A")[0])
+
+    @patch('utils.booksAPIFetch.requests.get')
+    def test_fetch_openlibrary_data_uses_cache(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"numFound": 0, "docs": []}
+        mock_get.return_value = mock_response
+
+        with OpenLibraryCache(self.path, clock=self.clock) as cache:
+            self.assertIsNone(fetch_openlibrary_data("Unknown Book", cache=cache))
+            self.assertIsNone(fetch_openlibrary_data("Unknown Book", cache=cache))
+
+        # The second lookup was answered by the negative cache entry
+        mock_get.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import tempfile
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.overdueAlerts import OverdueAlertEngine
+from utils.projectFunctions import add_borrow_duration_and_alert, clean_data
+from benchmarks.syntheticData import make_raw_books
+
+
+def make_books():
+    return pd.DataFrame({
+        'Id': [1, 2, 3, 4, 5],
+        'Books': ['The Hobbit', 'Dune', 'IT', 'Emma', 'Misery'],
+        'Book checkout': pd.to_datetime(['2023-03-01', '2023-03-05', '2023-03-10', None, '2023-02-01']),
+        'Book Returned': pd.to_datetime(['2023-03-10', None, None, None, None]),
+        'Customer ID': [1, 2, 3, 4, 5],
+    }, index=[10, 11, 12, 13, 14])
+
+
+class TestOverdueAlertEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = OverdueAlertEngine(make_books(), as_of='2023-03-15')
+
+    def test_starts_from_as_of(self):
+        self.assertEqual(self.engine.overdue['Id'].tolist(), [5])
+        # Soonest due first; no checkout means it's never due
+        self.assertEqual(self.engine.pending['Id'].tolist(), [2, 3])
+        self.assertEqual(self.engine.pending['DueDate'].tolist(), pd.to_datetime(['2023-03-19', '2023-03-24']).tolist())
+
+    def test_refresh_returns_only_new_overdue(self):
+        # 14 days allowed: 19/03 is the last day on time for a 05/03 checkout
+        self.assertTrue(self.engine.refresh('2023-03-19').empty)
+        self.assertEqual(self.engine.refresh('2023-03-20')['Id'].tolist(), [2])
+        self.assertTrue(self.engine.refresh('2023-03-20').empty)
+        self.assertEqual(self.engine.refresh('2023-04-30')['Id'].tolist(), [3])
+        self.assertEqual(len(self.engine), 0)
+        self.assertEqual(self.engine.overdue['Id'].tolist(), [2, 3, 5])
+
+    def test_refresh_cannot_go_back(self):
+        self.engine.refresh('2023-03-20')
+        with self.assertRaises(ValueError):
+            self.engine.refresh('2023-03-19')
+
+    def test_add_loans(self):
+        new = pd.DataFrame({
+            'Id': [6, 7], 'Books': ['Dune', 'IT'],
+            'Book checkout': pd.to_datetime(['2023-01-01', '2023-03-14']),
+            'Book Returned': pd.to_datetime([None, None]), 'Customer ID': [6, 7],
+        }, index=[20, 21])
+        self.engine.add_loans(new)
+        # Already overdue when added: part of the next delta
+        self.assertEqual(self.engine.refresh('2023-03-15')['Id'].tolist(), [6])
+        self.assertEqual(self.engine.refresh('2023-03-29')['Id'].tolist(), [2, 3, 7])
+        with self.assertRaises(ValueError):
+            self.engine.add_loans(new)
+
+    def test_mark_returned(self):
+        self.engine.mark_returned([11], returned_on='2023-03-16')
+        self.assertTrue(self.engine.refresh('2023-03-20').empty)
+        returned = self.engine.df.loc[11]
+        self.assertEqual(returned['BorrowDuration'], 11)
+        self.assertEqual(returned['OverdueAlert'], 'ON TIME')
+
+    def test_matches_full_recompute(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_file = os.path.join(tmp_dir, 'books.csv')
+            # Returns dropped so plenty of loans are open
+            raw = make_raw_books(5_000, n_titles=50, start='2023-01-01', end='2023-03-31')
+            raw.loc[raw.index % 3 == 0, 'Book Returned'] = None
+            raw.to_csv(raw_file, index=False)
+            books = clean_data(raw_file, date_columns=['Book checkout', 'Book Returned'])
+
+        engine = OverdueAlertEngine(books, as_of='2023-02-01')
+        seen = set(engine.overdue.index)
+        for as_of in ['2023-02-02', '2023-02-20', '2023-03-31', '2023-06-01']:
+            delta = engine.refresh(as_of)
+            expected = add_borrow_duration_and_alert(books.copy(), as_of=as_of)
+            pd.testing.assert_frame_equal(engine.df, expected)
+
+            overdue = set(expected.index[expected['Book Returned'].isna() & expected['OverdueAlert'].eq('OVERDUE')])
+            self.assertEqual(set(delta.index), overdue - seen)
+            seen = overdue
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import tempfile
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from benchmarks.syntheticData import make_raw_books
+from utils.projectFunctions import clean_data
+from utils.parallelClean import clean_data_parallel, clean_files_parallel
+
+HEADER = "Id,Books,Book checkout,Book Returned,Days allowed to borrow,Customer ID\n"
+ROWS = [
+    '1,Dune,"""20/02/2023""",25/02/2023,2 weeks,1\n',
+    '2,IT,"""24/03/2023""",21/03/2023,2 weeks,2\n',
+    ',,,,,\n',
+    '3,Emma,"""01/04/2023""",,2 weeks,\n',
+    ' , ,NaN,,,\n',
+    '2,IT,"""24/03/2023""",21/03/2023,2 weeks,2\n',
+    '4,Dracula,"""10/06/2023""",10/07/2030,2 weeks,3\n',
+    '1,Dune,"""20/02/2023""",25/02/2023,2 weeks,1\n',
+    '5,Emma,"""32/05/2023""",01/06/2023,2 weeks,4\n',
+]
+DATE_COLUMNS = ['Book checkout', 'Book Returned']
+
+
+class TestParallelClean(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.raw = os.path.join(self.tmp.name, "books.csv")
+        with open(self.raw, "w") as f:
+            f.write(HEADER + "".join(ROWS))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assert_same_as_clean_data(self, raw, partitions):
+        expected_file = os.path.join(self.tmp.name, "expected.csv")
+        parallel_file = os.path.join(self.tmp.name, "parallel.csv")
+        expected = clean_data(raw, DATE_COLUMNS, output_file=expected_file)
+        result = clean_data_parallel(raw, DATE_COLUMNS, output_file=parallel_file, partitions=partitions, max_workers=2)
+
+        pd.testing.assert_frame_equal(result, expected)
+        with open(expected_file) as f, open(parallel_file) as g:
+            self.assertEqual(g.read(), f.read())
+
+    def test_clean_data_parallel_matches_clean_data(self):
+        # Three rows per partition: duplicates sit in a later partition than their original
+        self.assert_same_as_clean_data(self.raw, partitions=3)
+
+    def test_clean_data_parallel_synthetic_file(self):
+        # Swapped, far-future and invalid dates, "NaN" rows, blank lines and duplicates
+        raw = os.path.join(self.tmp.name, "synthetic.csv")
+        make_raw_books(5_000, n_titles=300).to_csv(raw, index=False)
+        self.assert_same_as_clean_data(raw, partitions=7)
+
+    def test_clean_data_parallel_blank_partition(self):
+        # The middle partition is all blank lines and the last one is only duplicates
+        with open(self.raw, "w") as f:
+            f.write(HEADER + ROWS[0] + ROWS[1] + ",,,,,\n" * 2 + ROWS[0] + ROWS[1])
+        self.assert_same_as_clean_data(self.raw, partitions=3)
+
+    def test_clean_data_parallel_date_format_from_first_row(self):
+        # On its own the second partition would infer a two-digit year from "05/03/23";
+        # clean_data parses the whole column as dd/mm/yyyy, so that date is missing
+        with open(self.raw, "w") as f:
+            f.write(HEADER + ROWS[0] + ROWS[1] + '6,IT,"05/03/23",10/03/2023,2 weeks,5\n' + ROWS[6])
+        self.assert_same_as_clean_data(self.raw, partitions=2)
+
+    def test_clean_files_parallel_keeps_job_order(self):
+        customers = os.path.join(self.tmp.name, "customers.csv")
+        with open(customers, "w") as f:
+            f.write("Customer ID,Customer Name\n1,Jane\n,\n2,John\n1,Jane\n")
+
+        jobs = [
+            {"file_path": self.raw, "date_columns": DATE_COLUMNS},
+            {"file_path": customers},
+        ]
+        books, customer_df = clean_files_parallel(jobs, max_workers=2)
+
+        pd.testing.assert_frame_equal(books, clean_data(self.raw, DATE_COLUMNS))
+        pd.testing.assert_frame_equal(customer_df, clean_data(customers))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import tempfile
+import json
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.pipelineProfiler import PipelineProfiler, NULL_PROFILER
+from utils.projectFunctions import clean_data
+
+
+class TestPipelineProfiler(unittest.TestCase):
+    def test_stage_and_steps(self):
+        profiler = PipelineProfiler()
+        df = pd.DataFrame({'a': [1, 1, 2]})
+        with profiler.stage("dedup") as stage:
+            result = profiler.run("drop_duplicates", pd.DataFrame.drop_duplicates, df)
+            stage["rows_out"] = len(result)
+
+        stage_record, step_record = profiler.records
+        self.assertEqual((stage_record["stage"], stage_record["step"], stage_record["rows_out"]), ("dedup", None, 2))
+        self.assertEqual((step_record["stage"], step_record["step"]), ("dedup", "drop_duplicates"))
+        self.assertEqual((step_record["rows_in"], step_record["rows_out"]), (3, 2))
+        for record in profiler.records:
+            self.assertGreaterEqual(record["wall_s"], 0)
+            self.assertGreaterEqual(record["cpu_s"], 0)
+
+    def test_null_profiler_only_runs(self):
+        with NULL_PROFILER.stage("anything") as stage:
+            stage["rows_out"] = 1
+            self.assertEqual(NULL_PROFILER.run("sum", sum, [1, 2]), 3)
+        self.assertFalse(NULL_PROFILER.enabled)
+
+    def test_clean_data_steps_and_report(self):
+        raw = (
+            "Id,Books,Book checkout,Book Returned,Customer ID\n"
+            "1,Dune,\"\"\"20/02/2023\"\"\",25/02/2023,1\n"
+            ",,,,\n"
+            "1,Dune,\"\"\"20/02/2023\"\"\",25/02/2023,1\n"
+        )
+        profiler = PipelineProfiler()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_file = os.path.join(tmp_dir, 'raw.csv')
+            with open(raw_file, 'w') as f:
+                f.write(raw)
+            with profiler.stage("clean books"):
+                clean_data(raw_file, ['Book checkout', 'Book Returned'], os.path.join(tmp_dir, 'out.csv'), profiler=profiler)
+
+            report_file = os.path.join(tmp_dir, 'profile.json')
+            profiler.to_json(report_file)
+            with open(report_file) as f:
+                report = json.load(f)
+
+        steps = [(r["step"], r["rows_in"], r["rows_out"]) for r in report["records"][1:]]
+        self.assertEqual(steps, [
+            ("1 read_csv", None, 3),
+            ("1.1-2 drop_missing_rows", 3, 2),
+            ("3 drop_duplicates", 2, 1),
+            ("4 correct_dates (Book checkout)", 1, 1),
+            ("4 correct_dates (Book Returned)", 1, 1),
+            ("5-6 repair_loan_dates", 1, 1),
+            ("7 add_borrow_duration_and_alert", 1, 1),
+            ("8 save_output", 1, None),
+        ])
+        self.assertIn("3 drop_duplicates", profiler.format_table())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,23 @@
 from datetime import datetime
+import gc
+import importlib.util
 import unittest
+import tempfile
 from unittest.mock import patch
 import pandas as pd
 import sys
 import os
+import warnings
 
 # Add the parent directory of python_app to sys.path for absolute imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from utils.projectFunctions import read_csv, clean_data, add_borrow_duration_and_alert, drop_na, drop_duplicates, correct_dates, save_to_csv, fix_swapped_dates, fix_swapped_and_future_dates
+try:
+    from hypothesis import given, assume, settings, strategies as st
+except ImportError:
+    given = None
+
+from utils.projectFunctions import read_csv, drop_missing_rows, clean_data, add_borrow_duration_and_alert, drop_na, drop_duplicates, correct_dates, save_to_csv, fix_swapped_dates, fix_swapped_and_future_dates, clean_data_in_chunks, iter_clean_chunks, hash_rows, RowHashStore, save_output, load_output, repair_loan_dates, parse_borrow_days, optimize_dtypes
 
 class TestProjectFunctions(unittest.TestCase):
     @patch('pandas.read_csv')
@@ -19,7 +28,7 @@ class TestProjectFunctions(unittest.TestCase):
         # Act
         result = read_csv('dummy.csv')
         # Assert
-        mock_read_csv.assert_called_once_with('dummy.csv')
+        mock_read_csv.assert_called_once_with('dummy.csv', na_values=['', 'NaN'], keep_default_na=True)
         pd.testing.assert_frame_equal(result, mock_df)
 
     def test_drop_na(self):
@@ -33,6 +42,31 @@ class TestProjectFunctions(unittest.TestCase):
         expected = pd.DataFrame({'a': [1.0], 'b': [None]})
         pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
 
+    def test_drop_missing_rows_blank_text(self):
+        df = pd.DataFrame({
+            'Books': ['Dune ', '   ', None, 'IT'],
+            'Customer ID': [1.0, 2.0, None, 3.0],
+            'Note': pd.Series([' ', 'x', None, ''], dtype=object),
+            'When': pd.Series([pd.Timestamp('2023-01-01')] * 4, dtype=object),
+        })
+        result = drop_missing_rows(df)
+
+        # Whitespace-only and empty text become NaN; other values (and the input) are untouched
+        self.assertEqual(list(result.index), [0, 1, 3])
+        self.assertEqual(result.loc[0, 'Books'], 'Dune ')
+        self.assertTrue(pd.isna(result.loc[1, 'Books']) and pd.isna(result.loc[3, 'Note']))
+        self.assertEqual(list(result['Customer ID']), [1.0, 2.0, 3.0])
+        self.assertEqual(df.loc[1, 'Books'], '   ')
+
+    def test_read_csv_missing_values(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'raw.csv')
+            with open(path, 'w') as f:
+                f.write("Books,Customer ID\nNaN,NaN\n,\nDune,4\n")
+            result = read_csv(path)
+        self.assertEqual(result['Books'].isna().tolist(), [True, True, False])
+        self.assertEqual(result['Customer ID'].dtype, 'float64')
+
     def test_drop_duplicates(self):
         # Arrange
         df = pd.DataFrame({'a': [1, 1, 2], 'b': [3, 3, 4]})
@@ -56,6 +90,13 @@ class TestProjectFunctions(unittest.TestCase):
         ]})
         pd.testing.assert_frame_equal(result, expected)
 
+    def test_correct_dates_repeated_values(self):
+        # Same date quoted and unquoted, repeated, plus a missing value that falls back to the default
+        df = pd.DataFrame({'date': ['"20/02/2023"', '20/02/2023', None, '"20/02/2023"', '5/3/2023']})
+        result = correct_dates(df, 'date', default_date='01/01/2023')
+        expected = pd.to_datetime(pd.Series(['2023-02-20', '2023-02-20', '2023-01-01', '2023-02-20', '2023-03-05']))
+        self.assertEqual(list(result['date']), list(expected))
+
     @patch('pandas.DataFrame.to_csv')
     def test_save_to_csv(self, mock_to_csv):
         df = pd.DataFrame({'a': [1, 2]})
@@ -119,6 +160,19 @@ class TestProjectFunctions(unittest.TestCase):
             self.assertEqual(result.loc[2, 'OverdueAlert'], 'SCHEDULED')
         self.assertEqual(result.loc[3, 'OverdueAlert'], 'ON TIME')  # Returned within 14 days
 
+    def test_add_borrow_duration_and_alert_missing_checkout(self):
+        df = pd.DataFrame({
+            'Book checkout': [None, None, '2023-01-01'],
+            'Book Returned': ['2023-01-25', None, '2023-01-20']
+        })
+        result = add_borrow_duration_and_alert(df.copy(), max_allowed_days=14)
+
+        # Missing checkouts leave the duration empty and are never flagged as overdue
+        self.assertEqual(result['BorrowDuration'].dtype, 'float64')
+        self.assertTrue(result['BorrowDuration'].iloc[:2].isna().all())
+        self.assertEqual(result.loc[2, 'BorrowDuration'], 19)
+        self.assertEqual(list(result['OverdueAlert']), ['ON TIME', 'SCHEDULED', 'OVERDUE'])
+
     @patch('utils.projectFunctions.read_csv')
     @patch('utils.projectFunctions.save_to_csv')
     def test_clean_data(self, mock_save_to_csv, mock_read_csv):
@@ -150,5 +204,210 @@ class TestProjectFunctions(unittest.TestCase):
         )
 
 
+    def test_row_hash_store(self):
+        store = RowHashStore()
+        first = store.add_new(hash_rows(pd.DataFrame({'a': [1, 2, 1], 'b': ['x', 'y', 'x']})))
+        self.assertEqual(list(first), [True, True, False])
+        # 2.0 hashes like 2, so a chunk that inferred floats still matches
+        second = store.add_new(hash_rows(pd.DataFrame({'a': [2.0, 3.0], 'b': ['y', 'z']})))
+        self.assertEqual(list(second), [False, True])
+        self.assertEqual(len(store), 3)
+
+    def test_clean_data_in_chunks(self):
+        raw = (
+            "Id,Books,Book checkout,Book Returned,Customer ID\n"
+            "1,Dune,\"\"\"20/02/2023\"\"\",25/02/2023,1\n"
+            ",,,,\n"
+            "2,IT,\"\"\"24/03/2023\"\"\",21/03/2023,2\n"
+            "1,Dune,\"\"\"20/02/2023\"\"\",25/02/2023,1\n"
+            "3,Emma,\"\"\"01/04/2023\"\"\",20/04/2023,1\n"
+            "2,IT,\"\"\"24/03/2023\"\"\",21/03/2023,2\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_file = os.path.join(tmp_dir, 'raw.csv')
+            with open(raw_file, 'w') as f:
+                f.write(raw)
+            full_file = os.path.join(tmp_dir, 'full.csv')
+            chunked_file = os.path.join(tmp_dir, 'chunked.csv')
+            date_columns = ['Book checkout', 'Book Returned']
+
+            clean_data(raw_file, date_columns=date_columns, output_file=full_file)
+            # Chunks of two rows put every duplicate in a different chunk to its original
+            rows_written = clean_data_in_chunks(raw_file, chunked_file, date_columns=date_columns,
+                                                chunksize=2, dtype={'Id': 'float64', 'Customer ID': 'float64'})
+
+            self.assertEqual(rows_written, 3)
+            with open(full_file) as full, open(chunked_file) as chunked:
+                self.assertEqual(chunked.read(), full.read())
+
+    def test_clean_data_in_chunks_later_missing_ids(self):
+        # The first chunks have whole-number IDs only; a later one has a missing Id and Customer ID
+        raw = (
+            "Id,Books,Book checkout,Book Returned,Customer ID\n"
+            "1,Dune,\"\"\"20/02/2023\"\"\",25/02/2023,1\n"
+            "2,IT,\"\"\"24/03/2023\"\"\",21/03/2023,2\n"
+            "3,Emma,\"\"\"01/04/2023\"\"\",20/04/2023,1\n"
+            "4,Dracula,\"\"\"02/04/2023\"\"\",05/04/2023,3\n"
+            ",Dune,\"\"\"03/04/2023\"\"\",06/04/2023,\n"
+            "9,IT,\"\"\"04/04/2023\"\"\",,4\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_file = os.path.join(tmp_dir, 'raw.csv')
+            with open(raw_file, 'w') as f:
+                f.write(raw)
+            full_file = os.path.join(tmp_dir, 'full.csv')
+            chunked_file = os.path.join(tmp_dir, 'chunked.csv')
+            date_columns = ['Book checkout', 'Book Returned']
+
+            clean_data(raw_file, date_columns=date_columns, output_file=full_file)
+            clean_data_in_chunks(raw_file, chunked_file, date_columns=date_columns, chunksize=2)
+
+            with open(full_file) as full, open(chunked_file) as chunked:
+                expected = full.read()
+                self.assertIn('\n1.0,Dune', expected)
+                self.assertEqual(chunked.read(), expected)
+
+    def test_iter_clean_chunks_closes_file_when_stopped_early(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_file = os.path.join(tmp_dir, 'raw.csv')
+            with open(raw_file, 'w') as f:
+                f.write("Id,Books,Book checkout,Book Returned,Days allowed to borrow,Customer ID\n" +
+                        "".join(f"{i},Dune,20/02/2023,25/02/2023,2 weeks,{i}\n" for i in range(10)))
+
+            for schema in (None, 'Books'):
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter('always', ResourceWarning)
+                    chunks = iter_clean_chunks(raw_file, ['Book checkout', 'Book Returned'], chunksize=2, schema=schema)
+                    next(chunks)
+                    del chunks
+                    gc.collect()
+                self.assertFalse([w for w in caught if issubclass(w.category, ResourceWarning)], schema)
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_save_and_load_output_formats(self):
+        df = pd.DataFrame({
+            'Books': ['Dune', 'IT', 'Dune', 'Dune'],
+            'Book checkout': pd.to_datetime(['2023-01-01', '2023-01-02', '2023-01-03', '2023-01-04']),
+            'Customer ID': [1.0, None, 2.0, 2.0],
+            'OverdueAlert': ['ON TIME', 'OVERDUE', 'ON TIME', 'ON TIME'],
+        })
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for extension in ('.parquet', '.arrow'):
+                output_file = os.path.join(tmp_dir, 'books' + extension)
+                save_output(df, output_file)
+                result = load_output(output_file)
+
+                # Dates keep their type and repetitive text comes back as categoricals
+                self.assertTrue(pd.api.types.is_datetime64_any_dtype(result['Book checkout']))
+                self.assertIsInstance(result['OverdueAlert'].dtype, pd.CategoricalDtype)
+                pd.testing.assert_frame_equal(result.astype({'Books': object, 'OverdueAlert': object}),
+                                              df.astype({'Books': object, 'OverdueAlert': object}),
+                                              check_dtype=False)
+
+    def test_parse_borrow_days(self):
+        days = parse_borrow_days(pd.Series(['2 weeks', '1 week', '10 days', '14', None, 'soon']))
+        self.assertEqual(str(days.dtype), 'Int32')
+        self.assertEqual(days.tolist(), [14, 7, 10, 14, pd.NA, pd.NA])
+
+    def test_optimize_dtypes(self):
+        df = pd.DataFrame({
+            'Id': [1.0, 2.0, None, 4.0],
+            'Books': ['Dune', 'IT', 'Dune', 'Dune'],
+            'Days allowed to borrow': ['2 weeks'] * 4,
+            'Customer ID': [1.0, None, 2.0, 2.0],
+            'OverdueAlert': ['ON TIME', 'OVERDUE', 'ON TIME', 'ON TIME'],
+        })
+        result = optimize_dtypes(df.copy())
+
+        self.assertEqual(str(result['Id'].dtype), 'Int32')
+        self.assertEqual(str(result['Customer ID'].dtype), 'Int32')
+        self.assertEqual(result['Days allowed to borrow'].tolist(), [14] * 4)
+        self.assertIsInstance(result['OverdueAlert'].dtype, pd.CategoricalDtype)
+        self.assertEqual(result['Customer ID'].tolist(), [1, pd.NA, 2, 2])
+
+    def test_clean_data_compact_dtypes(self):
+        raw = (
+            "Id,Books,Book checkout,Book Returned,Days allowed to borrow,Customer ID\n"
+            "1,Dune,\"\"\"20/02/2023\"\"\",25/02/2023,2 weeks,1\n"
+            ",,,,,\n"
+            "2,IT,\"\"\"24/03/2023\"\"\",21/03/2023,2 weeks,\n"
+            "1,Dune,\"\"\"20/02/2023\"\"\",25/02/2023,2 weeks,1\n"
+            "3,Dune,\"\"\"01/04/2023\"\"\",20/04/2023,2 weeks,NaN\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            raw_file = os.path.join(tmp_dir, 'raw.csv')
+            with open(raw_file, 'w') as f:
+                f.write(raw)
+            date_columns = ['Book checkout', 'Book Returned']
+            expected = clean_data(raw_file, date_columns=date_columns, output_file=os.path.join(tmp_dir, 'expected.csv'))
+            result = clean_data(raw_file, date_columns=date_columns, compact_dtypes=True,
+                                output_file=os.path.join(tmp_dir, 'compact.csv'))
+            # Only the frame in memory is compact: the saved file keeps "2 weeks" and the ID format
+            with open(os.path.join(tmp_dir, 'expected.csv')) as f, open(os.path.join(tmp_dir, 'compact.csv')) as g:
+                self.assertEqual(g.read(), f.read())
+
+        # Same rows and values, only the dtypes change
+        self.assertEqual(str(result['Customer ID'].dtype), 'Int32')
+        self.assertEqual(result['Days allowed to borrow'].tolist(), [14, 14, 14])
+        pd.testing.assert_frame_equal(
+            result.drop(columns='Days allowed to borrow').astype({'Books': object, 'OverdueAlert': object}),
+            expected.drop(columns='Days allowed to borrow').astype({'Books': object, 'OverdueAlert': object}),
+            check_dtype=False
+        )
+
+
+def legacy_fix_swapped_and_future_dates(df, checkout_col='Book checkout', returned_col='Book Returned', max_year_diff=5):
+    # Row-wise implementation that repair_loan_dates replaced, kept as the reference
+    df[checkout_col] = pd.to_datetime(df[checkout_col], errors='coerce')
+    df[returned_col] = pd.to_datetime(df[returned_col], errors='coerce')
+    mask_swapped = df[checkout_col] > df[returned_col]
+    df.loc[mask_swapped, [checkout_col, returned_col]] = df.loc[mask_swapped, [returned_col, checkout_col]].values
+    mask_future = (df[returned_col].dt.year - df[checkout_col].dt.year) > max_year_diff
+
+    def correct_year(row):
+        if pd.notna(row[returned_col]) and pd.notna(row[checkout_col]):
+            return row[returned_col].replace(year=row[checkout_col].year)
+        return pd.NaT
+
+    if mask_future.any():
+        corrected = pd.to_datetime(df.loc[mask_future].apply(correct_year, axis=1))
+        df.loc[mask_future, returned_col] = corrected
+    return df
+
+
+class TestRepairLoanDates(unittest.TestCase):
+    def test_leap_day_moved_to_non_leap_year(self):
+        df = pd.DataFrame({
+            'Book checkout': ['2023-01-01', '2024-01-01'],
+            'Book Returned': ['2032-02-29 13:45', '2032-02-29 00:00']
+        })
+        result = repair_loan_dates(df, max_year_diff=5)
+        self.assertEqual(result.loc[0, 'Book Returned'], pd.Timestamp('2023-02-28 13:45'))
+        self.assertEqual(result.loc[1, 'Book Returned'], pd.Timestamp('2024-02-29'))
+
+    @unittest.skipIf(given is None, 'hypothesis is not installed')
+    def test_matches_legacy_implementation(self):
+        loan_dates = st.one_of(
+            st.none(),
+            st.datetimes(min_value=datetime(1990, 1, 1), max_value=datetime(2060, 12, 31))
+        )
+
+        @settings(max_examples=300, deadline=None)
+        @given(
+            rows=st.lists(st.tuples(loan_dates, loan_dates), min_size=1, max_size=30),
+            max_year_diff=st.integers(min_value=0, max_value=10)
+        )
+        def check(rows, max_year_diff):
+            df = pd.DataFrame(rows, columns=['Book checkout', 'Book Returned'], dtype='datetime64[us]')
+            try:
+                expected = legacy_fix_swapped_and_future_dates(df.copy(), max_year_diff=max_year_diff)
+            except ValueError:
+                # The old version crashed on 29 February moved into a non-leap year
+                assume(False)
+            result = repair_loan_dates(df.copy(), max_year_diff=max_year_diff)
+            pd.testing.assert_frame_equal(result, expected)
+
+        check()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
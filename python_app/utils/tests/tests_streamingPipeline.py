@@ -0,0 +1,127 @@
+import threading
+import unittest
+import tempfile
+import time
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils import projectFunctions
+from utils.dashboardMetrics import compute_aggregates
+from utils.loanRollups import customer_rollup, title_rollup
+from utils.projectFunctions import clean_data, clean_data_in_chunks
+from utils.streamingPipeline import stream_pipeline, StageRunner
+from benchmarks.syntheticData import make_raw_books
+
+
+def fake_enrich(book_df: pd.DataFrame) -> pd.DataFrame:
+    # One record per title, like enrich_books returns; "Dune 1" variants have no match
+    titles = [title for title in book_df["Books"].dropna().unique() if not title.startswith("Dune")]
+    return pd.DataFrame({
+        "Title": titles,
+        "Author": "Stub Author",
+        "First_Publish_Year": 1965,
+        "ISBN": "123",
+        "OpenLibrary_ID": [f"/works/{title.strip().lower()}" for title in titles],
+    })
+
+
+class TestStreamPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.paths = {name: os.path.join(self.tmp_dir.name, f"{name}.csv")
+                      for name in ("raw", "books", "api_raw", "api")}
+        make_raw_books(3_000, n_titles=200).to_csv(self.paths["raw"], index=False)
+
+    def run_pipeline(self, **options):
+        return stream_pipeline(self.paths["raw"], self.paths["books"], self.paths["api_raw"], self.paths["api"],
+                               **{"chunksize": 500, "enrich": fake_enrich, **options})
+
+    def test_matches_batch_outputs(self):
+        result = self.run_pipeline()
+
+        expected_books = os.path.join(self.tmp_dir.name, "expected_books.csv")
+        rows = clean_data_in_chunks(self.paths["raw"], expected_books, ['Book checkout', 'Book Returned'], chunksize=500)
+        with open(self.paths["books"]) as f, open(expected_books) as g:
+            self.assertEqual(f.read(), g.read())
+        self.assertEqual(result["books_rows"], rows)
+
+        # Enriched rows: every looked-up title once, cleaned like the batch pipeline cleans the raw file
+        pd.testing.assert_frame_equal(pd.read_csv(self.paths["api"]), clean_data(self.paths["api_raw"]).reset_index(drop=True))
+        books = pd.read_csv(self.paths["books"])
+        self.assertEqual(len(pd.read_csv(self.paths["api"])), len(fake_enrich(books.drop_duplicates("Books"))))
+
+        # Rollups accumulated chunk by chunk equal the ones built from the finished output
+        books['OverdueAlert'] = books['OverdueAlert'].astype('str')
+        pd.testing.assert_frame_equal(result["customer_rollup"].table(), customer_rollup(books))
+        pd.testing.assert_frame_equal(result["title_rollup"].table(), title_rollup(books))
+
+        # So are the dashboard aggregates, compared with the ones the batch pipeline writes
+        customers = pd.DataFrame({'Customer ID': [1, 2, 3]})
+        self.assertEqual(result["aggregates"].aggregates(customers), compute_aggregates(
+            customers, clean_data(self.paths["raw"], ['Book checkout', 'Book Returned']), clean_data(self.paths["api_raw"])
+        ))
+
+    def test_nothing_enriched_replaces_an_earlier_raw_file(self):
+        with open(self.paths["api_raw"], 'w') as f:
+            f.write("Title,Author\nOld run,Someone\n")
+        result = self.run_pipeline(enrich=lambda book_df: pd.DataFrame())
+        self.assertEqual(result["books_api_rows"], 0)
+        for name in ("api_raw", "api"):
+            with open(self.paths[name]) as f:
+                self.assertNotIn("Old run", f.read())
+
+    def test_sinks_get_every_chunk(self):
+        loaded = {"books": 0, "books_api": 0}
+        result = self.run_pipeline(
+            on_books=lambda chunk: loaded.__setitem__("books", loaded["books"] + len(chunk)),
+            on_books_api=lambda chunk: loaded.__setitem__("books_api", loaded["books_api"] + len(chunk)),
+        )
+        self.assertEqual(loaded, {"books": result["books_rows"], "books_api": result["books_api_rows"]})
+
+    def test_backpressure(self):
+        # A slow sink holds the cleaning stage back: it can't run more than the queues hold ahead
+        cleaned, lead = [0], []
+        original = projectFunctions.fix_loan_dates
+
+        def counting_fix(*args, **kwargs):
+            cleaned[0] += 1
+            return original(*args, **kwargs)
+
+        def slow_sink(chunk):
+            lead.append(cleaned[0] - len(lead))
+            time.sleep(0.03)
+
+        projectFunctions.fix_loan_dates = counting_fix
+        self.addCleanup(setattr, projectFunctions, "fix_loan_dates", original)
+        self.run_pipeline(chunksize=150, queue_size=1, on_books=slow_sink)
+        # Queue of 1 to the sink, the chunk in hand and the one being cleaned (9 with unbounded queues)
+        self.assertLessEqual(max(lead), 4)
+
+    def test_stage_error_stops_the_pipeline(self):
+        def failing_enrich(book_df):
+            raise RuntimeError("API down")
+
+        with self.assertRaisesRegex(RuntimeError, "API down"):
+            self.run_pipeline(enrich=failing_enrich)
+        self.assertEqual([t for t in threading.enumerate() if t.name in ("clean", "enrich", "enrich clean", "sink")], [])
+
+
+class TestStageRunner(unittest.TestCase):
+    def test_items_wait_for_every_producer(self):
+        runner = StageRunner(queue_size=1)
+        q, seen = runner.make_queue(), []
+        runner.start("a", lambda: [runner.put(q, i) for i in range(3)], q)
+        runner.start("b", lambda: [runner.put(q, i) for i in range(3, 5)], q)
+        runner.start("sink", lambda: seen.extend(runner.items(q, producers=2)))
+        runner.join()
+        self.assertEqual(sorted(seen), [0, 1, 2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
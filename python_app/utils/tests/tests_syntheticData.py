@@ -0,0 +1,62 @@
+import unittest
+import tempfile
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from benchmarks.syntheticData import make_raw_books, make_clean_books, write_raw_library, BOOK_COLUMNS
+from utils.projectFunctions import add_borrow_duration_and_alert, clean_data
+
+
+class TestSyntheticData(unittest.TestCase):
+    def test_raw_books_have_the_real_quirks(self):
+        books = make_raw_books(20_000, seed=1)
+        self.assertEqual(list(books.columns), BOOK_COLUMNS)
+        self.assertEqual(len(books), 20_000)
+
+        checkout = books['Book checkout'].dropna()
+        self.assertTrue(checkout.str.match(r'^"\d\d/\d\d/\d{4}"$').all())
+        self.assertTrue(checkout.str.startswith('"32/').any())
+        self.assertTrue((checkout.str[7:11].astype(int) > 2050).any())
+
+        day_first = '%d/%m/%Y'
+        valid = ~checkout.str.startswith('"32/')
+        checkout_dates = pd.to_datetime(checkout[valid].str.strip('"'), format=day_first)
+        returned_dates = pd.to_datetime(books.loc[checkout_dates.index, 'Book Returned'], format=day_first)
+        self.assertTrue((checkout_dates > returned_dates).any())
+
+        self.assertTrue(books.isna().all(axis=1).any())
+        self.assertTrue((books['Books'] == 'NaN').any())
+        self.assertTrue(books.dropna(how='all').duplicated().any())
+
+    def test_same_seed_same_data(self):
+        pd.testing.assert_frame_equal(make_raw_books(500, seed=7), make_raw_books(500, seed=7))
+
+    def test_written_files_clean(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = write_raw_library(tmp_dir, 2_000)
+            books = clean_data(paths["books"], ['Book checkout', 'Book Returned'])
+            customers = clean_data(paths["customers"])
+
+        self.assertFalse(books.duplicated().any())
+        self.assertFalse(((books['Book Returned'].dt.year - books['Book checkout'].dt.year) > 5).any())
+        self.assertGreater(len(customers), 0)
+
+    def test_clean_books_match_the_pipeline(self):
+        books = make_clean_books(2_000, open_loan=0.2)
+        self.assertTrue(books['Book Returned'].isna().any())
+        self.assertEqual(set(books['OverdueAlert']), {'OVERDUE', 'ON TIME', 'SCHEDULED'})
+
+        # Open loans are measured to the last checkout rather than today, so only compare returned ones
+        returned = books.dropna(subset=['Book Returned'])
+        expected = add_borrow_duration_and_alert(returned[['Book checkout', 'Book Returned']].copy())
+        self.assertEqual(returned['BorrowDuration'].tolist(), expected['BorrowDuration'].tolist())
+        self.assertEqual(returned['OverdueAlert'].tolist(), expected['OverdueAlert'].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+
+import pandas as pd
+
+# Add the parent directory of the project (python_app) to sys.path for absolute imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from utils.titleIndex import TitleIndex
+
+
+class TestTitleIndex(unittest.TestCase):
+    def test_folds_case_and_whitespace(self):
+        index = TitleIndex(["Catcher in the Rye ", "catcher  in the rye", "Dune", "DUNE "])
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.canonical("Catcher in the Rye "), index.canonical("catcher  in the rye"))
+        self.assertEqual(index.representative[index.canonical("DUNE ")], "Dune")
+
+    def test_near_duplicates_share_a_cluster(self):
+        index = TitleIndex(["Lord of the rings the return of the kind", "Lord of the Rings the Return of the King",
+                            "Catch 22", "Catch-22", "Emma"],
+                           counts={"Lord of the Rings the Return of the King": 3})
+        key = index.canonical("Lord of the rings the return of the kind")
+        self.assertEqual(index.representative[key], "Lord of the Rings the Return of the King")
+        self.assertEqual(set(index.variants(key)), {"Lord of the rings the return of the kind",
+                                                    "Lord of the Rings the Return of the King"})
+        self.assertEqual(index.canonical("Catch 22"), index.canonical("Catch-22"))
+        self.assertEqual(len(index), 3)
+
+    def test_numbered_titles_stay_apart(self):
+        index = TitleIndex(["Harry Potter 1", "Harry Potter 2", "Little Women", "Little Woman"])
+        self.assertNotEqual(index.canonical("Harry Potter 1"), index.canonical("Harry Potter 2"))
+        self.assertEqual(len(index), 4)
+
+    def test_keys_for_a_column(self):
+        index = TitleIndex(["Dune ", "dune"])
+        keys = index.keys(pd.Series(["Dune ", None, "dune", "Unseen Title "]))
+        self.assertEqual(keys.name, "Title_Key")
+        self.assertTrue(pd.isna(keys[1]))
+        self.assertEqual(keys.drop(1).tolist(), ["dune", "dune", "unseen title"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from utils.openLibraryCache import normalize_title
+
+NUM_PERM = 64
+BANDS = 16
+
+
+def title_trigrams(title: str) -> set:
+    """Character trigrams of a title with case, spacing and punctuation folded."""
+    text = " ".join(re.sub(r'[^\w\s]', ' ', normalize_title(title)).split())
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _numbers(title: str) -> tuple:
+    # "Harry Potter 1" and "Harry Potter 2" look alike but are different books
+    return tuple(re.findall(r'\d+', title))
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+class TitleIndex:
+    """
+    Groups raw title variants that name the same book.
+
+    1. Titles equal after whitespace/case folding ("Catcher in the Rye " and
+       "catcher in the rye") share a normalized form.
+    2. Near-duplicates of those forms ("...return of the kind" / "...return of the king")
+       are found with MinHash signatures over character trigrams and LSH banding,
+       then merged when their trigram Jaccard similarity is at least `threshold`
+       and they carry the same numbers.
+
+    Each cluster gets a representative (its most common variant, spacing tidied)
+    and a stable key (the representative's normalized form) to join on.
+    """
+
+    def __init__(self, titles, counts: dict = None, threshold: float = 0.8, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        titles = [title for title in pd.unique(pd.Series(list(titles), dtype=object)) if pd.notna(title)]
+        counts = counts or {}
+
+        # Step 1: exact match after folding
+        forms = list(dict.fromkeys(normalize_title(title) for title in titles))
+        form_index = {form: i for i, form in enumerate(forms)}
+
+        # Step 2: near-duplicate forms
+        clusters = _UnionFind(len(forms))
+        trigrams = [title_trigrams(form) for form in forms]
+        numbers = [_numbers(form) for form in forms]
+        for a, b in self._candidate_pairs(trigrams, numbers, num_perm, bands, seed):
+            if len(trigrams[a] & trigrams[b]) >= threshold * len(trigrams[a] | trigrams[b]):
+                clusters.union(a, b)
+
+        # Representative: the variant with the most rows, first seen on ties
+        members = defaultdict(list)
+        for title in titles:
+            members[clusters.find(form_index[normalize_title(title)])].append(title)
+
+        self.key_of = {}
+        self.representative = {}
+        self._variants = {}
+        for group in members.values():
+            best = max(group, key=lambda title: counts.get(title, 0))
+            key = normalize_title(best)
+            self.representative[key] = " ".join(str(best).split())
+            self._variants[key] = group
+            for title in group:
+                self.key_of[title] = key
+
+    @staticmethod
+    def _candidate_pairs(trigrams: list, numbers: list, num_perm: int, bands: int, seed: int) -> set:
+        # Multiply-shift hashing gives num_perm independent-ish orderings of the 32-bit trigram hashes
+        rng = np.random.default_rng(seed)
+        a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+        b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+        rows = num_perm // bands
+
+        buckets = defaultdict(list)
+        for i, grams in enumerate(trigrams):
+            hashes = np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams))
+            signature = ((a[:, None] * hashes[None, :] + b[:, None]) >> np.uint64(32)).min(axis=1)
+            # Only titles with the same numbers may merge, so they're part of the bucket
+            for band in range(bands):
+                buckets[(band, numbers[i], signature[band * rows:(band + 1) * rows].tobytes())].append(i)
+
+        pairs = set()
+        for bucket in buckets.values():
+            for j in range(1, len(bucket)):
+                for i in bucket[:j]:
+                    pairs.add((i, bucket[j]))
+        return pairs
+
+    def __len__(self) -> int:
+        return len(self.representative)
+
+    def canonical(self, title: str) -> str:
+        """Join key of a title; titles the index hasn't seen fall back to their normalized form."""
+        return self.key_of.get(title, normalize_title(title))
+
+    def variants(self, key: str) -> list:
+        return list(self._variants.get(key, []))
+
+    def keys(self, titles: pd.Series) -> pd.Series:
+        """Join key for every row of a title column (missing titles stay missing)."""
+        codes, uniques = pd.factorize(titles)
+        keys = np.array([self.canonical(title) for title in uniques] + [None], dtype=object)
+        return pd.Series(keys[codes], index=titles.index, name="Title_Key")